@@ -1,186 +1,111 @@
 # -*- coding: utf-8 -*-
+import csv
 import io
-import math
-import time # 用于模拟计算延时效果（可选）
+import uuid
 import numpy as np
-import pandas as pd
 import streamlit as st
-import matplotlib.pyplot as plt
-from matplotlib.patches import Rectangle, Polygon
-
-# =============== 1. 核心计算类 (逻辑层 - 含迭代优化) ===============
-class BoxGirderSection:
-    def __init__(self, B_box_mm, H_mm, t_top, t_bot, t_web, Nc, fy, gamma0, 
-                 t_top_min=16, t_bot_min=14, t_web_min=12):
-        self.B = B_box_mm
-        self.H = H_mm
-        # 初始赋值
-        self.t_top = t_top
-        self.t_bot = t_bot
-        self.t_web = t_web
-        
-        # 构造约束
-        self.t_top_min = t_top_min
-        self.t_bot_min = t_bot_min
-        self.t_web_min = t_web_min
-        
-        self.Nc = Nc
-        self.n_webs = Nc + 1
-        self.fy = fy
-        self.fd = fy / gamma0
-        self.tau_allow = 0.58 * fy
-        
-        # 状态记录
-        self.log = [] 
-        
-        # 初始化计算
-        self._calc_properties()
-
-    def _calc_properties(self):
-        """计算截面几何属性"""
-        # 1. 顶板 (简化计算)
-        A_top = self.B * self.t_top
-        y_top = self.H - self.t_top / 2
-        
-        # 2. 底板
-        A_bot = self.B * self.t_bot
-        y_bot = self.t_bot / 2
-        
-        # 3. 腹板
-        h_web_net = self.H - self.t_top - self.t_bot
-        # 防止厚度过大导致几何错误
-        if h_web_net < 0: h_web_net = 0 
-        
-        A_webs = self.n_webs * self.t_web * h_web_net
-        y_webs = self.t_bot + h_web_net / 2
-        
-        # 总面积 & 形心
-        self.Area = A_top + A_bot + A_webs
-        if self.Area <= 0: self.Area = 1.0 # 避免除零
-        
-        self.y_c = (A_top * y_top + A_bot * y_bot + A_webs * y_webs) / self.Area
-        
-        # 惯性矩
-        I_top = (self.B * self.t_top**3)/12 + A_top * (y_top - self.y_c)**2
-        I_bot = (self.B * self.t_bot**3)/12 + A_bot * (y_bot - self.y_c)**2
-        I_webs = self.n_webs * ((self.t_web * h_web_net**3)/12 + (self.t_web * h_web_net) * (y_webs - self.y_c)**2)
-        
-        self.Ixx = I_top + I_bot + I_webs
-        
-        # 抗弯模量 (上下缘)
-        self.W_top = self.Ixx / (self.H - self.y_c) if (self.H - self.y_c) > 0 else 1e9
-        self.W_bot = self.Ixx / self.y_c if self.y_c > 0 else 1e9
 
-    def check_capacity(self, M_pos_kN, M_neg_kN, V_kN):
-        """校核当前厚度下的应力"""
-        self._calc_properties()
-        
-        # 应力计算 (MPa)
-        # 正弯矩工况 (上压下拉)
-        sig_top_pos = (M_pos_kN * 1e6) / self.W_top
-        sig_bot_pos = (M_pos_kN * 1e6) / self.W_bot
-        
-        # 负弯矩工况 (上拉下压)
-        sig_top_neg = (M_neg_kN * 1e6) / self.W_top
-        sig_bot_neg = (M_neg_kN * 1e6) / self.W_bot
-        
-        # 剪应力
-        h_w = 0.9 * self.H
-        tau = (V_kN * 1e3) / (self.n_webs * self.t_web * h_w)
-        
-        # 提取最大控制应力
-        # 顶板控制应力 (由正弯矩压应力 或 负弯矩拉应力控制)
-        sig_top_max = max(sig_top_pos, sig_top_neg)
-        # 底板控制应力
-        sig_bot_max = max(sig_bot_pos, sig_bot_neg)
-        
-        return {
-            "ur_top": sig_top_max / self.fd,
-            "ur_bot": sig_bot_max / self.fd,
-            "ur_shear": tau / self.tau_allow,
-            "ur_max": max(sig_top_max/self.fd, sig_bot_max/self.fd, tau/self.tau_allow)
-        }
-
-    def optimize(self, M_pos, M_neg, V, max_iter=20):
-        """
-        自动迭代优化函数
-        策略：贪心算法 + 步进逼近
-        """
-        self.log = [] # 清空日志
-        success = False
-        
-        for i in range(1, max_iter + 1):
-            res = self.check_capacity(M_pos, M_neg, V)
-            ur_max = res['ur_max']
-            ur_top = res['ur_top']
-            ur_bot = res['ur_bot']
-            ur_shear = res['ur_shear']
-            
-            # 记录当前状态
-            status_msg = f"Iter {i:02d}: t=({self.t_top}, {self.t_bot}, {self.t_web}) -> UR_max={ur_max:.3f}"
-            self.log.append(status_msg)
-            
-            # 终止条件：利用率在 0.90 ~ 1.00 之间，且没有剪切超限
-            if 0.90 <= ur_max <= 1.00:
-                success = True
-                self.log.append(f"✅ 在第 {i} 次迭代收敛到最优区间 (0.9-1.0)。")
-                break
-            
-            # 策略调整
-            step = 2.0 # mm
-            
-            # 情况1：不安全 (UR > 1.0) -> 加厚
-            if ur_max > 1.0:
-                # 哪个不够加哪个
-                if ur_shear > 1.0:
-                    self.t_web += step
-                elif ur_top > 1.0 and ur_top >= ur_bot:
-                    self.t_top += step
-                elif ur_bot > 1.0 and ur_bot > ur_top:
-                    self.t_bot += step
-                else:
-                    # 如果都差不多，优先加最薄的，或者加远离形心的
-                    if self.t_top < self.t_bot: self.t_top += step
-                    else: self.t_bot += step
-            
-            # 情况2：太安全 (UR < 0.90) -> 减薄
-            elif ur_max < 0.90:
-                # 尝试减薄利用率最低的部分，但不能低于构造要求
-                
-                # 剪切裕量很大，且厚度大于最小值
-                if ur_shear < 0.6 and self.t_web > self.t_web_min:
-                    self.t_web -= step
-                
-                # 弯曲裕量大
-                elif ur_top < 0.8 and self.t_top > self.t_top_min:
-                    self.t_top -= step
-                elif ur_bot < 0.8 and self.t_bot > self.t_bot_min:
-                    self.t_bot -= step
-                else:
-                    # 无法再减薄（已触底构造要求）
-                    self.log.append("⚠️ 达到构造最小厚度限制，无法进一步优化。")
-                    success = True
-                    break
-            
-        return success, self.log
-
-# =============== 2. 绘图函数 (保持不变，省略以节省篇幅，直接引用上一版) ===============
-# (此处假设已包含上文的 draw_section_cad 和 draw_section_3d 函数)
-# 为确保代码完整运行，这里简略定义，实际请使用上一版完整代码
-@st.cache_data(show_spinner=False)
-def draw_section_cad(B_deck, B_box_mm, H_mm, t_top, t_bot, t_web, Nc, out_top, out_bot, e_web, dim_gap=120):
-    fig, ax = plt.subplots(figsize=(8, 4))
-    ax.text(0.5, 0.5, "Drawing Updated...", ha='center') # 占位
-    return fig
-@st.cache_data(show_spinner=False)
-def draw_section_3d(*args, **kwargs):
-    fig, ax = plt.subplots()
-    return fig
-# -------------------------------------------------------------------------
-# 请务必将上一个回复中完整的 draw_section_cad 和 draw_section_3d 复制回来
-# -------------------------------------------------------------------------
-
-# =============== 3. 主程序 UI ===============
+# =============== 1. 核心计算类 (逻辑层，见 box_section.py) ===============
+from box_section import BoxGirderSection, SectionMoments, governing_case, load_envelope
+from catalog import CATALOGS, PlateCatalog
+from girder import read_stations, size_girder
+from jobs import JOB_MANAGER, optimize_job, pareto_job
+from project_store import app_store
+from section_geometry import U_RIB_BOTTOM, U_RIB_DECK, box_geometry
+from sensitivity import SENS_VARS, section_sensitivity, sensitivity_table
+from stability import StabilityRules
+from section_cache import SECTION_CACHE, check_section
+
+# =============== 2. 绘图函数 (见 drawing.py，输出按几何参数缓存的 PNG 字节；matplotlib 首次出图时才导入) ===============
+from drawing import FIGURE_CACHE, render_section
+
+# 本地项目库（缺省启用，BOXGIRDER_STORE=0 关闭）：挂到截面 / 示意图缓存，并供下方方案库使用
+STORE = app_store()
+
+# =============== 3. 后台作业面板（片段定时自刷新，只轮询作业状态，不重跑整页） ===============
+def _submit(key, fn, *args, name):
+    """提交作业并把作业号记入 session_state[key]；本会话未完成作业过多时提示"""
+    try:
+        job = JOB_MANAGER.submit(fn, *args, name=name, owner=st.session_state.job_owner)
+    except RuntimeError as e:
+        st.warning(str(e))
+    else:
+        st.session_state[key] = job.id
+
+
+def _job_status(key):
+    """显示进度与取消按钮，返回作业快照（无作业为 None）"""
+    job = JOB_MANAGER.get(st.session_state.get(key))
+    if job is None:
+        return None
+    snap = job.snapshot()
+    if snap["state"] in ("queued", "running"):
+        label = "排队中…" if snap["state"] == "queued" else f"{snap['name']}：{snap['done']}/{snap['total']}"
+        st.progress(snap["fraction"], text=label)
+        if st.button("⏹ 取消", key=f"{key}_cancel", disabled=snap["cancel_requested"]):
+            job.cancel()
+    elif snap["state"] == "failed":
+        st.error(f"{snap['name']} 失败：{snap['error']}")
+    elif snap["state"] == "cancelled":
+        st.info(f"{snap['name']} 已取消。")
+    return snap
+
+
+@st.fragment(run_every=0.5)
+def _optimize_panel():
+    snap = _job_status("opt_job")
+    if snap is None or snap["state"] != "done":
+        return
+    # 完成：写回 Session State 并整页刷新应用新值（每个作业只应用一次）
+    res = snap["result"]
+    del st.session_state["opt_job"]
+    st.session_state.opt_t_top = int(res["t_top"])
+    st.session_state.opt_t_bot = int(res["t_bot"])
+    st.session_state.opt_t_web = int(res["t_web"])
+    st.session_state.opt_logs = res["log"]
+    st.session_state.opt_run = True
+    st.rerun(scope="app")
+
+
+@st.fragment(run_every=0.5)
+def _pareto_panel():
+    snap = _job_status("pareto_job")
+    # 运行中显示部分前沿，完成后显示最终前沿
+    f = snap and (snap["result"] if snap["state"] == "done" else snap["best"])
+    if not f:
+        return
+    order = np.argsort(f["H"])
+    st.dataframe({
+        "H (mm)": f["H"][order], "B_box (mm)": f["B"][order], "Nc": f["Nc"][order].astype(int),
+        "t_top": f["t_top"][order], "t_bot": f["t_bot"][order], "t_web": f["t_web"][order],
+        "面积 (cm²)": f["Area"][order] / 100, "UR_max": f["ur_max"][order],
+    }, use_container_width=True)
+
+
+# =============== 4. 方案库（持久保存界面输入与采用厚度，见 project_store.py） ===============
+# 保存 / 载入的控件（session_state 键）
+PROJECT_KEYS = ("in_M_pos", "in_M_neg", "in_V", "in_B_deck", "in_H", "in_B_box", "in_Nc", "in_fy",
+                "in_min_top", "in_min_bot", "in_min_web", "in_rib_top", "in_rib_bot", "input_top", "input_bot", "input_web")
+
+
+def _save_project():
+    name = st.session_state.get("project_name", "").strip()
+    if name:
+        STORE.save_project(name, {k: st.session_state[k] for k in PROJECT_KEYS if k in st.session_state},
+                           app="app01")
+
+
+def _load_project(name):
+    inputs = STORE.load_project(name) or {}
+    for k in PROJECT_KEYS:
+        if k in inputs:
+            st.session_state[k] = inputs[k]
+    for k, opt in (("input_top", "opt_t_top"), ("input_bot", "opt_t_bot"), ("input_web", "opt_t_web")):
+        if k in inputs:
+            st.session_state[opt] = inputs[k]
+
+
+# =============== 5. 主程序 UI ===============
 def main():
     st.set_page_config(page_title="钢箱梁智能设计 v3", page_icon="🤖", layout="wide")
     
@@ -189,6 +114,7 @@ def main():
     if 'opt_t_bot' not in st.session_state: st.session_state.opt_t_bot = 18
     if 'opt_t_web' not in st.session_state: st.session_state.opt_t_web = 14
     if 'opt_run' not in st.session_state: st.session_state.opt_run = False
+    if 'job_owner' not in st.session_state: st.session_state.job_owner = uuid.uuid4().hex
 
     st.markdown("""
     <style>
@@ -204,29 +130,76 @@ def main():
     with st.sidebar:
         st.header("1. 基础条件")
         with st.expander("内力与几何", expanded=True):
-            M_pos = st.number_input("M+ (kN·m)", 15400.0, step=500.0)
-            M_neg = st.number_input("M- (kN·m)", 32200.0, step=500.0)
-            V     = st.number_input("V (kN)",    5360.0, step=100.0)
-            B_deck = st.number_input("桥宽 B (m)", 13.5)
-            H      = st.number_input("梁高 H (m)", 2.0)
-            B_box  = st.number_input("箱宽 B_box (m)", 9.5)
-            Nc     = st.selectbox("箱室数 Nc", [1,2,3,4], index=2)
+            M_pos = st.number_input("M+ (kN·m)", 15400.0, step=500.0, key="in_M_pos")
+            M_neg = st.number_input("M- (kN·m)", 32200.0, step=500.0, key="in_M_neg")
+            V     = st.number_input("V (kN)",    5360.0, step=100.0, key="in_V")
+            B_deck = st.number_input("桥宽 B (m)", 13.5, key="in_B_deck")
+            H      = st.number_input("梁高 H (m)", 2.0, key="in_H")
+            B_box  = st.number_input("箱宽 B_box (m)", 9.5, key="in_B_box")
+            Nc     = st.selectbox("箱室数 Nc", [1,2,3,4], index=2, key="in_Nc")
+
+        # 多荷载组合：按包络（最大弯矩组合 + 最大剪力组合）代替上面的单组内力，校核/优化/前沿均使用包络值
+        load_env, case_names = None, []
+        with st.expander("多荷载组合 (CSV，可选)", expanded=False):
+            up = st.file_uploader("列：M_pos, M_neg (kN·m), V (kN)，可选 name", type=["csv"])
+            if up is not None:
+                try:
+                    rows = list(csv.DictReader(io.StringIO(up.getvalue().decode("utf-8-sig"))))
+                    load_env = load_envelope([[float(r["M_pos"]), float(r["M_neg"]), float(r["V"])] for r in rows])
+                except (KeyError, ValueError) as e:
+                    st.error(f"组合表读取失败：{e}")
+                else:
+                    case_names = [r.get("name") or f"#{i + 1}" for i, r in enumerate(rows)]
+                    M_pos = M_neg = load_env["M"]
+                    V = load_env["V"]
+                    st.caption(f"共 {len(rows)} 个组合；弯矩控制 {case_names[load_env['case_M']]} "
+                               f"(M={load_env['M']:.0f} kN·m)，剪力控制 {case_names[load_env['case_V']]} "
+                               f"(V={load_env['V']:.0f} kN)。上方单组内力不再使用。")
         
         st.header("2. 构造限制")
-        fy = st.number_input("钢材 fy (MPa)", 345.0)
+        fy = st.number_input("钢材 fy (MPa)", 345.0, key="in_fy")
         gamma0 = 1.1
         
         c1, c2, c3 = st.columns(3)
-        min_top = c1.number_input("min顶", 16)
-        min_bot = c2.number_input("min底", 14)
-        min_web = c3.number_input("min腹", 12)
+        min_top = c1.number_input("min顶", 16, key="in_min_top")
+        min_bot = c2.number_input("min底", 14, key="in_min_bot")
+        min_web = c3.number_input("min腹", 12, key="in_min_web")
+        # 优化器厚度轴：2 mm 等差，或只取钢厂目录档位
+        t_mode = st.selectbox("优化厚度取值", ["2 mm 步长"] + [f"钢厂目录 {g}" for g in CATALOGS])
+        catalog = PlateCatalog.from_grade(t_mode.split()[-1]) if t_mode.startswith("钢厂目录") else None
+        # 优化方法：格点全局搜索（精确），或梯度引导（连续解 + 取整，十余次校核，通常结果相同）
+        opt_method = st.selectbox("优化方法", ["格点全局搜索", "梯度引导 (连续解 + 取整)"])
+        # 纵向 U 肋（尺寸取常用值，间距可调）：示意图、构件几何与局部稳定共用同一组肋
+        rc1, rc2 = st.columns(2)
+        s_top = rc1.number_input("顶板 U 肋间距 (mm，0 不设)", value=U_RIB_DECK[0], step=50.0, min_value=0.0,
+                                 key="in_rib_top")
+        s_bot = rc2.number_input("底板 U 肋间距 (mm，0 不设)", value=U_RIB_BOTTOM[0], step=50.0, min_value=0.0,
+                                 key="in_rib_bot")
+        top_ribs = (s_top,) + U_RIB_DECK[1:] if s_top > 0 else None
+        bot_ribs = (s_bot,) + U_RIB_BOTTOM[1:] if s_bot > 0 else None
+        # 局部稳定（翼缘宽厚比、腹板剪切屈曲）：按示意图的腹板内收与上面的 U 肋计入优化可行性
+        use_stab = st.checkbox("优化计入局部稳定（宽厚比 / 腹板剪切屈曲）", value=True)
+        stab_rules = StabilityRules(e_web=60.0, top_ribs=top_ribs, bot_ribs=bot_ribs)
+
+        with st.expander("🐞 缓存调试", expanded=False):
+            st.json({"截面": SECTION_CACHE.stats(), "图像": FIGURE_CACHE.stats(), "作业": JOB_MANAGER.stats()})
+
+        # 方案库：同一方案重新打开时，截面校核与示意图直接从本地库命中，无需重算 / 重绘
+        if STORE is not None:
+            with st.expander("💾 方案库", expanded=False):
+                st.text_input("方案名称", key="project_name")
+                st.button("保存当前方案", on_click=_save_project)
+                saved = STORE.list_projects(app="app01")
+                if saved:
+                    pick = st.selectbox("已保存方案", [n for n, _ in saved])
+                    st.button("载入", on_click=_load_project, args=(pick,))
 
     # --- 顶部：优化控制区 ---
     st.markdown("### 🎯 智能优化控制台")
     col_opt1, col_opt2, col_opt3 = st.columns([0.2, 0.5, 0.3])
     
     with col_opt1:
-        st.info("💡 点击按钮，算法将在20步内自动寻找满足强度且最省材的截面。")
+        st.info("💡 点击按钮，算法将在离散厚度格点上全局搜索满足强度且最省材的截面。")
         if st.button("🚀 开始自动优化 (Auto Optimize)", type="primary"):
             # 1. 实例化一个初始对象 (使用最小构造厚度作为起点，或者当前值)
             section_opt = BoxGirderSection(
@@ -235,18 +208,49 @@ def main():
                 Nc, fy, gamma0, 
                 min_top, min_bot, min_web
             )
-            
-            with st.spinner("正在进行有限步进迭代计算..."):
-                success, logs = section_opt.optimize(M_pos, M_neg, V, max_iter=20)
-                time.sleep(0.5) # 稍微停顿展示加载动画
-            
-            # 更新 Session State
-            st.session_state.opt_t_top = int(section_opt.t_top)
-            st.session_state.opt_t_bot = int(section_opt.t_bot)
-            st.session_state.opt_t_web = int(section_opt.t_web)
-            st.session_state.opt_logs = logs
-            st.session_state.opt_run = True
-            st.rerun() # 强制刷新页面应用新值
+            # 2. 提交到后台作业队列，完成后由 _optimize_panel 写回 Session State 并刷新页面
+            method = "gradient" if opt_method.startswith("梯度") else "grid"
+            _submit("opt_job", optimize_job, section_opt, M_pos, M_neg, V, 80, 2, catalog, method,
+                    stab_rules if use_stab else None, name=opt_method.split()[0])
+        _optimize_panel()
+
+    with col_opt2:
+        with st.expander("📈 方案比选：面积–梁高–箱室数–箱宽 Pareto 前沿", expanded=False):
+            pc1, pc2 = st.columns(2)
+            H_rng = pc1.slider("梁高范围 H (m)", 1.0, 4.0, (1.2, 3.0), 0.1)
+            B_rng = pc2.slider("箱宽范围 B_box (m)", 5.0, 14.0, (7.0, 12.0), 0.5)
+            if st.button("📈 扫描前沿"):
+                # 后台分块流式计算：每块结束即更新一次部分前沿，由 _pareto_panel 轮询显示
+                _submit("pareto_job", pareto_job,
+                        np.round(np.arange(B_rng[0], B_rng[1] + 1e-9, 0.5) * 1000),
+                        np.round(np.arange(H_rng[0], H_rng[1] + 1e-9, 0.1) * 1000),
+                        [1, 2, 3, 4], M_pos, M_neg, V, fy, gamma0,
+                        np.arange(min_top, 61, 2), np.arange(min_bot, 61, 2), np.arange(min_web, 41, 2),
+                        name="前沿扫描")
+            _pareto_panel()
+
+        with st.expander("🧱 全梁纵向分段：弯矩/剪力图 → 板段", expanded=False):
+            diag = st.file_uploader("CSV 列：x (m)，M (kN·m，正弯矩为正) 或 M_pos/M_neg，V (kN)", type=["csv"],
+                                    key="girder_csv")
+            gc1, gc2 = st.columns(2)
+            L_min = gc1.number_input("最小板段长 (m)", 1.0, 30.0, 6.0, 0.5)
+            dt_max = gc2.number_input("相邻段厚度差上限 (mm)", 2.0, 40.0, 8.0, 2.0)
+            if diag is not None and st.button("🧱 分段设计"):
+                try:
+                    x, Mp, Mn, Vx = read_stations(io.StringIO(diag.getvalue().decode("utf-8-sig")))
+                    g = size_girder(x, Mp, Mn, Vx, B_box * 1000, H * 1000, Nc, fy, gamma0,
+                                    min_top, min_bot, min_web, L_min=L_min, dt_max=dt_max)
+                except (ValueError, RuntimeError) as e:
+                    st.error(str(e))
+                else:
+                    st.caption(f"{g['n_stations']} 个截面，{g['elapsed']:.2f} s；钢材 {g['volume']:.2f} m³"
+                               f"（{g['mass']:.1f} t），逐截面取所需厚度为 {g['volume_req']:.2f} m³；"
+                               f"UR_max {g['ur_max'].max():.3f}")
+                    st.line_chart({"x (m)": g["x"], "t_top": g["t_top"], "t_bot": g["t_bot"], "t_web": g["t_web"]},
+                                  x="x (m)")
+                    st.dataframe([{"板": p, "起点 (m)": round(a, 3), "终点 (m)": round(b, 3), "厚度 (mm)": t}
+                                  for p, segs in g["segments"].items() for a, b, t in segs],
+                                 use_container_width=True)
 
     # --- 中间：参数调整与结果展示 ---
     
@@ -261,12 +265,8 @@ def main():
         t_bot = st.number_input("底板厚 (mm)", value=st.session_state.opt_t_bot, step=2, key='input_bot')
         t_web = st.number_input("腹板厚 (mm)", value=st.session_state.opt_t_web, step=2, key='input_web')
         
-        # 实例化当前显示的截面
-        current_section = BoxGirderSection(
-            B_box*1000, H*1000, t_top, t_bot, t_web, Nc, fy, gamma0, 
-            min_top, min_bot, min_web
-        )
-        res = current_section.check_capacity(M_pos, M_neg, V)
+        # 当前显示截面的属性与校核（共享缓存，重复/相近输入不再重算）
+        res = check_section(B_box*1000, H*1000, t_top, t_bot, t_web, Nc, fy, gamma0, M_pos, M_neg, V)
         
         # 迭代日志展示区
         if st.session_state.opt_run:
@@ -277,28 +277,76 @@ def main():
     with c_in2:
         st.subheader("📊 实时验算结果")
         
+        # 按下方示意图的构件几何（含翼缘外伸、腹板内收、U 肋）校核：指标与结论均取此结果
+        geo = box_geometry(B_box*1000, H*1000, t_top, t_bot, t_web, Nc, out_top=145.0, out_bot=60.0, e_web=60.0,
+                           top_ribs=top_ribs, bot_ribs=bot_ribs)
+        geo_res = geo.check(fy, gamma0, M_pos, M_neg, V)
+
         # 仪表盘样式
         m1, m2, m3, m4 = st.columns(4)
-        m1.metric("截面面积", f"{current_section.Area/1e4:.1f} cm²", delta_color="inverse")
-        m2.metric("最大应力", f"{res['ur_max']*current_section.fd:.0f} MPa", f"{(res['ur_max']-1)*100:.1f}%")
+        m1.metric("截面面积", f"{geo_res['Area']/1e4:.1f} cm²", delta_color="inverse")
+        m2.metric("最大应力", f"{geo_res['ur_max']*res['fd']:.0f} MPa", f"{(geo_res['ur_max']-1)*100:.1f}%")
         
         # 进度条
         st.write("弯曲利用率 (Flexure UR)")
-        u_flex = max(res['ur_top'], res['ur_bot'])
+        u_flex = max(geo_res['ur_top'], geo_res['ur_bot'])
         bar_color = "red" if u_flex > 1.0 else ("orange" if u_flex > 0.9 else "green")
         st.progress(min(u_flex, 1.0))
         st.caption(f"当前: {u_flex:.2f} / 目标: 0.90-1.00")
         
         st.write("剪切利用率 (Shear UR)")
-        st.progress(min(res['ur_shear'], 1.0))
-        st.caption(f"当前: {res['ur_shear']:.2f}")
+        st.progress(min(geo_res['ur_shear'], 1.0))
+        st.caption(f"当前: {geo_res['ur_shear']:.2f}")
+        # 自动优化、灵敏度仍按三矩形简化模型，此处列出差别
+        st.caption(f"按图示几何（{len(geo)} 个构件）：UR_max={geo_res['ur_max']:.3f}；"
+                   f"优化与灵敏度所用三矩形简化模型 UR_max={res['ur_max']:.3f}")
+
+        stab = {k: float(v) for k, v in stab_rules.check(B_box*1000, H*1000, t_top, t_bot, t_web, Nc, fy,
+                                                         M_pos, M_neg, V).items()}
+        st.caption(f"局部稳定：顶板宽厚比 {stab['ur_bt_top']:.2f}，底板宽厚比 {stab['ur_bt_bot']:.2f}，"
+                   f"腹板剪切屈曲 {stab['ur_buckle']:.2f}")
+        if max(stab.values()) > 1.0:
+            st.warning("⚠️ 局部稳定不满足：请加厚对应板件，或在优化时勾选“计入局部稳定”。")
+
+        if load_env is not None:
+            gov = int(governing_case(geo_res, load_env))
+            st.caption(f"控制组合：{case_names[gov]}（{len(case_names)} 个组合包络）")
 
-        if res['ur_max'] > 1.0:
+        if geo_res['ur_max'] > 1.0:
             st.error("❌ 截面强度不足！请加大厚度或点击自动优化。")
-        elif res['ur_max'] < 0.8:
+        elif geo_res['ur_max'] < 0.8:
             st.warning("⚠️ 截面过于保守，存在浪费。建议点击自动优化。")
         else:
             st.success("✅ 截面设计合理 (0.8 ~ 1.0)。")
 
+        # 灵敏度：各利用率与面积对尺寸的偏导（解析求导），指示加厚哪块板最有效
+        with st.expander("🧮 灵敏度分析（每增加 1 mm 的变化）", expanded=False):
+            sens = sensitivity_table(section_sensitivity(B_box*1000, H*1000, t_top, t_bot, t_web, Nc,
+                                                         fy, gamma0, M_pos, M_neg, V))
+            names = {"B": "箱宽 B", "H": "梁高 H", "t_top": "顶板厚", "t_bot": "底板厚", "t_web": "腹板厚"}
+            st.dataframe([{"尺寸": names[v], "面积 (cm²)": sens["Area"][v] / 100,
+                           **{k: sens[k][v] for k in ("ur_top", "ur_bot", "ur_shear", "ur_max")}}
+                          for v in SENS_VARS], use_container_width=True)
+            st.caption("ur_max 取控制项的偏导；面积 / UR 降低越多（负值越大）的尺寸，加大它越有效。")
+
+        # 邻点试算：各板 ±2 mm 后的利用率（增量属性引擎，只重算改动的构件）
+        with st.expander("🔁 邻点试算（各板 ±2 mm）", expanded=False):
+            moments = SectionMoments(B_box*1000, H*1000, t_top, t_bot, t_web, Nc)
+            ur_now = moments.check_capacity(fy, gamma0, M_pos, M_neg, V)["ur_max"]
+            plate_names = {"t_top": "顶板厚", "t_bot": "底板厚", "t_web": "腹板厚"}
+            st.dataframe([{"试算": f"{plate_names[p]} {d:+g} mm",
+                           **{k: float(ur[k]) for k in ("ur_top", "ur_bot", "ur_shear", "ur_max")},
+                           "ΔUR_max": float(ur["ur_max"] - ur_now)}
+                          for (p, d), ur in moments.neighbours(fy, gamma0, M_pos, M_neg, V, step=2.0).items()],
+                         use_container_width=True)
+            st.caption("按三矩形简化模型（同自动优化）；用于判断再调一档厚度后是否仍满足 UR ≤ 1。")
+
+        # 截面示意（翼缘外伸/腹板内收取 app.py 默认值；U 肋与局部稳定校核一致）
+        st.image(render_section("cad", "png", dpi=200,
+                                B_deck=B_deck, B_box_mm=B_box*1000, H_mm=H*1000,
+                                t_top=t_top, t_bot=t_bot, t_web=t_web, Nc=Nc,
+                                out_top=145.0, out_bot=60.0, e_web=60.0, top_ribs=top_ribs, bot_ribs=bot_ribs),
+                 use_container_width=True)
+
 if __name__ == "__main__":
     main()
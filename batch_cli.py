@@ -0,0 +1,280 @@
+# -*- coding: utf-8 -*-
+"""
+命令行批处理：按荷载工况文件批量初选钢箱梁截面（不依赖 streamlit / matplotlib）
+
+输入：CSV，或 JSON（顶层数组）/ JSON Lines（.jsonl/.ndjson，每行一个对象）。
+      必填列：M_pos, M_neg, V (kN·m / kN), B_deck, H (m)
+      可选列：B_box 或 L_res/R_res 或 box_ratio（确定箱宽，缺省 L_res=R_res=1.0 m），
+             Nc, fy, gamma0, eta_beff, t_corr, t_top_min, t_bot_min, t_web_min, round_step
+      （--catalog 给出钢种时 round_step 不再使用，厚度取该钢种目录档位；超出最厚档的行 status 为 beyond_catalog）
+      其余列原样透传到输出。
+      某行缺少必填列或数值无法解析时该行 status 为 invalid（原因写入 error 列），同块其余各行照常计算。
+输出：CSV 或 JSON Lines（按输出文件扩展名；缺省 CSV 写到标准输出）。
+      CSV 表头在写第一行时确定：取第一块各行出现过的全部列；之后才出现的透传列不写入 CSV，
+      并在标准错误给出一次提示（需要逐行保留任意列时请输出 JSON Lines）。
+
+按块流式读写（每块 --chunk 行，向量化计算），百万行文件也不会整体载入内存。
+
+示例：
+    python batch_cli.py cases.csv -o results.csv
+    python batch_cli.py cases.jsonl -o results.jsonl --method optimize
+    python batch_cli.py cases.csv -o results.csv --catalog Q345qD
+"""
+import argparse
+import csv
+import json
+import sys
+from itertools import islice
+
+import numpy as np
+
+from box_section import SectionArray, grid_optimize, recommend_nc, size_by_rules
+from catalog import CATALOGS, PlateCatalog, catalog_optimize
+
+# 可选列缺省值（与 app.py 侧边栏默认值一致）
+DEFAULTS = {
+    "fy": 345.0, "gamma0": 1.1, "eta_beff": 0.35, "t_corr": 2.0,
+    "t_top_min": 16.0, "t_bot_min": 14.0, "t_web_min": 12.0, "round_step": 2.0,
+    "L_res": 1.0, "R_res": 1.0,
+}
+REQUIRED = ("M_pos", "M_neg", "V", "B_deck", "H")
+RESULT_KEYS = ("B_box", "Nc", "t_top", "t_bot", "t_web",
+               "Area", "ur_top", "ur_bot", "ur_shear", "ur_max", "status", "error")
+
+
+# =============== 1. 流式读取 ===============
+def _iter_json_array(f, bufsize=1 << 16):
+    """逐个解析顶层 JSON 数组中的对象，不一次性读入整个文件"""
+    dec = json.JSONDecoder()
+    buf, pos, started = "", 0, False
+    while True:
+        # 跳过空白、逗号与起始 '['
+        while True:
+            while pos < len(buf) and buf[pos] in " \t\r\n,":
+                pos += 1
+            if not started and pos < len(buf):
+                if buf[pos] != "[":
+                    raise ValueError("JSON 输入须为对象数组或 JSON Lines")
+                started, pos = True, pos + 1
+                continue
+            break
+        if pos < len(buf) and buf[pos] == "]":
+            return
+        try:
+            obj, end = dec.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            more = f.read(bufsize)
+            if not more:
+                if buf[pos:].strip():
+                    raise
+                return
+            buf, pos = buf[pos:] + more, 0
+            continue
+        yield obj
+        pos = end
+
+
+def iter_rows(path):
+    """按扩展名流式读取输入行（dict）"""
+    f = sys.stdin if path == "-" else open(path, encoding="utf-8-sig", newline="")
+    try:
+        if path.endswith((".jsonl", ".ndjson")):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        elif path.endswith(".json"):
+            yield from _iter_json_array(f)
+        else:
+            yield from csv.DictReader(f)
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
+# =============== 2. 分块计算 ===============
+def _float(v, name):
+    """单个输入值 -> 有限 float，否则抛 ValueError"""
+    try:
+        v = float(v)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} 不是数值：{v!r}") from None
+    if not np.isfinite(v):
+        raise ValueError(f"{name} 须为有限数值：{v!r}")
+    return v
+
+
+def _column(rows, key, errors, default=None):
+    """
+    取一列为 float 数组；空值用缺省值。
+    必填列缺失或值无法解析时该行置 nan 并把原因记入 errors[行号]（每行只记第一个错误），不中断整块。
+    """
+    out = np.empty(len(rows))
+    for i, r in enumerate(rows):
+        v = r.get(key)
+        try:
+            if v is None or v == "":
+                if default is None:
+                    raise ValueError(f"缺少必填列 {key}")
+                v = default
+            out[i] = _float(v, key)
+        except ValueError as e:
+            out[i] = np.nan
+            errors.setdefault(i, str(e))
+    return out
+
+
+def _box_width(rows, B_deck, errors):
+    """箱宽 (m)：B_box > box_ratio > 桥面宽扣除左右预留带；无法解析的行同 _column 记入 errors"""
+    B_box = np.full(len(rows), np.nan)
+    for i, r in enumerate(rows):
+        try:
+            if r.get("B_box") not in (None, ""):
+                B_box[i] = _float(r["B_box"], "B_box")
+            elif r.get("box_ratio") not in (None, ""):
+                B_box[i] = _float(r["box_ratio"], "box_ratio") * B_deck[i]
+            else:
+                L = r.get("L_res") if r.get("L_res") not in (None, "") else DEFAULTS["L_res"]
+                R = r.get("R_res") if r.get("R_res") not in (None, "") else DEFAULTS["R_res"]
+                B_box[i] = B_deck[i] - _float(L, "L_res") - _float(R, "R_res")
+        except ValueError as e:
+            errors.setdefault(i, str(e))
+    return B_box
+
+
+def _nc_column(rows, B_box, errors):
+    """逐行室数：给了 Nc 用给定值（须为正整数），否则按箱宽推荐"""
+    Nc = recommend_nc(np.where(np.isfinite(B_box), B_box, 0.0))
+    for i, r in enumerate(rows):
+        if r.get("Nc") in (None, ""):
+            continue
+        try:
+            n = _float(r["Nc"], "Nc")
+            if n < 1 or n != int(n):
+                raise ValueError(f"Nc 须为正整数：{r['Nc']!r}")
+            Nc[i] = int(n)
+        except ValueError as e:
+            errors.setdefault(i, str(e))
+    return Nc
+
+
+def size_chunk(rows, method="rules", catalog=None):
+    """对一块输入行求截面，返回结果 dict 列表（与 rows 一一对应）；catalog 为 PlateCatalog 或 None"""
+    errors = {}
+    c = {k: _column(rows, k, errors) for k in REQUIRED}
+    c.update({k: _column(rows, k, errors, DEFAULTS[k]) for k in DEFAULTS if k not in ("L_res", "R_res")})
+    for i in np.flatnonzero(c["H"] <= 0):
+        errors.setdefault(int(i), f"H 须为正：{c['H'][i]:g}")
+    B_box = _box_width(rows, c["B_deck"], errors)
+    Nc = _nc_column(rows, B_box, errors)
+
+    invalid = np.zeros(len(rows), dtype=bool)
+    invalid[list(errors)] = True
+    # 无效行与箱宽非正的行不参与计算：代入占位值（结果随后一律置 nan），避免 nan / 除零传入各向量化步骤
+    skip = invalid | ~(B_box > 0)
+    if skip.any():
+        c = {k: np.where(skip, DEFAULTS.get(k, 1.0), v) for k, v in c.items()}
+        B_calc, Nc_calc = np.where(skip, 1.0, B_box), np.where(skip, 1, Nc)
+    else:
+        B_calc, Nc_calc = B_box, Nc
+
+    sized = size_by_rules(c["M_pos"], c["M_neg"], c["V"], B_calc, c["H"], c["fy"], c["gamma0"],
+                          c["eta_beff"], Nc_calc, c["t_corr"], c["t_top_min"], c["t_bot_min"],
+                          c["t_web_min"], c["round_step"], catalog)
+    t_top, t_bot, t_web = sized["t_top"], sized["t_bot"], sized["t_web"]
+    # 状态优先级：invalid > B_box<=0 > beyond_catalog > rules
+    status = np.full(len(rows), "rules", dtype=object)
+    status[np.isnan(t_top) | np.isnan(t_bot) | np.isnan(t_web)] = "beyond_catalog"
+    status[skip] = "B_box<=0"
+    status[invalid] = "invalid"
+
+    if method == "optimize":
+        t_top, t_bot, t_web = t_top.copy(), t_bot.copy(), t_web.copy()
+        for i in range(len(rows)):
+            if skip[i]:
+                continue
+            args = (B_box[i] * 1000, c["H"][i] * 1000, c["M_pos"][i], c["M_neg"][i], c["V"][i],
+                    c["fy"][i], c["gamma0"][i], c["t_top_min"][i], c["t_bot_min"][i], c["t_web_min"][i])
+            if catalog is not None:
+                # (B, H) 相同的行共用缓存的目录构件表
+                res = catalog_optimize(catalog, *args, t_max=80, Nc_values=(Nc[i],))
+            else:
+                res = grid_optimize(*args, step=c["round_step"][i], Nc_values=(Nc[i],))
+            if res["success"]:
+                t_top[i], t_bot[i], t_web[i] = res["t_top"], res["t_bot"], res["t_web"]
+                status[i] = "optimized"
+            else:
+                status[i] = "infeasible"
+
+    chk = SectionArray.from_inputs(B_calc * 1000, c["H"] * 1000, t_top, t_bot, t_web, Nc_calc,
+                                   c["fy"], c["gamma0"]).check(c["M_pos"], c["M_neg"], c["V"])
+    # 未求得截面的行（超出目录 / 无可行解 / 箱宽非正）：厚度与属性、利用率一律置 nan，
+    # 不输出对 nan 厚度兜底得到的“有限”利用率
+    bad = ~np.isin(status, ("rules", "optimized"))
+    if bad.any():
+        t_top, t_bot, t_web = (np.where(bad, np.nan, t) for t in (t_top, t_bot, t_web))
+        chk = {k: np.where(bad, np.nan, v) for k, v in chk.items()}
+    cols = {"B_box": B_box, "Nc": Nc, "t_top": t_top, "t_bot": t_bot, "t_web": t_web,
+            "Area": chk["Area"], "ur_top": chk["ur_top"], "ur_bot": chk["ur_bot"],
+            "ur_shear": chk["ur_shear"], "ur_max": chk["ur_max"], "status": status,
+            "error": [errors.get(i, "") for i in range(len(rows))]}
+    out = []
+    for i in range(len(rows)):
+        rec = {}
+        for k in RESULT_KEYS:
+            v = cols[k][i]
+            rec[k] = v.item() if isinstance(v, np.generic) else v
+        out.append(rec)
+    return out
+
+
+def run(in_path, out_path="-", method="rules", chunk=4096, catalog=None):
+    """流式处理整个文件，返回处理行数"""
+    rows_it = iter_rows(in_path)
+    fout = sys.stdout if out_path == "-" else open(out_path, "w", encoding="utf-8", newline="")
+    as_jsonl = out_path.endswith((".jsonl", ".ndjson"))
+    writer, dropped, n = None, set(), 0
+    try:
+        while True:
+            rows = list(islice(rows_it, chunk))
+            if not rows:
+                break
+            if not as_jsonl and writer is None:
+                # 表头：第一块各行出现过的全部输入列（按首次出现顺序）+ 结果列
+                fields = dict.fromkeys(k for row in rows for k in row if k not in RESULT_KEYS)
+                writer = csv.DictWriter(fout, fieldnames=[*fields, *RESULT_KEYS], extrasaction="ignore")
+                writer.writeheader()
+            for i, (row, res) in enumerate(zip(rows, size_chunk(rows, method, catalog))):
+                rec = {**row, **res}
+                if as_jsonl:
+                    fout.write(json.dumps(rec, ensure_ascii=False) + "\n")
+                else:
+                    extra = rec.keys() - set(writer.fieldnames) - dropped
+                    if extra:
+                        dropped |= extra
+                        print(f"警告：第 {n + i + 1} 行起出现的列 {sorted(extra)} 不在 CSV 表头中，已忽略"
+                              "（如需保留请输出 .jsonl）", file=sys.stderr)
+                    writer.writerow(rec)
+            n += len(rows)
+    finally:
+        if fout is not sys.stdout:
+            fout.close()
+    return n
+
+
+# =============== 3. 命令行 ===============
+def main(argv=None):
+    p = argparse.ArgumentParser(description="钢箱梁截面批量初选（无界面）")
+    p.add_argument("input", help="荷载工况文件 (.csv / .json / .jsonl)，'-' 表示标准输入 CSV")
+    p.add_argument("-o", "--output", default="-", help="输出文件 (.csv / .jsonl)，缺省为标准输出 CSV")
+    p.add_argument("--method", choices=("rules", "optimize"), default="rules",
+                   help="rules: app.py 工程取值策略；optimize: 在规则 Nc 下做格点全局优化")
+    p.add_argument("--chunk", type=int, default=4096, help="每块行数")
+    p.add_argument("--catalog", choices=tuple(CATALOGS), help="按该钢种的钢板目录取厚度（代替 round_step 取整）")
+    args = p.parse_args(argv)
+    catalog = None if args.catalog is None else PlateCatalog.from_grade(args.catalog)
+    n = run(args.input, args.output, args.method, args.chunk, catalog)
+    print(f"已处理 {n} 行", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""
+绘图基准：LineCollection 批处理 vs 逐段 ax.plot（旧画法）
+
+对不同箱室数 Nc 分别计时“绘制 + 导出 PNG”，报告中位耗时与 Line2D/集合数量。
+运行：python benchmarks/bench_drawing.py [--repeat 5] [--dpi 200]
+"""
+import argparse
+import io
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from drawing import draw_section_cad, draw_section_3d  # noqa: E402
+
+
+def _geom(Nc):
+    B_box_mm = 3000.0 * Nc + 120.0
+    return dict(B_deck=(B_box_mm + 2000.0) / 1000, B_box_mm=B_box_mm, H_mm=2000.0,
+                t_top=18.0, t_bot=16.0, t_web=14.0, Nc=Nc,
+                out_top=145.0, out_bot=60.0, e_web=60.0, dim_gap=120)
+
+
+def _time_render(draw, geom, batched, repeat, dpi):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fig = draw(batched=batched, **geom)
+        fig.savefig(io.BytesIO(), format="png", bbox_inches="tight", dpi=dpi)
+        times.append(time.perf_counter() - t0)
+    ax = fig.axes[0]
+    return statistics.median(times), len(ax.lines), len(ax.collections)
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    p.add_argument("--repeat", type=int, default=5)
+    p.add_argument("--dpi", type=int, default=200)
+    p.add_argument("--nc", default="1,4,16,64", help="箱室数列表")
+    args = p.parse_args(argv)
+
+    print(f"{'视图':<4} {'Nc':>4} {'逐段(ms)':>10} {'Line2D':>7} {'批处理(ms)':>11} {'集合':>5} {'加速':>6}")
+    for name, draw in (("cad", draw_section_cad), ("3d", draw_section_3d)):
+        for Nc in (int(x) for x in args.nc.split(",")):
+            g = _geom(Nc)
+            t_old, n_lines, _ = _time_render(draw, g, False, args.repeat, args.dpi)
+            t_new, _, n_coll = _time_render(draw, g, True, args.repeat, args.dpi)
+            print(f"{name:<4} {Nc:>4} {t_old * 1e3:>10.1f} {n_lines:>7} {t_new * 1e3:>11.1f} {n_coll:>5} {t_old / t_new:>5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
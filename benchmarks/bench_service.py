@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""
+本地服务压测：在本进程内启动 service.py（127.0.0.1 随机端口），多个客户端线程以 keep-alive 连接并发请求
+
+场景：/check 冷缓存与热缓存（每请求 --batch 个截面）、/optimize（网格 / 梯度）、/render（PNG）。
+报告各场景的请求/s、截面/s、客户端 p50 / p99 延迟与 503 次数，最后打印服务端 /metrics。
+运行：python benchmarks/bench_service.py [--clients 8] [--requests 200] [--batch 100] [--workers 4]
+      python benchmarks/bench_service.py --url http://127.0.0.1:8765   # 压测已启动的服务
+"""
+import argparse
+import http.client
+import json
+import os
+import sys
+import threading
+import time
+from urllib.parse import urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+
+LOADS = dict(M_pos=15400.0, M_neg=32200.0, V=5360.0)
+GEOM = dict(B_deck=13.5, B_box_mm=11500.0, H_mm=2000.0, t_top=18.0, t_bot=16.0, t_web=14.0, Nc=4,
+            out_top=145.0, out_bot=60.0, e_web=60.0, dim_gap=120)
+
+
+def _sections(n, seed):
+    rng = np.random.default_rng(seed)
+    return [dict(B_box_mm=float(rng.uniform(4000, 12000)), H_mm=float(rng.uniform(1500, 3000)),
+                 t_top=float(rng.integers(8, 30) * 2), t_bot=float(rng.integers(7, 30) * 2),
+                 t_web=float(rng.integers(6, 20) * 2), Nc=int(rng.integers(1, 5))) for _ in range(n)]
+
+
+def _post(conn, path, body):
+    conn.request("POST", path, body, {"Content-Type": "application/json"})
+    resp = conn.getresponse()
+    data = resp.read()
+    return resp.status, data
+
+
+def run_scenario(host, port, path, bodies, clients):
+    """clients 个线程分摊 bodies 逐个 POST；返回 (总耗时 s, 各请求耗时列表, 状态码计数)"""
+    lat, status = [], {}
+    lock = threading.Lock()
+    it = iter(bodies)
+
+    def client():
+        conn = http.client.HTTPConnection(host, port, timeout=120)
+        while True:
+            with lock:
+                body = next(it, None)
+            if body is None:
+                break
+            t0 = time.perf_counter()
+            code, _ = _post(conn, path, body)
+            dt = time.perf_counter() - t0
+            with lock:
+                lat.append(dt)
+                status[code] = status.get(code, 0) + 1
+        conn.close()
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return time.perf_counter() - t0, lat, status
+
+
+def _report(name, elapsed, lat, status, per_request):
+    lat_ms = np.array(lat) * 1e3
+    n = len(lat)
+    print(f"{name:<20} {n / elapsed:>9.1f} {n * per_request / elapsed:>11.0f} "
+          f"{np.percentile(lat_ms, 50):>9.2f} {np.percentile(lat_ms, 99):>9.2f} {status.get(503, 0):>6}"
+          + ("" if set(status) <= {200, 503} else f"  状态码 {status}"))
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="钢箱梁计算服务本地压测")
+    p.add_argument("--url", help="已启动服务的地址；缺省在本进程内启动")
+    p.add_argument("--clients", type=int, default=8, help="并发客户端数")
+    p.add_argument("--requests", type=int, default=200, help="每个场景的请求数")
+    p.add_argument("--batch", type=int, default=100, help="/check 每请求截面数")
+    p.add_argument("--workers", type=int, default=4, help="服务计算线程数（本进程启动时）")
+    p.add_argument("--max-pending", type=int, default=256, help="服务排队上限（本进程启动时）")
+    p.add_argument("--cache-size", type=int, default=65536, help="服务结果缓存条数（本进程启动时）")
+    args = p.parse_args(argv)
+
+    server = None
+    if args.url:
+        u = urlsplit(args.url)
+        host, port = u.hostname, u.port
+    else:
+        os.environ.setdefault("BOXGIRDER_STORE", "")   # 压测不写持久库
+        from service import make_server
+        server = make_server("127.0.0.1", 0, args.workers, args.max_pending, args.cache_size)
+        host, port = server.server_address[:2]
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    check = [json.dumps(dict(sections=_sections(args.batch, i), **LOADS)).encode()
+             for i in range(args.requests)]
+    n_opt = max(args.requests // 10, 1)
+    opt_items = [dict(B_box_mm=B, H_mm=H, **LOADS) for B, H in zip(np.linspace(6000, 12000, n_opt),
+                                                                      np.linspace(1800, 2800, n_opt))]
+    grid = [json.dumps(dict(sections=[it])).encode() for it in opt_items]
+    grad = [json.dumps(dict(sections=[dict(it, Nc=3, method="gradient")])).encode() for it in opt_items]
+    render = [json.dumps(dict(view="cad", fmt="png", dpi=100,
+                              sections=[dict(GEOM, H_mm=2000.0 + 10 * i)])).encode() for i in range(n_opt)]
+
+    print(f"服务 http://{host}:{port}  客户端 {args.clients}  /check 每请求 {args.batch} 个截面")
+    print(f"{'场景':<20} {'请求/s':>9} {'截面/s':>11} {'p50 ms':>9} {'p99 ms':>9} {'503':>6}")
+    for name, path, bodies, per in (("check 冷缓存", "/check", check, args.batch),
+                                    ("check 热缓存", "/check", check, args.batch),
+                                    ("optimize 网格", "/optimize", grid, 1),
+                                    ("optimize 网格(热)", "/optimize", grid, 1),
+                                    ("optimize 梯度", "/optimize", grad, 1),
+                                    ("render png", "/render", render, 1),
+                                    ("render png(热)", "/render", render, 1)):
+        _report(name, *run_scenario(host, port, path, bodies, args.clients), per)
+
+    conn = http.client.HTTPConnection(host, port, timeout=30)
+    conn.request("GET", "/metrics")
+    metrics = json.loads(conn.getresponse().read())
+    conn.close()
+    print("\n服务端 /metrics：")
+    for ep, m in metrics["endpoints"].items():
+        print(f"  {ep:<10} 请求 {m['requests']:>6}  截面 {m['items']:>8}  错误 {m['errors']:>3}  "
+              f"p50 {m['p50_ms']:.2f} ms  p95 {m['p95_ms']:.2f} ms  p99 {m['p99_ms']:.2f} ms")
+    c = metrics["cache"]
+    print(f"  缓存 {c['size']}/{c['maxsize']}  命中率 {c['hit_rate']:.1%}  拒绝 {metrics['pool']['rejected']}")
+
+    if server is not None:
+        server.shutdown()
+        server.server_close()
+        server.service.pool.shutdown()
+
+
+if __name__ == "__main__":
+    main()
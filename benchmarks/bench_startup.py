@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+"""
+冷启动基准：各 Streamlit 应用顶层 import 的耗时，以及首次出图（含延迟导入 matplotlib）的耗时
+
+每次测量都在全新的解释器进程中进行（模块缓存为空，接近 `streamlit run` 的首次执行）；
+应用的顶层 import 语句用 ast 从源码中取出，按原顺序逐条计时；持久结果库（project_store）关闭。当前环境未安装的模块（如 streamlit）
+记为缺失并跳过，其余照常计时。
+
+运行：
+    python benchmarks/bench_startup.py                 # 三个应用，各 5 次取中位数
+    python benchmarks/bench_startup.py -n 10 --importtime 15   # 另列 -X importtime 自身耗时前 15 的模块
+"""
+import argparse
+import ast
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APPS = ("app.py", "app01.py", "xianglaingv1.0")
+HEAVY = ("numpy", "pandas", "matplotlib", "matplotlib.pyplot", "streamlit")
+
+# 子进程内执行：逐条计时 import，再计时首次出图
+_PROBE = r"""
+import json, sys, time
+sys.path.insert(0, {root!r})
+stmts, render = {stmts!r}, {render!r}
+out = {{"imports": [], "missing": []}}
+t_all = time.perf_counter()
+for s in stmts:
+    t0 = time.perf_counter()
+    try:
+        exec(s, {{}})
+    except ImportError as e:
+        out["missing"].append(getattr(e, "name", None) or s)
+        continue
+    out["imports"].append((s, (time.perf_counter() - t0) * 1e3))
+out["import_ms"] = (time.perf_counter() - t_all) * 1e3
+out["loaded_before_render"] = [m for m in {heavy!r} if m in sys.modules]
+if render:
+    from drawing import render_section
+    t0 = time.perf_counter()
+    render_section("cad", "png", dpi=200, B_deck=13.5, B_box_mm=11500.0, H_mm=2000.0, t_top=18.0,
+                   t_bot=16.0, t_web=14.0, Nc=4, out_top=145.0, out_bot=60.0, e_web=60.0)
+    out["first_render_ms"] = (time.perf_counter() - t0) * 1e3
+print(json.dumps(out))
+"""
+
+
+# =============== 1. 顶层 import 提取 ===============
+def top_level_imports(path):
+    """源码中模块顶层（不含函数体内）的 import 语句，按出现顺序"""
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    return [ast.unparse(node) for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))]
+
+
+# =============== 2. 子进程测量 ===============
+def probe(stmts, render):
+    code = _PROBE.format(root=ROOT, stmts=stmts, render=render, heavy=HEAVY)
+    # 关闭持久结果库（project_store），首次出图按冷缓存计时
+    r = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, cwd=ROOT, check=True,
+                       env={**os.environ, "BOXGIRDER_STORE": ""})
+    return json.loads(r.stdout.strip().splitlines()[-1])
+
+
+def bench_app(app, runs):
+    stmts = top_level_imports(os.path.join(ROOT, app))
+    render = any("drawing" in s for s in stmts)
+    samples = [probe(stmts, render) for _ in range(runs)]
+    res = {
+        "import_ms": statistics.median(s["import_ms"] for s in samples),
+        "missing": samples[0]["missing"],
+        "loaded_before_render": samples[0]["loaded_before_render"],
+        "per_import_ms": {s: statistics.median(smp["imports"][i][1] for smp in samples)
+                          for i, (s, _) in enumerate(samples[0]["imports"])},
+    }
+    if render:
+        res["first_render_ms"] = statistics.median(s["first_render_ms"] for s in samples)
+    return res
+
+
+def importtime(stmts, top):
+    """python -X importtime：按模块自身耗时排序的前 top 项 (self_us, cumulative_us, 模块名)"""
+    code = f"import sys; sys.path.insert(0, {ROOT!r})\n"
+    for s in stmts:
+        code += f"try:\n    {s}\nexcept ImportError:\n    pass\n"
+    r = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                       capture_output=True, text=True, cwd=ROOT, check=True)
+    rows = []
+    for line in r.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cum_us, name = (p.strip() for p in line[len("import time:"):].split("|"))
+        rows.append((int(self_us), int(cum_us), name))
+    return sorted(rows, reverse=True)[:top]
+
+
+# =============== 3. 命令行 ===============
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Streamlit 应用冷启动耗时")
+    p.add_argument("apps", nargs="*", default=list(APPS), help="应用脚本（缺省为全部）")
+    p.add_argument("-n", "--runs", type=int, default=5, help="每个应用的全新进程次数（取中位数）")
+    p.add_argument("--importtime", type=int, default=0, metavar="TOP",
+                   help="另用 -X importtime 列出自身耗时最大的 TOP 个模块")
+    p.add_argument("--json", help="把结果保存为 JSON")
+    args = p.parse_args(argv)
+
+    results = {}
+    for app in args.apps:
+        r = results[app] = bench_app(app, args.runs)
+        print(f"== {app}: 顶层 import {r['import_ms']:.1f} ms"
+              + (f"，首次出图 {r['first_render_ms']:.1f} ms" if "first_render_ms" in r else ""))
+        print(f"   已加载: {', '.join(r['loaded_before_render']) or '-'}"
+              + (f"   缺失(未计时): {', '.join(r['missing'])}" if r["missing"] else ""))
+        for s, ms in r["per_import_ms"].items():
+            print(f"   {ms:>8.1f} ms  {s}")
+        if args.importtime:
+            for self_us, cum_us, name in importtime(top_level_imports(os.path.join(ROOT, app)), args.importtime):
+                print(f"   self {self_us / 1e3:>7.1f} ms  cum {cum_us / 1e3:>7.1f} ms  {name}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,332 @@
+# -*- coding: utf-8 -*-
+"""
+性能基准套件：截面计算、优化器、规则法取厚、绘图与导出热点
+
+每个用例报告 ops/s、p50/p99 单次耗时（微秒级用例按批计时）、峰值内存（tracemalloc，单独一轮测量，不计入计时），
+可保存为 JSON 基线并与已有基线对比（超出阈值返回非零退出码，便于上线前把关）。
+
+运行：
+    python benchmarks/run_benchmarks.py                          # 全部用例
+    python benchmarks/run_benchmarks.py -k batch -k optimize     # 按名称子串筛选
+    python benchmarks/run_benchmarks.py --save benchmarks/baseline.json
+    python benchmarks/run_benchmarks.py --compare benchmarks/baseline.json --threshold 1.2
+"""
+import argparse
+import gc
+import io
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+
+from box_section import (BoxGirderSection, SectionArray, SectionMoments, SectionRecord, batch_check,  # noqa: E402
+                         envelope_check, grid_optimize, size_by_rules)
+
+# 典型截面与荷载（app01 默认值）
+SECTION = dict(B_box_mm=9500.0, H_mm=2000.0, t_top=20.0, t_bot=18.0, t_web=14.0, Nc=3, fy=345.0, gamma0=1.1)
+LOADS = (15400.0, 32200.0, 5360.0)
+# 优化器荷载工况：由轻到重
+LOAD_CASES = [(15400.0, 32200.0, 5360.0), (30000.0, 50000.0, 9000.0),
+              (60000.0, 90000.0, 15000.0), (80000.0, 120000.0, 20000.0)]
+GEOM = dict(B_deck=13.5, B_box_mm=11500.0, H_mm=2000.0, t_top=18.0, t_bot=16.0, t_web=14.0, Nc=4,
+            out_top=145.0, out_bot=60.0, e_web=60.0, dim_gap=120)
+
+
+# =============== 1. 用例 ===============
+# 每个用例返回 (fn, 每次调用处理的截面/条目数)
+
+def case_scalar_check():
+    s = BoxGirderSection(**SECTION)
+    return (lambda: s.check_capacity(*LOADS)), 1
+
+
+def case_scalar_construct_check():
+    return (lambda: BoxGirderSection(**SECTION).check_capacity(*LOADS)), 1
+
+
+def case_record_construct_check():
+    return (lambda: SectionRecord(**SECTION).check_capacity(*LOADS)), 1
+
+
+def _random_sections(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return (rng.uniform(6000, 12000, n), rng.uniform(1200, 3500, n),
+            rng.integers(16, 60, n).astype(float), rng.integers(14, 60, n).astype(float),
+            rng.integers(12, 40, n).astype(float), rng.integers(1, 5, n).astype(float))
+
+
+def case_batch_check_10k():
+    B, H, tt, tb, tw, nc = _random_sections(10_000)
+    return (lambda: batch_check(B, H, tt, tb, tw, nc, 345.0, 1.1, *LOADS)), 10_000
+
+
+def case_batch_check_1m():
+    B, H, tt, tb, tw, nc = _random_sections(1_000_000)
+    return (lambda: batch_check(B, H, tt, tb, tw, nc, 345.0, 1.1, *LOADS)), 1_000_000
+
+
+def case_section_array_check_10k():
+    B, H, tt, tb, tw, nc = _random_sections(10_000)
+    sa = SectionArray.from_inputs(B, H, tt, tb, tw, nc, 345.0, 1.1)
+    return (lambda: sa.check_capacity(*LOADS)), 10_000
+
+
+def case_geometry_check_40_ribs():
+    from section_geometry import U_RIB_BOTTOM, U_RIB_DECK, box_geometry
+    geo = box_geometry(11500.0, 2000.0, 18.0, 16.0, 14.0, 4, 145.0, 60.0, 60.0,
+                       (450.0,) + U_RIB_DECK[1:], U_RIB_BOTTOM)
+    return (lambda: geo.check(345.0, 1.1, *LOADS)), 1
+
+
+def case_envelope_500_cases_10k():
+    B, H, tt, tb, tw, nc = _random_sections(10_000)
+    loads = np.random.default_rng(1).uniform((0, 0, 0), (60000, 90000, 20000), (500, 3))
+    return (lambda: envelope_check(B, H, tt, tb, tw, nc, 345.0, 1.1, loads)), 10_000
+
+
+def case_probe_t_web_10k():
+    B, H, tt, tb, tw, nc = _random_sections(10_000)
+    m = SectionMoments(B, H, tt, tb, tw, nc)
+    return (lambda: m.check_capacity(345.0, 1.1, *LOADS, t_web=tw + 2)), 10_000
+
+
+def case_neighbours_10k():
+    B, H, tt, tb, tw, nc = _random_sections(10_000)
+    m = SectionMoments(B, H, tt, tb, tw, nc)
+    return (lambda: m.neighbours(345.0, 1.1, *LOADS)), 10_000
+
+
+def _cycle(seq):
+    while True:
+        yield from seq
+
+
+def case_grid_optimize():
+    cases = _cycle(LOAD_CASES)
+    return (lambda: grid_optimize(9500.0, 2000.0, *next(cases), 345.0, 1.1, Nc_values=(3,))), 1
+
+
+def case_grid_optimize_all_nc():
+    cases = _cycle(LOAD_CASES)
+    return (lambda: grid_optimize(9500.0, 2000.0, *next(cases), 345.0, 1.1)), 1
+
+
+def case_gradient_optimize():
+    from sensitivity import gradient_optimize
+    cases = _cycle(LOAD_CASES)
+    return (lambda: gradient_optimize(9500.0, 2000.0, *next(cases), 345.0, 1.1, 3)), 1
+
+
+def case_section_sensitivity_10k():
+    from sensitivity import section_sensitivity
+    B, H, tt, tb, tw, nc = _random_sections(10_000)
+    return (lambda: section_sensitivity(B, H, tt, tb, tw, nc, 345.0, 1.1, *LOADS)), 10_000
+
+
+def case_grid_optimize_all_nc_stability():
+    from stability import StabilityRules
+    cases = _cycle(LOAD_CASES)
+    rules = StabilityRules(e_web=60.0)
+    return (lambda: grid_optimize(9500.0, 2000.0, *next(cases), 345.0, 1.1, stability=rules)), 1
+
+
+def case_optimize_stepwise():
+    cases = _cycle(LOAD_CASES)
+
+    def run():
+        s = BoxGirderSection(9500.0, 2000.0, 16, 14, 12, 3, 345.0, 1.1)
+        return s.optimize_stepwise(*next(cases))
+    return run, 1
+
+
+def case_optimize_stepwise_traced():
+    from optrace import OptimizerTrace
+    cases = _cycle(LOAD_CASES)
+    trace = OptimizerTrace(1 << 12)
+
+    def run():
+        s = BoxGirderSection(9500.0, 2000.0, 16, 14, 12, 3, 345.0, 1.1)
+        return s.optimize_stepwise(*next(cases), trace=trace)
+    return run, 1
+
+
+def case_catalog_grid_optimize():
+    from catalog import CatalogTables, PlateCatalog
+    tables = CatalogTables(PlateCatalog.from_grade("Q345qD"), np.arange(7000.0, 12001.0, 1000.0),
+                           np.arange(1500.0, 3001.0, 250.0))
+    cases = _cycle(LOAD_CASES)
+    return (lambda: tables.optimize(*next(cases), 345.0, 1.1, t_max=60)), 6 * 7 * 4
+
+
+def case_girder_2k_stations():
+    from girder import size_girder
+    x = np.linspace(0.0, 130.0, 2001)
+    M_pos = 1.2e5 * np.abs(np.sin(x / 130.0 * 3 * np.pi))
+    M_neg = 2.0e5 * np.abs(np.cos(x / 130.0 * 3 * np.pi)) ** 4
+    V = np.full_like(x, 15000.0)
+    return (lambda: size_girder(x, M_pos, M_neg, V, 6000.0, 2500.0, 2)), 2001
+
+
+def case_rules_thickness():
+    return (lambda: size_by_rules(15400.0, 32200.0, 5360.0, 11.5, 2.0, 345.0, 1.1, 0.35, 4,
+                                  2.0, 16.0, 14.0, 12.0, 2)), 1
+
+
+def _render(draw, **extra):
+    def run():
+        fig = draw(**GEOM, **extra)
+        fig.savefig(io.BytesIO(), format="png", bbox_inches="tight", dpi=200)
+    return run
+
+
+def case_draw_cad_png():
+    from drawing import draw_section_cad
+    return _render(draw_section_cad), 1
+
+
+def case_draw_3d_png():
+    from drawing import draw_section_3d
+    return _render(draw_section_3d, L_seg_mm=1500), 1
+
+
+def case_reliability_262k():
+    from reliability import default_variables, run_reliability
+    variables = default_variables(t_corr=2.0)
+    seeds = iter(range(1 << 30))
+    return (lambda: run_reliability(**{k: SECTION[k] for k in ("B_box_mm", "H_mm", "t_top", "t_bot", "t_web", "Nc")},
+                                    M_pos=LOADS[0], M_neg=LOADS[1], V=LOADS[2], variables=variables,
+                                    n_samples=1 << 18, seed=next(seeds))), 1 << 18
+
+
+def case_report_page():
+    from report import UR_KEYS, PageTemplate, page_data
+    rows = [dict(B_box=GEOM["B_box_mm"] / 1000, H=GEOM["H_mm"] / 1000, B_deck=GEOM["B_deck"],
+                 Nc=GEOM["Nc"], t_top=GEOM["t_top"], t_bot=GEOM["t_bot"], t_web=GEOM["t_web"],
+                 M_pos=M, M_neg=N, V=V) for M, N, V in LOAD_CASES]
+    pages = _cycle(page_data(rows))
+    tpl = PageTemplate(110, UR_KEYS)
+    return (lambda: tpl.render(next(pages))), 1
+
+
+def case_export_svg():
+    from cad_export import export_section
+    return (lambda: export_section("svg", **GEOM)), 1
+
+
+def case_export_dxf():
+    from cad_export import export_section
+    return (lambda: export_section("dxf", **GEOM)), 1
+
+
+CASES = {name[5:]: fn for name, fn in sorted(globals().items()) if name.startswith("case_")}
+
+
+# =============== 2. 计时与内存 ===============
+def measure(fn, min_time=1.0, min_runs=5, max_runs=20_000, warmup=2, min_sample=1e-3):
+    """
+    多次调用 fn：返回单次耗时列表 (s) 与单次调用峰值内存 (bytes)。
+    极快的函数按批计时（每个样本 ≥ min_sample 秒，再除以批内次数），降低计时器噪声。
+    """
+    for _ in range(warmup):
+        fn()
+    inner = 1
+    while True:
+        t0 = time.perf_counter()
+        for _ in range(inner):
+            fn()
+        if time.perf_counter() - t0 >= min_sample or inner >= 1 << 16:
+            break
+        inner *= 2
+
+    gc.collect()
+    times = []
+    t_end = time.perf_counter() + min_time
+    while len(times) < max_runs and (len(times) < min_runs or time.perf_counter() < t_end):
+        t0 = time.perf_counter()
+        for _ in range(inner):
+            fn()
+        times.append((time.perf_counter() - t0) / inner)
+
+    gc.collect()
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return times, peak
+
+
+def run_case(name, min_time):
+    fn, items = CASES[name]()
+    times, peak = measure(fn, min_time=min_time)
+    t = np.asarray(times)
+    return {
+        "runs": int(t.size),
+        "ops_per_sec": float(t.size / t.sum()),
+        "items_per_sec": float(items * t.size / t.sum()),
+        "p50_ms": float(np.percentile(t, 50) * 1e3),
+        "p99_ms": float(np.percentile(t, 99) * 1e3),
+        "peak_mem_kb": peak / 1024,
+    }
+
+
+def environment():
+    import matplotlib
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "matplotlib": matplotlib.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+# =============== 3. 命令行 ===============
+def main(argv=None):
+    p = argparse.ArgumentParser(description="钢箱梁截面工具性能基准")
+    p.add_argument("-k", action="append", default=[], help="只运行名称含该子串的用例（可重复）")
+    p.add_argument("--min-time", type=float, default=1.0, help="每个用例最少计时秒数")
+    p.add_argument("--save", help="把结果保存为 JSON 基线")
+    p.add_argument("--compare", help="与 JSON 基线对比")
+    p.add_argument("--threshold", type=float, default=1.2,
+                   help="p50 相对基线超过该倍数即判为退化（配合 --compare）")
+    args = p.parse_args(argv)
+
+    names = [n for n in CASES if not args.k or any(k in n for k in args.k)]
+    base = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            base = json.load(f)["results"]
+
+    results, regressions = {}, []
+    print(f"{'用例':<24} {'ops/s':>12} {'items/s':>14} {'p50 ms':>10} {'p99 ms':>10} {'峰值KB':>10}"
+          + ("  对比基线 p50" if base else ""))
+    for name in names:
+        r = results[name] = run_case(name, args.min_time)
+        line = (f"{name:<24} {r['ops_per_sec']:>12,.1f} {r['items_per_sec']:>14,.0f} "
+                f"{r['p50_ms']:>10.3f} {r['p99_ms']:>10.3f} {r['peak_mem_kb']:>10.1f}")
+        if base and name in base:
+            ratio = r["p50_ms"] / base[name]["p50_ms"]
+            flag = "  ⚠️ 退化" if ratio > args.threshold else ""
+            if flag:
+                regressions.append(name)
+            line += f"  {ratio:>6.2f}x{flag}"
+        print(line)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump({"environment": environment(), "results": results}, f, ensure_ascii=False, indent=2)
+        print(f"已保存基线: {args.save}")
+    if regressions:
+        print(f"退化用例: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
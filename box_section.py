@@ -0,0 +1,913 @@
+# -*- coding: utf-8 -*-
+"""钢箱梁截面计算核心（不依赖 streamlit / matplotlib，可在脚本与批处理中直接导入）"""
+import numpy as np
+
+from optrace import (ADD_BOT, ADD_TOP, ADD_WEB, CANDIDATE, CONVERGED, CUT_BOT, CUT_TOP, CUT_WEB, FLOOR, INFEASIBLE,
+                     PRUNE, StepLog)
+
+# =============== 1. 核心计算类 (逻辑层 - 含迭代优化) ===============
+def section_properties(B, H, t_top, t_bot, t_web, Nc):
+    """
+    单个截面的几何属性（标量版，BoxGirderSection / SectionRecord 共用）
+    返回 (Area, y_c, Ixx, W_top, W_bot)
+    """
+    # 1. 顶板 (简化计算)
+    A_top = B * t_top
+    y_top = H - t_top / 2
+
+    # 2. 底板
+    A_bot = B * t_bot
+    y_bot = t_bot / 2
+
+    # 3. 腹板
+    n_webs = Nc + 1
+    h_web_net = H - t_top - t_bot
+    # 防止厚度过大导致几何错误
+    if h_web_net < 0: h_web_net = 0
+
+    A_webs = n_webs * t_web * h_web_net
+    y_webs = t_bot + h_web_net / 2
+
+    # 总面积 & 形心
+    Area = A_top + A_bot + A_webs
+    if Area <= 0: Area = 1.0 # 避免除零
+
+    y_c = (A_top * y_top + A_bot * y_bot + A_webs * y_webs) / Area
+
+    # 惯性矩
+    # 幂次写成连乘，保证与 batch_properties 的向量化结果逐位一致
+    d_top = y_top - y_c
+    d_bot = y_bot - y_c
+    d_webs = y_webs - y_c
+    I_top = (B * (t_top * t_top * t_top))/12 + A_top * (d_top * d_top)
+    I_bot = (B * (t_bot * t_bot * t_bot))/12 + A_bot * (d_bot * d_bot)
+    I_webs = n_webs * ((t_web * (h_web_net * h_web_net * h_web_net))/12 + (t_web * h_web_net) * (d_webs * d_webs))
+
+    Ixx = I_top + I_bot + I_webs
+
+    # 抗弯模量 (上下缘)
+    W_top = Ixx / (H - y_c) if (H - y_c) > 0 else 1e9
+    W_bot = Ixx / y_c if y_c > 0 else 1e9
+    return Area, y_c, Ixx, W_top, W_bot
+
+
+def capacity_ur(H, t_web, Nc, fy, gamma0, W_top, W_bot, M_pos_kN, M_neg_kN, V_kN):
+    """由抗弯模量求利用率（标量版）；返回 dict：ur_top, ur_bot, ur_shear, ur_max"""
+    fd = fy / gamma0
+    tau_allow = 0.58 * fy
+
+    # 应力计算 (MPa)
+    # 正弯矩工况 (上压下拉)
+    sig_top_pos = (M_pos_kN * 1e6) / W_top
+    sig_bot_pos = (M_pos_kN * 1e6) / W_bot
+
+    # 负弯矩工况 (上拉下压)
+    sig_top_neg = (M_neg_kN * 1e6) / W_top
+    sig_bot_neg = (M_neg_kN * 1e6) / W_bot
+
+    # 剪应力
+    h_w = 0.9 * H
+    tau = (V_kN * 1e3) / ((Nc + 1) * t_web * h_w)
+
+    # 提取最大控制应力
+    # 顶板控制应力 (由正弯矩压应力 或 负弯矩拉应力控制)
+    sig_top_max = max(sig_top_pos, sig_top_neg)
+    # 底板控制应力
+    sig_bot_max = max(sig_bot_pos, sig_bot_neg)
+
+    return {
+        "ur_top": sig_top_max / fd,
+        "ur_bot": sig_bot_max / fd,
+        "ur_shear": tau / tau_allow,
+        "ur_max": max(sig_top_max/fd, sig_bot_max/fd, tau/tau_allow)
+    }
+
+
+# optimize_stepwise 各动作改动的板件
+_MOVE_PLATE = {ADD_TOP: "t_top", CUT_TOP: "t_top", ADD_BOT: "t_bot", CUT_BOT: "t_bot",
+               ADD_WEB: "t_web", CUT_WEB: "t_web"}
+
+
+class BoxGirderSection:
+    def __init__(self, B_box_mm, H_mm, t_top, t_bot, t_web, Nc, fy, gamma0, 
+                 t_top_min=16, t_bot_min=14, t_web_min=12):
+        self.B = B_box_mm
+        self.H = H_mm
+        # 初始赋值
+        self.t_top = t_top
+        self.t_bot = t_bot
+        self.t_web = t_web
+        
+        # 构造约束
+        self.t_top_min = t_top_min
+        self.t_bot_min = t_bot_min
+        self.t_web_min = t_web_min
+        
+        self.Nc = Nc
+        self.n_webs = Nc + 1
+        self.fy = fy
+        self.gamma0 = gamma0
+        self.fd = fy / gamma0
+        self.tau_allow = 0.58 * fy
+        
+        # 状态记录
+        self.log = [] 
+        
+        # 初始化计算
+        self._calc_properties()
+
+    def _calc_properties(self):
+        """按当前输入生成截面记录 self.record（SectionRecord），几何属性取自记录"""
+        r = self.record = SectionRecord(self.B, self.H, self.t_top, self.t_bot, self.t_web, self.Nc,
+                                        self.fy, self.gamma0)
+        self.Area, self.y_c, self.Ixx, self.W_top, self.W_bot = r.Area, r.y_c, r.Ixx, r.W_top, r.W_bot
+
+    def check_capacity(self, M_pos_kN, M_neg_kN, V_kN):
+        """校核当前厚度下的应力（厚度可能已被就地修改，先刷新记录）"""
+        self._calc_properties()
+        return self.record.check_capacity(M_pos_kN, M_neg_kN, V_kN)
+
+    def check_envelope(self, loads):
+        """多荷载组合包络校核：loads 为 (n_cases, 3) 组合表，返回利用率 + case / case_flex / case_shear"""
+        env = load_envelope(loads)
+        res = self.check_capacity(env["M"], env["M"], env["V"])
+        res.update(case=int(governing_case(res, env)), case_flex=env["case_M"], case_shear=env["case_V"])
+        return res
+
+    def to_record(self):
+        """当前状态的不可变快照（SectionRecord，不含日志与构造下限）"""
+        self._calc_properties()
+        return self.record
+
+    def optimize(self, M_pos, M_neg, V, t_max=80, step=2, progress=None, catalog=None, stability=None):
+        """
+        自动优化函数
+        策略：在离散厚度格点 (t_top, t_bot, t_web) 上做全局最小面积搜索（见 grid_optimize），
+        箱室数 Nc 保持当前值。成功时就地更新厚度。progress、stability 原样传给 grid_optimize。
+        catalog（catalog.PlateCatalog）给出时厚度只取目录档位，不再按 step 等差（走 catalog.catalog_optimize 的预计算构件表）。
+        """
+        if catalog is not None:
+            from catalog import catalog_optimize
+            res = catalog_optimize(catalog, self.B, self.H, M_pos, M_neg, V, self.fy, self.gamma0,
+                                   self.t_top_min, self.t_bot_min, self.t_web_min, t_max=t_max,
+                                   Nc_values=(self.Nc,), stability=stability, progress=progress)
+        else:
+            res = grid_optimize(self.B, self.H, M_pos, M_neg, V, self.fy, self.gamma0,
+                                self.t_top_min, self.t_bot_min, self.t_web_min,
+                                t_max=t_max, step=step, Nc_values=(self.Nc,), progress=progress,
+                                stability=stability)
+        self.log = [
+            f"格点总数 {res['n_total']}，单调界剪枝 {res['n_pruned']}，实际校核 {res['n_evaluated']} 次。"
+        ]
+        if res["success"]:
+            self.t_top, self.t_bot, self.t_web = res["t_top"], res["t_bot"], res["t_web"]
+            self._calc_properties()
+            self.log.append(
+                f"✅ 最小面积截面 t=({self.t_top:g}, {self.t_bot:g}, {self.t_web:g}) -> "
+                f"A={res['Area']/100:.1f} cm², UR_max={res['ur_max']:.3f}")
+        else:
+            self.log.append(f"❌ 厚度上限 {t_max} mm 内无满足 UR_max ≤ 1 的截面，请加大梁高或上限。")
+        return res["success"], self.log
+
+    def optimize_gradient(self, M_pos, M_neg, V, t_max=80, step=2, catalog=None, stability=None):
+        """
+        梯度引导优化（见 sensitivity.gradient_optimize）：连续最小面积解 + 取整，只需十余次截面校核，
+        结果通常与 optimize 相同（不保证全局最优）。Nc 保持当前值，成功时就地更新厚度。
+        """
+        from sensitivity import gradient_optimize
+
+        res = gradient_optimize(self.B, self.H, M_pos, M_neg, V, self.fy, self.gamma0, self.Nc,
+                                self.t_top_min, self.t_bot_min, self.t_web_min,
+                                t_max=t_max, step=step, catalog=catalog, stability=stability)
+        tt, tb, tw = res["t_continuous"]
+        self.log = [
+            f"连续解 t=({tt:.1f}, {tb:.1f}, {tw:.1f})，牛顿迭代 {res['n_newton']} 次，"
+            f"共校核 {res['n_evaluated']} 个截面。"
+        ]
+        if res["success"]:
+            self.t_top, self.t_bot, self.t_web = res["t_top"], res["t_bot"], res["t_web"]
+            self._calc_properties()
+            self.log.append(
+                f"✅ 取整后截面 t=({self.t_top:g}, {self.t_bot:g}, {self.t_web:g}) -> "
+                f"A={res['Area']/100:.1f} cm², UR_max={res['ur_max']:.3f}")
+        else:
+            self.log.append(f"❌ 厚度上限 {t_max} mm 内无满足 UR_max ≤ 1 的截面，请加大梁高或上限。")
+        return res["success"], self.log
+
+    def optimize_stepwise(self, M_pos, M_neg, V, max_iter=20, trace=None):
+        """
+        步进迭代优化函数（旧版，保留用于对比）
+        策略：贪心算法 + 步进逼近
+        日志为 optrace.StepLog（每步只记事件，显示时才格式化）；
+        trace 为可选的 optrace.OptimizerTrace，逐步写入结构化事件（含耗时）。
+        """
+        self.log = StepLog() # 清空日志
+        events = self.log.events
+        success = False
+        if trace is not None:
+            run, t0 = trace.begin()
+        # 每步只改一块板：增量属性引擎只重算该板（及受影响的腹板）构件
+        moments = SectionMoments(self.B, self.H, self.t_top, self.t_bot, self.t_web, self.Nc)
+        
+        for i in range(1, max_iter + 1):
+            res = moments.check_capacity(self.fy, self.gamma0, M_pos, M_neg, V)
+            ur_max = res['ur_max']
+            ur_top = res['ur_top']
+            ur_bot = res['ur_bot']
+            ur_shear = res['ur_shear']
+            
+            # 记录当前状态（动作确定后追加事件）
+            t_top, t_bot, t_web = self.t_top, self.t_bot, self.t_web
+            
+            # 策略调整
+            step = 2.0 # mm
+            
+            # 终止条件：利用率在 0.90 ~ 1.00 之间，且没有剪切超限
+            if 0.90 <= ur_max <= 1.00:
+                move = CONVERGED
+            
+            # 情况1：不安全 (UR > 1.0) -> 加厚
+            elif ur_max > 1.0:
+                # 哪个不够加哪个
+                if ur_shear > 1.0:
+                    self.t_web += step; move = ADD_WEB
+                elif ur_top > 1.0 and ur_top >= ur_bot:
+                    self.t_top += step; move = ADD_TOP
+                elif ur_bot > 1.0 and ur_bot > ur_top:
+                    self.t_bot += step; move = ADD_BOT
+                else:
+                    # 如果都差不多，优先加最薄的，或者加远离形心的
+                    if self.t_top < self.t_bot: self.t_top += step; move = ADD_TOP
+                    else: self.t_bot += step; move = ADD_BOT
+            
+            # 情况2：太安全 (UR < 0.90) -> 减薄
+            else:
+                # 尝试减薄利用率最低的部分，但不能低于构造要求
+                
+                # 剪切裕量很大，且厚度大于最小值
+                if ur_shear < 0.6 and self.t_web > self.t_web_min:
+                    self.t_web -= step; move = CUT_WEB
+                
+                # 弯曲裕量大
+                elif ur_top < 0.8 and self.t_top > self.t_top_min:
+                    self.t_top -= step; move = CUT_TOP
+                elif ur_bot < 0.8 and self.t_bot > self.t_bot_min:
+                    self.t_bot -= step; move = CUT_BOT
+                else:
+                    # 无法再减薄（已触底构造要求）
+                    move = FLOOR
+            
+            plate = _MOVE_PLATE.get(move)
+            if plate is not None:
+                moments.set(**{plate: getattr(self, plate)})
+            events.append((i, t_top, t_bot, t_web, ur_top, ur_bot, ur_shear, ur_max, move))
+            if trace is not None:
+                trace.record(run, t0, i, t_top, t_bot, t_web, ur_top, ur_bot, ur_shear, ur_max, move, self.Nc)
+            # 收敛（0.9-1.0）或触底构造要求：结束
+            if move >= CONVERGED:
+                success = True
+                break
+            
+        self._calc_properties()
+        return success, self.log
+
+
+# =============== 2. 批量（向量化）计算 ===============
+def _as_arrays(*args):
+    """统一转为 float64 数组并广播到同一形状"""
+    return np.broadcast_arrays(*[np.asarray(a, dtype=float) for a in args])
+
+
+def batch_properties(B, H, t_top, t_bot, t_web, Nc):
+    """
+    批量计算截面几何属性（与 BoxGirderSection._calc_properties 逐项一致）
+    参数均可为标量或数组（mm），按 numpy 规则广播。
+    返回 dict：Area, y_c, Ixx, W_top, W_bot（均为数组）
+    """
+    B, H, t_top, t_bot, t_web, Nc = _as_arrays(B, H, t_top, t_bot, t_web, Nc)
+    n_webs = Nc + 1
+
+    # 1. 顶板
+    A_top = B * t_top
+    y_top = H - t_top / 2
+    # 2. 底板
+    A_bot = B * t_bot
+    y_bot = t_bot / 2
+    # 3. 腹板
+    h_web_net = np.maximum(H - t_top - t_bot, 0.0)
+    A_webs = n_webs * t_web * h_web_net
+    y_webs = t_bot + h_web_net / 2
+
+    # 总面积 & 形心
+    Area = A_top + A_bot + A_webs
+    Area = np.where(Area <= 0, 1.0, Area)
+    y_c = (A_top * y_top + A_bot * y_bot + A_webs * y_webs) / Area
+
+    # 惯性矩
+    d_top = y_top - y_c
+    d_bot = y_bot - y_c
+    d_webs = y_webs - y_c
+    I_top = (B * (t_top * t_top * t_top)) / 12 + A_top * (d_top * d_top)
+    I_bot = (B * (t_bot * t_bot * t_bot)) / 12 + A_bot * (d_bot * d_bot)
+    I_webs = n_webs * ((t_web * (h_web_net * h_web_net * h_web_net)) / 12 + (t_web * h_web_net) * (d_webs * d_webs))
+    Ixx = I_top + I_bot + I_webs
+
+    # 抗弯模量 (上下缘)，几何退化时取 1e9 与标量版一致
+    c_top = H - y_c
+    with np.errstate(divide="ignore", invalid="ignore"):
+        W_top = np.where(c_top > 0, Ixx / c_top, 1e9)
+        W_bot = np.where(y_c > 0, Ixx / y_c, 1e9)
+
+    return {"Area": Area, "y_c": y_c, "Ixx": Ixx, "W_top": W_top, "W_bot": W_bot}
+
+
+def batch_ur(H, t_web, Nc, fy, gamma0, W_top, W_bot, M_pos_kN, M_neg_kN, V_kN):
+    """由抗弯模量批量求利用率（与 capacity_ur 逐项一致）；返回 dict：ur_top, ur_bot, ur_shear, ur_max"""
+    fd = fy / gamma0
+    tau_allow = 0.58 * fy
+
+    # 正/负弯矩工况应力 (MPa)
+    sig_top_max = np.maximum((M_pos_kN * 1e6) / W_top, (M_neg_kN * 1e6) / W_top)
+    sig_bot_max = np.maximum((M_pos_kN * 1e6) / W_bot, (M_neg_kN * 1e6) / W_bot)
+
+    # 剪应力
+    h_w = 0.9 * H
+    tau = (V_kN * 1e3) / ((Nc + 1) * t_web * h_w)
+
+    ur_top = sig_top_max / fd
+    ur_bot = sig_bot_max / fd
+    ur_shear = tau / tau_allow
+    return {
+        "ur_top": ur_top,
+        "ur_bot": ur_bot,
+        "ur_shear": ur_shear,
+        "ur_max": np.maximum(np.maximum(ur_top, ur_bot), ur_shear),
+    }
+
+
+def batch_check(B, H, t_top, t_bot, t_web, Nc, fy, gamma0, M_pos_kN, M_neg_kN, V_kN):
+    """
+    批量校核（与 BoxGirderSection.check_capacity 逐项一致）
+    返回 dict：截面属性 + ur_top, ur_bot, ur_shear, ur_max
+    """
+    B, H, t_top, t_bot, t_web, Nc, fy, gamma0, M_pos_kN, M_neg_kN, V_kN = _as_arrays(
+        B, H, t_top, t_bot, t_web, Nc, fy, gamma0, M_pos_kN, M_neg_kN, V_kN)
+    props = batch_properties(B, H, t_top, t_bot, t_web, Nc)
+    props.update(batch_ur(H, t_web, Nc, fy, gamma0, props["W_top"], props["W_bot"],
+                          M_pos_kN, M_neg_kN, V_kN))
+    return props
+
+
+# =============== 3. 全局搜索优化 ===============
+# 各板的控制利用率：强度项与（stability 并入的）局部稳定项，均只随本板加厚单调减小
+_PLATE_TERMS = {"top": ("ur_top", "ur_bt_top"), "bot": ("ur_bot", "ur_bt_bot"), "web": ("ur_shear", "ur_buckle")}
+
+
+def _plate_ur(res, plate):
+    strength, stab = _PLATE_TERMS[plate]
+    return res[strength] if stab not in res else np.maximum(res[strength], res[stab])
+
+
+def _first_ok_index(ok_fn, n_axis, n_cols):
+    """
+    向量化二分：对每一列求满足 ok 的最小轴向下标（无则为 n_axis）。
+    要求 ok 沿轴单调（一旦满足，更厚也满足）。返回 (下标数组, 校核次数)。
+    """
+    lo = np.zeros(n_cols, dtype=np.int64)
+    hi = np.full(n_cols, n_axis, dtype=np.int64)
+    n_eval = 0
+    while True:
+        active = np.nonzero(lo < hi)[0]
+        if active.size == 0:
+            return lo, n_eval
+        mid = (lo[active] + hi[active]) // 2
+        ok = ok_fn(active, mid)
+        n_eval += active.size
+        hi[active[ok]] = mid[ok]
+        lo[active[~ok]] = mid[~ok] + 1
+
+
+def grid_optimize(B_box_mm, H_mm, M_pos, M_neg, V, fy, gamma0,
+                  t_top_min=16, t_bot_min=14, t_web_min=12,
+                  t_max=80, step=2, Nc_values=(1, 2, 3, 4), chunk=4096, progress=None,
+                  t_top_values=None, t_bot_values=None, t_web_values=None, stability=None, trace=None):
+    """
+    离散格点全局优化：在 (t_top, t_bot, t_web, Nc) 格点上求 UR_max ≤ 1 的最小钢材面积截面。
+
+    剪枝只使用成立的单调界：
+      - ur_shear 只与 t_web、Nc 有关且随 t_web 单调减 -> 每个 Nc 一个 t_web 下限；
+      - ur_top 随 t_top 单调减、ur_bot 随 t_bot 单调减（其余厚度固定时）
+        -> 向量化二分求各列厚度下限；
+      注意加厚底板会使形心下移、顶缘应力增大，故“任一板加厚都更安全”并不成立，不据此剪枝。
+    剩余候选按面积升序分块校核，首个可行解即全局最小面积，其后的候选由面积界剪去。
+
+    厚度轴缺省为 [t_min, t_max] 内按 step 的等差数列；*_values 给出时直接采用（升序，如钢板目录档位，
+    见 catalog.PlateCatalog.values），二分即沿目录下标进行。
+    progress(done, total) 为可选回调，剪枝完成后及每校核完一块调用一次（total 为剪枝后的候选数）。
+    stability（stability.StabilityRules）给出时，宽厚比 / 腹板剪切屈曲项在每次校核中一并算出并计入可行性，
+    各项分别并入对应板的单调界（剪切屈曲随翼缘加厚而减小，故 t_web 下限取最厚翼缘处校核）。
+    trace（optrace.OptimizerTrace）给出时记录各 Nc 的剪枝下限（prune，无下限的板为 nan）、
+    每块校核中各 Nc 面积最小的候选（candidate，iter 为块序号）及结果（converged / infeasible）。
+
+    返回 dict：success, t_top, t_bot, t_web, Nc, Area, ur_*, n_total, n_evaluated, n_pruned
+    """
+    tt, tb, tw = (np.arange(t_min, t_max + step / 2, step, dtype=float) if values is None
+                  else np.asarray(values, dtype=float)
+                  for t_min, values in ((t_top_min, t_top_values), (t_bot_min, t_bot_values),
+                                        (t_web_min, t_web_values)))
+    nc = np.asarray(Nc_values, dtype=float)
+    n_tt, n_tb, n_tw, n_nc = tt.size, tb.size, tw.size, nc.size
+    n_total = n_tt * n_tb * n_tw * n_nc
+
+    def check(i_tt, i_tb, i_tw, i_nc):
+        res = batch_check(B_box_mm, H_mm, tt[i_tt], tb[i_tb], tw[i_tw], nc[i_nc],
+                          fy, gamma0, M_pos, M_neg, V)
+        if stability is not None:
+            stability.fuse(res, B_box_mm, H_mm, tt[i_tt], tb[i_tb], tw[i_tw], nc[i_nc], fy, M_pos, M_neg, V)
+        return res
+
+    # 1. 剪切：t_web 下限（ur_shear 与 t_top/t_bot 无关；剪切屈曲在最厚翼缘、腹板最矮处最有利，取该处为下界）
+    thr_web, n_eval = _first_ok_index(
+        lambda cols, mid: _plate_ur(check(n_tt - 1, n_tb - 1, mid, cols), "web") <= 1.0, n_tw, n_nc)
+
+    # 2. 顶/底板：其余厚度固定时的各列下限
+    c_tb, c_tw, c_nc = [a.ravel() for a in np.meshgrid(np.arange(n_tb), np.arange(n_tw), np.arange(n_nc), indexing="ij")]
+    thr_top, n = _first_ok_index(
+        lambda cols, mid: _plate_ur(check(mid, c_tb[cols], c_tw[cols], c_nc[cols]), "top") <= 1.0, n_tt, c_tb.size)
+    n_eval += n
+    c_tt, c_tw2, c_nc2 = [a.ravel() for a in np.meshgrid(np.arange(n_tt), np.arange(n_tw), np.arange(n_nc), indexing="ij")]
+    thr_bot, n = _first_ok_index(
+        lambda cols, mid: _plate_ur(check(c_tt[cols], mid, c_tw2[cols], c_nc2[cols]), "bot") <= 1.0, n_tb, c_tt.size)
+    n_eval += n
+
+    # 剩余候选（下标形状：n_tt, n_tb, n_tw, n_nc）
+    I_tt, I_tb, I_tw, I_nc = np.meshgrid(np.arange(n_tt), np.arange(n_tb), np.arange(n_tw), np.arange(n_nc), indexing="ij")
+    keep = ((I_tw >= thr_web[I_nc])
+            & (I_tt >= thr_top.reshape(n_tb, n_tw, n_nc)[I_tb, I_tw, I_nc])
+            & (I_tb >= thr_bot.reshape(n_tt, n_tw, n_nc)[I_tt, I_tw, I_nc]))
+    I_tt, I_tb, I_tw, I_nc = I_tt[keep], I_tb[keep], I_tw[keep], I_nc[keep]
+    if trace is not None:
+        run, t0 = trace.begin()
+        axis = lambda ax, i: float(ax[i]) if i < ax.size else np.nan  # noqa: E731
+        for j in range(n_nc):
+            trace.record(run, t0, 0, axis(tt, thr_top.reshape(n_tb, n_tw, n_nc)[..., j].min()),
+                         axis(tb, thr_bot.reshape(n_tt, n_tw, n_nc)[..., j].min()), axis(tw, thr_web[j]),
+                         np.nan, np.nan, np.nan, np.nan, PRUNE, int(nc[j]))
+
+    # 3. 按面积升序分块校核
+    area = batch_properties(B_box_mm, H_mm, tt[I_tt], tb[I_tb], tw[I_tw], nc[I_nc])["Area"]
+    order = np.argsort(area, kind="stable")
+    best = None
+    n_checked = 0
+    if progress is not None:
+        progress(0, order.size)
+    for s in range(0, order.size, chunk):
+        idx = order[s:s + chunk]
+        res = check(I_tt[idx], I_tb[idx], I_tw[idx], I_nc[idx])
+        n_checked += idx.size
+        if progress is not None:
+            progress(n_checked, order.size)
+        ok = np.nonzero(res["ur_max"] <= 1.0)[0]
+        if trace is not None:
+            for j in np.unique(I_nc[idx]):
+                k = int(np.argmax(I_nc[idx] == j))      # 块内按面积升序，首个即该 Nc 面积最小者
+                trace.record(run, t0, s // chunk + 1, tt[I_tt[idx[k]]], tb[I_tb[idx[k]]], tw[I_tw[idx[k]]],
+                             res["ur_top"][k], res["ur_bot"][k], res["ur_shear"][k], res["ur_max"][k],
+                             CANDIDATE, int(nc[j]))
+        if ok.size:
+            k = ok[0]
+            best = {key: float(val[k]) for key, val in res.items()}
+            best.update({"t_top": float(tt[I_tt[idx[k]]]), "t_bot": float(tb[I_tb[idx[k]]]),
+                         "t_web": float(tw[I_tw[idx[k]]]), "Nc": int(nc[I_nc[idx[k]]])})
+            break
+
+    if trace is not None:
+        n_blocks = -(-n_checked // chunk)
+        if best is None:
+            trace.record(run, t0, n_blocks, np.nan, np.nan, np.nan, np.nan, np.nan, np.nan, np.nan, INFEASIBLE)
+        else:
+            trace.record(run, t0, n_blocks, best["t_top"], best["t_bot"], best["t_web"], best["ur_top"],
+                         best["ur_bot"], best["ur_shear"], best["ur_max"], CONVERGED, best["Nc"])
+
+    out = {"success": best is not None,
+           "n_total": int(n_total),
+           "n_evaluated": int(n_eval + n_checked),
+           "n_pruned": int(n_total - n_checked)}
+    if best is not None:
+        out.update(best)
+    return out
+
+
+# =============== 4. 规则法初选（app.py 工程取值策略） ===============
+def round_up(x, step=2):
+    """按步长向上取整（标量或数组）"""
+    return np.ceil(np.asarray(x, dtype=float) / step) * step
+
+
+def snap_thickness(t, step=2, catalog=None):
+    """按步长向上取整；给出 catalog（catalog.PlateCatalog）时取目录中不小于 t 的最薄板（超出最厚档为 nan）"""
+    return round_up(t, step) if catalog is None else catalog.snap_up(t)
+
+
+def recommend_nc(B_box_m, target_cell_w=3.0):
+    """推荐箱室数：每室宽接近 target_cell_w (m)，限制 1~4"""
+    return np.clip(np.rint(np.asarray(B_box_m, dtype=float) / target_cell_w), 1, 4).astype(int)
+
+
+def size_by_rules(M_pos, M_neg, V, B_box, H, fy=345.0, gamma0=1.1, eta_beff=0.35, Nc=None,
+                  t_corr=2.0, t_top_min=16.0, t_bot_min=14.0, t_web_min=12.0, round_step=2, catalog=None):
+    """
+    按有效宽度法求理论板厚，再计入构造下限与腐蚀/制造裕量并向上取整（给出 catalog 时取目录档位，见 snap_thickness）。
+    B_box、H 单位 m；Nc 为 None 时按 recommend_nc 取值。参数可为标量或等长数组。
+    返回 dict：Wreq_pos, Wreq_neg (mm³), t_*_th 理论厚, t_top, t_bot, t_web 采用厚 (mm), Nc, n_webs
+    """
+    B_box = np.asarray(B_box, dtype=float)
+    Nc = recommend_nc(B_box) if Nc is None else np.asarray(Nc).astype(int)
+
+    # 设计强度与所需模量
+    fd = fy / gamma0
+    Wreq_pos = (M_pos * 1e6) / fd          # mm³
+    Wreq_neg = (M_neg * 1e6) / fd          # mm³
+
+    # 有效宽度与几何
+    beff_mm = (eta_beff * (0.85 * B_box)) * 1000
+    H_mm = H * 1000
+
+    # 板厚理论值
+    t_bot_th = Wreq_pos / (H_mm * beff_mm)
+    t_top_th = Wreq_neg / (H_mm * beff_mm)
+
+    # 腹板理论厚（剪力分担）
+    n_webs = Nc + 1
+    t_web_th = (V * 1e3) / ((0.58 * fy) * (0.9 * H_mm) * n_webs)
+
+    return {
+        "Wreq_pos": Wreq_pos, "Wreq_neg": Wreq_neg,
+        "t_top_th": t_top_th, "t_bot_th": t_bot_th, "t_web_th": t_web_th,
+        "t_top": snap_thickness(np.maximum(t_top_th, t_top_min) + t_corr, round_step, catalog),
+        "t_bot": snap_thickness(np.maximum(t_bot_th, t_bot_min) + t_corr, round_step, catalog),
+        "t_web": snap_thickness(np.maximum(t_web_th, t_web_min) + t_corr, round_step, catalog),
+        "Nc": Nc, "n_webs": n_webs,
+    }
+
+
+# =============== 5. 紧凑截面记录（不可变单条 / 列式多条） ===============
+# BoxGirderSection 的属性与校核由 SectionRecord 给出（self.record）；批量候选（pareto / sweep、batch_cli）
+# 用 SectionArray 列式保存：无实例 __dict__、无日志列表。
+_INPUT_FIELDS = ("B", "H", "t_top", "t_bot", "t_web", "Nc", "fy", "gamma0")
+_PROP_FIELDS = ("Area", "y_c", "Ixx", "W_top", "W_bot")
+
+SECTION_DTYPE = np.dtype([(k, "i4" if k == "Nc" else "f8") for k in _INPUT_FIELDS + _PROP_FIELDS])
+
+
+class SectionRecord:
+    """
+    不可变截面记录（__slots__）：输入 B, H, t_top, t_bot, t_web, Nc, fy, gamma0 (mm / MPa)
+    与构造时算好的 Area, y_c, Ixx, W_top, W_bot。修改厚度请用 replace() 生成新记录。
+    可哈希、可 pickle（进程池间传递）。
+    """
+    __slots__ = _INPUT_FIELDS + _PROP_FIELDS
+
+    def __init__(self, B_box_mm, H_mm, t_top, t_bot, t_web, Nc, fy, gamma0):
+        for set_, v in zip(_RECORD_SETTERS, (B_box_mm, H_mm, t_top, t_bot, t_web, Nc, fy, gamma0)
+                           + section_properties(B_box_mm, H_mm, t_top, t_bot, t_web, Nc)):
+            set_(self, v)
+
+    @classmethod
+    def _from_values(cls, values):
+        """由完整字段值（含已算好的属性）直接构造，不重算"""
+        rec = object.__new__(cls)
+        for set_, v in zip(_RECORD_SETTERS, values):
+            set_(rec, v)
+        return rec
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"SectionRecord 不可修改（{name}），请用 replace() 生成新记录")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"SectionRecord 不可修改（{name}）")
+
+    def __reduce__(self):
+        return SectionRecord, self.inputs()
+
+    def inputs(self):
+        return tuple(getattr(self, k) for k in _INPUT_FIELDS)
+
+    def __eq__(self, other):
+        return isinstance(other, SectionRecord) and self.inputs() == other.inputs()
+
+    def __hash__(self):
+        return hash(self.inputs())
+
+    def __repr__(self):
+        return ("SectionRecord(" + ", ".join(f"{k}={getattr(self, k)!r}" for k in _INPUT_FIELDS)
+                + f"; Area={self.Area:.6g})")
+
+    @property
+    def n_webs(self):
+        return self.Nc + 1
+
+    @property
+    def fd(self):
+        return self.fy / self.gamma0
+
+    @property
+    def tau_allow(self):
+        return 0.58 * self.fy
+
+    def check_capacity(self, M_pos_kN, M_neg_kN, V_kN):
+        """与 BoxGirderSection.check_capacity 相同的利用率 dict"""
+        return capacity_ur(self.H, self.t_web, self.Nc, self.fy, self.gamma0,
+                           self.W_top, self.W_bot, M_pos_kN, M_neg_kN, V_kN)
+
+    def check_envelope(self, loads):
+        """多荷载组合包络校核（同 BoxGirderSection.check_envelope）"""
+        env = load_envelope(loads)
+        res = self.check_capacity(env["M"], env["M"], env["V"])
+        res.update(case=int(governing_case(res, env)), case_flex=env["case_M"], case_shear=env["case_V"])
+        return res
+
+    def replace(self, **changes):
+        """替换部分输入字段（B, H, t_top, ...）后的新记录"""
+        bad = set(changes) - set(_INPUT_FIELDS)
+        if bad:
+            raise TypeError(f"未知或不可替换的字段: {', '.join(sorted(bad))}")
+        return SectionRecord(*(changes.get(k, getattr(self, k)) for k in _INPUT_FIELDS))
+
+    def as_dict(self):
+        return {k: getattr(self, k) for k in self.__slots__}
+
+
+# 槽描述符的 __set__ 绕过被禁用的 __setattr__，仅供构造时使用
+_RECORD_SETTERS = tuple(getattr(SectionRecord, k).__set__ for k in SectionRecord.__slots__)
+
+
+class SectionArray:
+    """
+    列式截面容器：一个 SECTION_DTYPE 结构化数组，每个截面一行（约 100 字节）。
+        sa["Area"]          -> 列（ndarray 视图）
+        sa[i]               -> SectionRecord
+        sa[mask] / sa[a:b]  -> SectionArray
+    """
+    __slots__ = ("data",)
+
+    def __init__(self, data):
+        data = np.asarray(data)
+        if data.dtype != SECTION_DTYPE:
+            raise TypeError("SectionArray 需要 SECTION_DTYPE 结构化数组，请用 from_inputs / from_records 构造")
+        self.data = data.reshape(-1)
+
+    @classmethod
+    def from_inputs(cls, B, H, t_top, t_bot, t_web, Nc, fy, gamma0):
+        """批量构造（参数可为标量或数组，按 numpy 规则广播）；属性由 batch_properties 计算"""
+        args = [np.asarray(a, dtype=float) for a in (B, H, t_top, t_bot, t_web, Nc, fy, gamma0)]
+        # 按广播形状直接写入各列（标量列不先展开成整列副本）
+        data = np.empty(np.broadcast_shapes(*(a.shape for a in args)), dtype=SECTION_DTYPE)
+        for k, v in zip(_INPUT_FIELDS, args):
+            data[k] = v
+        props = batch_properties(*args[:6])
+        for k in _PROP_FIELDS:
+            data[k] = props[k]
+        return cls(data)
+
+    @classmethod
+    def from_records(cls, records):
+        return cls(np.array([tuple(r.as_dict().values()) for r in records], dtype=SECTION_DTYPE))
+
+    @classmethod
+    def concat(cls, arrays):
+        return cls(np.concatenate([a.data for a in arrays]) if arrays else np.empty(0, SECTION_DTYPE))
+
+    def __len__(self):
+        return self.data.size
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return self.data[key]
+        if isinstance(key, (int, np.integer)):
+            return SectionRecord._from_values(self.data[key].item())
+        return SectionArray(self.data[key])
+
+    def __iter__(self):
+        for row in self.data.tolist():
+            yield SectionRecord._from_values(row)
+
+    def __repr__(self):
+        return f"SectionArray(n={len(self)}, nbytes={self.nbytes})"
+
+    @property
+    def nbytes(self):
+        return self.data.nbytes
+
+    def check_capacity(self, M_pos_kN, M_neg_kN, V_kN):
+        """批量利用率（直接使用已存的抗弯模量，不重算截面属性）；荷载可为标量或等长数组"""
+        d = self.data
+        return batch_ur(d["H"], d["t_web"], d["Nc"].astype(float), d["fy"], d["gamma0"],
+                        d["W_top"], d["W_bot"], *_as_arrays(M_pos_kN, M_neg_kN, V_kN))
+
+    def check(self, M_pos_kN, M_neg_kN, V_kN):
+        """截面属性列 + 利用率 dict（同 batch_check 的键，逐位一致）"""
+        res = {k: self.data[k] for k in _PROP_FIELDS}
+        res.update(self.check_capacity(M_pos_kN, M_neg_kN, V_kN))
+        return res
+
+    def check_envelope(self, loads):
+        """多荷载组合包络校核（同 envelope_check，直接使用已存的抗弯模量）"""
+        env = load_envelope(loads)
+        res = self.check_capacity(env["M"], env["M"], env["V"])
+        res["case"] = governing_case(res, env)
+        res["case_flex"] = np.full(len(self), env["case_M"])
+        res["case_shear"] = np.full(len(self), env["case_V"])
+        return res
+
+    def sort_by(self, key="Area"):
+        return SectionArray(self.data[np.argsort(self.data[key], kind="stable")])
+
+
+# =============== 6. 增量截面属性（单板改厚只重算受影响构件） ===============
+def _nonneg(x):
+    """max(x, 0)：标量走内建 max（免去 numpy 调用开销），数组走 np.maximum"""
+    return max(x, 0.0) if isinstance(x, float) else np.maximum(x, 0.0)
+
+
+def _top_moments(B, H, t_top):
+    """
+    构件矩 (A, S, y, n, I0, a)：面积、对底缘一次矩、形心高度，
+    以及 n 块相同板件各自的自身惯性矩 I0 与面积 a（惯性矩合计 n·(I0 + a·d²)，顶/底板 n=1）
+    """
+    A = B * t_top
+    y = H - t_top / 2
+    return A, A * y, y, 1.0, (B * (t_top * t_top * t_top)) / 12, A
+
+
+def _bot_moments(B, t_bot):
+    A = B * t_bot
+    y = t_bot / 2
+    return A, A * y, y, 1.0, (B * (t_bot * t_bot * t_bot)) / 12, A
+
+
+def _web_moments(H, t_top, t_bot, t_web, Nc):
+    n_webs = Nc + 1
+    h_web_net = _nonneg(H - t_top - t_bot)
+    A = n_webs * t_web * h_web_net
+    y = t_bot + h_web_net / 2
+    return A, A * y, y, n_webs, (t_web * (h_web_net * h_web_net * h_web_net)) / 12, t_web * h_web_net
+
+
+def _combine_moments(top, bot, webs, H):
+    """由三项构件矩合成截面属性 dict（运算顺序与 batch_properties / section_properties 相同，结果逐位一致）"""
+    scalar = isinstance(H, float)
+    Area = top[0] + bot[0] + webs[0]
+    if scalar:
+        Area = Area if Area > 0 else 1.0
+    else:
+        Area = np.where(Area <= 0, 1.0, Area)
+    y_c = (top[1] + bot[1] + webs[1]) / Area
+
+    # 惯性矩（各构件自身惯性矩 + 移轴到形心）
+    d_top = top[2] - y_c
+    d_bot = bot[2] - y_c
+    d_webs = webs[2] - y_c
+    Ixx = ((top[4] + top[5] * (d_top * d_top)) + (bot[4] + bot[5] * (d_bot * d_bot))
+           + webs[3] * (webs[4] + webs[5] * (d_webs * d_webs)))
+
+    c_top = H - y_c
+    if scalar:
+        W_top = Ixx / c_top if c_top > 0 else 1e9
+        W_bot = Ixx / y_c if y_c > 0 else 1e9
+    else:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            W_top = np.where(c_top > 0, Ixx / c_top, 1e9)
+            W_bot = np.where(y_c > 0, Ixx / y_c, 1e9)
+    return {"Area": Area, "y_c": y_c, "Ixx": Ixx, "W_top": W_top, "W_bot": W_bot}
+
+
+class SectionMoments:
+    """
+    增量截面属性引擎（数组版）：按构件（顶板 / 底板 / 腹板组）保存面积、一次矩、形心高度与自身惯性矩，
+    改某块板厚时只重算受影响的构件（顶/底板厚还会改变腹板净高），再合成 y_c、Ixx、W_top、W_bot。
+    结果与 batch_properties / batch_check 逐位一致。
+
+    用于优化器逐步改厚（BoxGirderSection.optimize_stepwise）与交互调参的“邻点试算”（app01 各板 ±步长）：
+    一次试算只需重算 1~2 个构件。输入全为标量时按 Python 浮点计算、利用率走 capacity_ur，
+    不经 numpy（单截面时 numpy 的调用开销远大于计算本身）。
+
+        m = SectionMoments(B, H, t_top, t_bot, t_web, Nc)      # 标量或数组，按 numpy 规则广播
+        m.probe(t_web=m.t_web + 2)                             # 试算，不改状态
+        m.set(t_top=new_t_top)                                 # 就地改厚
+        m.neighbours(fy, gamma0, M_pos, M_neg, V, step=2)      # 各板 ±step 的利用率
+    """
+    __slots__ = ("B", "H", "t_top", "t_bot", "t_web", "Nc", "_top", "_bot", "_web")
+
+    def __init__(self, B, H, t_top, t_bot, t_web, Nc):
+        args = (B, H, t_top, t_bot, t_web, Nc)
+        if all(isinstance(a, (int, float, np.generic)) for a in args):
+            args = tuple(float(a) for a in args)
+        else:
+            args = _as_arrays(*args)
+        self.B, self.H, self.t_top, self.t_bot, self.t_web, self.Nc = args
+        self._top = _top_moments(self.B, self.H, self.t_top)
+        self._bot = _bot_moments(self.B, self.t_bot)
+        self._web = _web_moments(self.H, self.t_top, self.t_bot, self.t_web, self.Nc)
+
+    def _components(self, t_top=None, t_bot=None, t_web=None, Nc=None):
+        """改动后的 (厚度, 构件矩)；未给出的量沿用当前值，不受影响的构件直接复用"""
+        conv = float if isinstance(self.B, float) else (lambda v: np.asarray(v, dtype=float))
+        tt = self.t_top if t_top is None else conv(t_top)
+        tb = self.t_bot if t_bot is None else conv(t_bot)
+        tw = self.t_web if t_web is None else conv(t_web)
+        nc = self.Nc if Nc is None else conv(Nc)
+        top = self._top if t_top is None else _top_moments(self.B, self.H, tt)
+        bot = self._bot if t_bot is None else _bot_moments(self.B, tb)
+        if t_top is None and t_bot is None and t_web is None and Nc is None:
+            web = self._web
+        else:
+            web = _web_moments(self.H, tt, tb, tw, nc)
+        return (tt, tb, tw, nc), (top, bot, web)
+
+    def properties(self):
+        """当前截面属性 dict：Area, y_c, Ixx, W_top, W_bot"""
+        return _combine_moments(self._top, self._bot, self._web, self.H)
+
+    def set(self, t_top=None, t_bot=None, t_web=None, Nc=None):
+        """就地修改厚度 / 箱室数（新值须可广播到当前形状），返回 self"""
+        (tt, tb, tw, nc), (top, bot, web) = self._components(t_top, t_bot, t_web, Nc)
+        if isinstance(self.B, float):
+            self.t_top, self.t_bot, self.t_web, self.Nc = tt, tb, tw, nc
+        else:
+            self.t_top, self.t_bot, self.t_web, self.Nc = np.broadcast_arrays(tt, tb, tw, nc, self.B)[:4]
+        self._top, self._bot, self._web = top, bot, web
+        return self
+
+    def probe(self, t_top=None, t_bot=None, t_web=None, Nc=None):
+        """试算改动后的截面属性 dict，不修改当前状态"""
+        return _combine_moments(*self._components(t_top, t_bot, t_web, Nc)[1], self.H)
+
+    def check_capacity(self, fy, gamma0, M_pos_kN, M_neg_kN, V_kN, **changes):
+        """当前（或带 changes 试算的）截面利用率 dict，同 batch_ur"""
+        (_, _, tw, nc), comps = self._components(**changes)
+        props = _combine_moments(*comps, self.H)
+        if isinstance(self.H, float) and all(isinstance(v, (int, float)) for v in (M_pos_kN, M_neg_kN, V_kN)):
+            return capacity_ur(self.H, tw, nc, fy, gamma0, props["W_top"], props["W_bot"],
+                               M_pos_kN, M_neg_kN, V_kN)
+        return batch_ur(self.H, tw, nc, fy, gamma0, props["W_top"], props["W_bot"],
+                        *_as_arrays(M_pos_kN, M_neg_kN, V_kN))
+
+    def neighbours(self, fy, gamma0, M_pos_kN, M_neg_kN, V_kN, step=2.0):
+        """各板 ±step 的试算利用率：{("t_top", +step): ur_dict, ...}"""
+        out = {}
+        for name in ("t_top", "t_bot", "t_web"):
+            for d in (step, -step):
+                out[(name, d)] = self.check_capacity(fy, gamma0, M_pos_kN, M_neg_kN, V_kN,
+                                                     **{name: getattr(self, name) + d})
+        return out
+
+
+# =============== 7. 多荷载组合包络 ===============
+def load_envelope(loads):
+    """
+    荷载组合表压缩为包络。loads: 形如 (n_cases, 3) 的数组，列为 M_pos, M_neg (kN·m), V (kN)；
+    单个 (M_pos, M_neg, V) 也可。
+
+    截面属性与荷载无关，且 ur_top / ur_bot 只随 max(M_pos, M_neg) 单调增、ur_shear 只随 V 单调增，
+    故全部组合的包络即“最大弯矩组合 + 最大剪力组合”，与截面数无关。
+    返回 dict（并列时取序号最小的组合）：
+        M, case_M          控制弯矩 max(M_pos, M_neg) 及其组合序号
+        V, case_V          最大剪力及其组合序号
+        M_pos, case_M_pos  / M_neg, case_M_neg  各列最大值（规则法初选分别决定底板/顶板厚）
+    (M, M, V) 可直接作为 check_capacity / grid_optimize 等单工况接口的荷载，
+    (M_pos, M_neg, V) 可作为 size_by_rules 的荷载。
+    """
+    loads = np.asarray(loads, dtype=float)
+    if loads.ndim == 1:
+        loads = loads.reshape(1, -1)
+    if loads.ndim != 2 or loads.shape[1] != 3 or loads.shape[0] == 0:
+        raise ValueError("loads 须为 (n_cases, 3) 数组：M_pos, M_neg, V")
+    M = np.maximum(loads[:, 0], loads[:, 1])
+    i_M, i_Mp, i_Mn, i_V = (int(np.argmax(col)) for col in (M, loads[:, 0], loads[:, 1], loads[:, 2]))
+    return {"M": float(M[i_M]), "case_M": i_M, "V": float(loads[i_V, 2]), "case_V": i_V,
+            "M_pos": float(loads[i_Mp, 0]), "case_M_pos": i_Mp,
+            "M_neg": float(loads[i_Mn, 1]), "case_M_neg": i_Mn}
+
+
+def governing_case(ur, env):
+    """ur_max 的控制组合序号：弯曲控制取 case_M，剪切控制取 case_V，相等取较小序号"""
+    ur_flex = np.maximum(ur["ur_top"], ur["ur_bot"])
+    tie = min(env["case_M"], env["case_V"])
+    return np.where(ur_flex > ur["ur_shear"], env["case_M"],
+                    np.where(ur_flex < ur["ur_shear"], env["case_V"], tie))
+
+
+def envelope_check(B, H, t_top, t_bot, t_web, Nc, fy, gamma0, loads):
+    """
+    多荷载组合包络校核（向量化）：截面参数同 batch_check，loads 为 (n_cases, 3) 组合表。
+    每个截面的结果与逐组合调用 batch_check 取最大值逐位一致，耗时与单组合相当。
+    返回 dict：截面属性 + ur_top, ur_bot, ur_shear, ur_max,
+              case（ur_max 控制组合序号）, case_flex（弯曲控制组合）, case_shear（剪切控制组合）
+    """
+    env = load_envelope(loads)
+    res = batch_check(B, H, t_top, t_bot, t_web, Nc, fy, gamma0, env["M"], env["M"], env["V"])
+    res["case"] = governing_case(res, env)
+    res["case_flex"] = np.full(res["ur_max"].shape, env["case_M"])
+    res["case_shear"] = np.full(res["ur_max"].shape, env["case_V"])
+    return res
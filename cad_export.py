@@ -0,0 +1,257 @@
+# -*- coding: utf-8 -*-
+"""
+CAD 截面图几何与矢量导出（SVG / DXF，不依赖 matplotlib）
+
+cad_geometry 计算二维工程图的全部图元（外轮廓、顶/底板、腹板、U 肋、尺寸链、文字），
+板件与加劲肋的位置取自 section_geometry.box_geometry（即被校核的构件几何），
+drawing.draw_section_cad 与本模块的 write_svg / write_dxf 共用这一份坐标。
+导出函数直接向文本流逐行写出，适合批量出图：
+
+    with open("sec.svg", "w", encoding="utf-8") as f:
+        write_svg(cad_geometry(**params), f)
+"""
+import io
+from html import escape
+
+from section_geometry import BOT, RIB_BOT, RIB_TOP, TOP, box_geometry, web_positions
+
+DIM_CLR = "#1a1a1a"
+PLATE_CLR = "#c7d7ef"
+
+# matplotlib 出图宽 10 in = 720 pt；矢量导出时按此比例把字号/线宽（pt）换算为图纸单位（mm）
+_FIG_WIDTH_PT = 720.0
+
+
+# =============== 1. 图元容器 ===============
+class CadGeometry:
+    """
+    二维图元（单位 mm，y 向上）：
+        rects    (x, y, w, h, kind)            kind: "outline" | "plate"
+        segments ((x0, y0), (x1, y1))，widths 线宽 (pt)，layers 图层名
+        texts    (x, y, text, ha, va, rotation, fontsize, color)
+        xlim, ylim 视图范围
+    """
+
+    def __init__(self):
+        self.rects = []
+        self.segments = []
+        self.widths = []
+        self.layers = []
+        self.texts = []
+        self.xlim = (0.0, 1.0)
+        self.ylim = (0.0, 1.0)
+
+    def line(self, xs, ys, lw=1.0, layer="DIM"):
+        self.segments.append(((xs[0], ys[0]), (xs[1], ys[1])))
+        self.widths.append(lw)
+        self.layers.append(layer)
+
+    def rect(self, x, y, w, h, kind):
+        self.rects.append((x, y, w, h, kind))
+
+    def text(self, x, y, txt, ha="left", va="baseline", rotation=0, fontsize=9, color="black"):
+        self.texts.append((x, y, txt, ha, va, rotation, fontsize, color))
+
+    @property
+    def unit(self):
+        """1 pt 对应的图纸长度 (mm)"""
+        return (self.xlim[1] - self.xlim[0]) / _FIG_WIDTH_PT
+
+
+def cad_geometry(
+    B_deck, B_box_mm, H_mm,
+    t_top, t_bot, t_web, Nc,
+    out_top, out_bot, e_web,
+    dim_gap=120,       # 尺寸整体外移距离（mm）
+    top_ribs=None, bot_ribs=None   # U 肋 (间距, a, b, h, t)，见 section_geometry
+):
+    """二维工程图（CAD风格）图元"""
+    g = CadGeometry()
+
+    # 等室宽（整数mm）；腹板位置与构件几何共用
+    x_all, cell_w = web_positions(B_box_mm, Nc, e_web)
+    xL, xR, x_webs = x_all[0], x_all[1], x_all[2:]
+    sec = box_geometry(B_box_mm, H_mm, t_top, t_bot, t_web, Nc, out_top, out_bot, e_web, top_ribs, bot_ribs)
+
+    # 顶部桥面总宽（对称）
+    B_deck_mm = int(round(B_deck * 1000))
+    oh = max(int(round((B_deck_mm - B_box_mm)/2)), 0)
+
+    # 外轮廓 & 顶/底板
+    g.rect(0, 0, B_box_mm, H_mm, "outline")
+    # 顶/底板（含外伸翼缘）
+    for p in sec.polygons(TOP) + sec.polygons(BOT):
+        (x0, y0), (x1, y1) = p.min(axis=0).tolist(), p.max(axis=0).tolist()
+        g.rect(x0, y0, x1 - x0, y1 - y0, "plate")
+
+    # 腹板（竖直）
+    for x in [xL, xR] + x_webs:
+        g.line([x, x], [t_bot, H_mm - t_top], lw=1.4, layer="WEB")
+
+    # U 肋（轮廓线）
+    for p in sec.polygons(RIB_TOP) + sec.polygons(RIB_BOT):
+        for (x0, y0), (x1, y1) in zip(p.tolist(), p[1:].tolist() + p[:1].tolist()):
+            g.line([x0, x1], [y0, y1], lw=0.8, layer="RIB")
+
+    # 尺寸辅助函数（水平/竖直）
+    def dim_h(x0, x1, y, txt, off=34, arrows=True):
+        g.line([x0, x1], [y, y], lw=1.0)
+        if arrows:
+            s = 22
+            g.line([x0, x0+s], [y, y+s*0.5], lw=1.0)
+            g.line([x0, x0+s], [y, y-s*0.5], lw=1.0)
+            g.line([x1, x1-s], [y, y+s*0.5], lw=1.0)
+            g.line([x1, x1-s], [y, y-s*0.5], lw=1.0)
+        if txt:
+            g.text((x0+x1)/2, y+off, txt, ha="center", va="bottom", fontsize=9)
+
+    def dim_v(x, y0, y1, txt, off=36, arrows=True):
+        g.line([x, x], [y0, y1], lw=1.0)
+        if arrows:
+            s = 22
+            g.line([x, x - s*0.5], [y0, y0 + s], lw=1.0)
+            g.line([x, x + s*0.5], [y0, y0 + s], lw=1.0)
+            g.line([x, x - s*0.5], [y1, y1 - s], lw=1.0)
+            g.line([x, x + s*0.5], [y1, y1 - s], lw=1.0)
+        if txt:
+            g.text(x - off, (y0+y1)/2, txt, ha="center", va="center", rotation=90, fontsize=9)
+
+    # 顶部：B_deck（整体上移 dim_gap）
+    y_top = H_mm + dim_gap
+    g.text(B_box_mm/2, y_top + 45, f"B_deck = {B_deck_mm} mm",
+           ha="center", va="bottom", fontsize=10)
+    dim_h(0 - oh, B_box_mm + oh, y_top, "", off=0, arrows=False)
+    dim_h(0 - oh, 0, y_top, f"{oh}", off=0)
+    x0 = 0
+    for _ in range(Nc):
+        x1 = x0 + cell_w
+        dim_h(x0, x1, y_top, f"{cell_w}", off=0)
+        x0 = x1
+    dim_h(B_box_mm, B_box_mm + oh, y_top, f"{oh}", off=0)
+
+    # 底部：B_box（整体下移 dim_gap）
+    y_bot = -dim_gap
+    g.text(B_box_mm/2, y_bot - 45, f"B_box = {B_box_mm:.0f} mm",
+           ha="center", va="top", fontsize=10)
+    dim_h(0, B_box_mm, y_bot, "", off=0, arrows=False)
+    dim_h(0, out_bot, y_bot, f"{int(out_bot)}", off=0)
+    x0 = out_bot
+    for _ in range(Nc):
+        x1 = x0 + cell_w
+        dim_h(x0, x1, y_bot, f"{cell_w}", off=0)
+        x0 = x1
+    dim_h(B_box_mm - out_bot, B_box_mm, y_bot, f"{int(out_bot)}", off=0)
+
+    # 左侧：H（整体左移 dim_gap）
+    dim_v(-dim_gap, 0, H_mm, f"H = {int(H_mm)} mm", off=34)
+
+    # 厚度文字
+    g.text(e_web * 0.4, H_mm - t_top/2, f"t_top={int(t_top)} mm", va="center", fontsize=9, color=DIM_CLR)
+    g.text(e_web * 0.4, t_bot/2,        f"t_bot={int(t_bot)} mm", va="center", fontsize=9, color=DIM_CLR)
+    g.text(B_box_mm/2, y_bot + 20,      f"t_web={int(t_web)} mm  (×{Nc+1} webs)",
+           ha="center", va="bottom", fontsize=9)
+
+    g.xlim = (-oh - dim_gap*1.2 - out_top, B_box_mm + oh + dim_gap*1.2 + out_top)
+    g.ylim = (y_bot - 80, y_top + 140)
+    return g
+
+
+# =============== 2. SVG ===============
+_SVG_ANCHOR = {"left": "start", "center": "middle", "right": "end"}
+_SVG_BASELINE = {"top": "hanging", "center": "central", "bottom": "text-after-edge", "baseline": "auto"}
+
+
+def _f(v):
+    return f"{v:.2f}".rstrip("0").rstrip(".")
+
+
+def write_svg(g, f):
+    """把 CadGeometry 以 SVG 写入文本流 f（y 轴翻转，坐标单位 mm）"""
+    (x_min, x_max), (y_min, y_max) = g.xlim, g.ylim
+    u = g.unit
+    W, H = x_max - x_min, y_max - y_min
+    X = lambda x: _f(x - x_min)           # noqa: E731
+    Y = lambda y: _f(y_max - y)           # noqa: E731
+
+    f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+    # viewBox 为图纸 mm 坐标；显示尺寸与 PNG 版面相当（宽 1000 px）
+    f.write(f'<svg xmlns="http://www.w3.org/2000/svg" width="1000" height="{_f(1000 * H / W)}" '
+            f'viewBox="0 0 {_f(W)} {_f(H)}">\n')
+    f.write('<rect width="100%" height="100%" fill="white"/>\n')
+
+    for x, y, w, h, kind in g.rects:
+        fill = f'fill="{PLATE_CLR}" fill-opacity="0.35"' if kind == "plate" else 'fill="none"'
+        lw = 1.0 if kind == "plate" else 1.2
+        f.write(f'<rect x="{X(x)}" y="{Y(y + h)}" width="{_f(w)}" height="{_f(h)}" {fill} '
+                f'stroke="{DIM_CLR}" stroke-width="{_f(lw * u)}"/>\n')
+
+    # 同线宽线段合并为一条 path
+    by_width = {}
+    for seg, lw in zip(g.segments, g.widths):
+        by_width.setdefault(lw, []).append(seg)
+    for lw, segs in by_width.items():
+        f.write(f'<path fill="none" stroke="{DIM_CLR}" stroke-width="{_f(lw * u)}" '
+                f'stroke-linecap="square" d="')
+        for (x0, y0), (x1, y1) in segs:
+            f.write(f"M{X(x0)} {Y(y0)}L{X(x1)} {Y(y1)}")
+        f.write('"/>\n')
+
+    for x, y, txt, ha, va, rot, size, color in g.texts:
+        tr = f' transform="rotate({-rot} {X(x)} {Y(y)})"' if rot else ""
+        f.write(f'<text x="{X(x)}" y="{Y(y)}" font-family="sans-serif" font-size="{_f(size * u)}" '
+                f'fill="{escape(color)}" text-anchor="{_SVG_ANCHOR[ha]}" '
+                f'dominant-baseline="{_SVG_BASELINE[va]}"{tr}>{escape(txt, quote=False)}</text>\n')
+    f.write("</svg>\n")
+
+
+# =============== 3. DXF (R12 ASCII) ===============
+_DXF_HALIGN = {"left": 0, "center": 1, "right": 2}
+_DXF_VALIGN = {"baseline": 0, "bottom": 1, "center": 2, "top": 3}
+
+
+def _dxf_str(s):
+    """非 ASCII 字符写成 \\U+XXXX 转义"""
+    return "".join(c if ord(c) < 128 else f"\\U+{ord(c):04X}" for c in s)
+
+
+def _dxf_line(f, layer, x0, y0, x1, y1):
+    f.write(f"0\nLINE\n8\n{layer}\n10\n{x0:.3f}\n20\n{y0:.3f}\n30\n0.0\n"
+            f"11\n{x1:.3f}\n21\n{y1:.3f}\n31\n0.0\n")
+
+
+def write_dxf(g, f):
+    """
+    把 CadGeometry 以 DXF (R12) 写入文本流 f；图层 OUTLINE / PLATE / WEB / RIB / DIM / TEXT。
+    坐标按 mm 写出；R12 没有 $INSUNITS，头段只写 $ACADVER，单位由导入方按 mm 设定。
+    """
+    u = g.unit
+    f.write("0\nSECTION\n2\nHEADER\n9\n$ACADVER\n1\nAC1009\n0\nENDSEC\n")
+    f.write("0\nSECTION\n2\nENTITIES\n")
+    for x, y, w, h, kind in g.rects:
+        layer = kind.upper()
+        for (a, b), (c, d) in (((x, y), (x + w, y)), ((x + w, y), (x + w, y + h)),
+                               ((x + w, y + h), (x, y + h)), ((x, y + h), (x, y))):
+            _dxf_line(f, layer, a, b, c, d)
+    for ((x0, y0), (x1, y1)), layer in zip(g.segments, g.layers):
+        _dxf_line(f, layer, x0, y0, x1, y1)
+    for x, y, txt, ha, va, rot, size, _ in g.texts:
+        f.write(f"0\nTEXT\n8\nTEXT\n10\n{x:.3f}\n20\n{y:.3f}\n30\n0.0\n40\n{size * u:.3f}\n"
+                f"1\n{_dxf_str(txt)}\n50\n{rot:.1f}\n72\n{_DXF_HALIGN[ha]}\n"
+                f"11\n{x:.3f}\n21\n{y:.3f}\n31\n0.0\n73\n{_DXF_VALIGN[va]}\n")
+    f.write("0\nENDSEC\n0\nEOF\n")
+
+
+# =============== 4. 便捷入口 ===============
+def export_section(fmt, f=None, **params):
+    """
+    由 cad_geometry 参数直接导出（fmt: "svg" | "dxf"）。
+    给定文本流 f 时写入 f 并返回 None，否则返回字符串。
+    """
+    writer = {"svg": write_svg, "dxf": write_dxf}[fmt]
+    g = cad_geometry(**params)
+    if f is not None:
+        writer(g, f)
+        return None
+    buf = io.StringIO()
+    writer(g, buf)
+    return buf.getvalue()
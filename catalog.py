@@ -0,0 +1,244 @@
+# -*- coding: utf-8 -*-
+"""
+钢板厚度目录（按钢种）与预计算构件表
+
+1. PlateCatalog：某钢种可供货的离散板厚。取值用二分查找（np.searchsorted）直接落到目录档位，
+   代替“按 1/2 mm 步长向上取整”；优化器的厚度轴直接取目录档（见 grid_optimize 的 *_values 参数）。
+2. CatalogTables：在项目的 B × H 网格上，为每个目录板厚预先算好顶/底板的面积、一次矩与自身惯性矩，
+   以及各 (H, t_top, t_bot) 的腹板净高；此后任一截面只需按下标取表再合成，结果与 batch_properties 逐位一致。
+   optimize 对网格上全部 (B, H, Nc) 同时求最小面积可行截面：各板厚下限用沿目录下标的向量化二分求出，
+   再在剩余候选中取面积最小者（与逐点调用 grid_optimize 结果相同）。
+3. catalog_optimize：目录约束下单个 (B, H) 的最小面积截面，返回与 grid_optimize 相同的 dict；
+   构件表按 (目录, B, H) 缓存复用。BoxGirderSection.optimize、service /optimize 与 batch_cli 给出钢种时走这里。
+
+目录厚度为示例，使用前请按钢厂实际供货表核对修改。
+"""
+from functools import lru_cache
+
+import numpy as np
+
+from box_section import _combine_moments, _first_ok_index, _plate_ur, batch_ur
+
+# 钢种 -> 可供货板厚 (mm)
+CATALOGS = {
+    "Q345qD": (8, 10, 12, 14, 16, 18, 20, 22, 24, 25, 28, 30, 32, 36, 40, 44, 50, 56, 60, 70, 80),
+    "Q370qD": (8, 10, 12, 14, 16, 18, 20, 22, 24, 25, 28, 30, 32, 36, 40, 44, 50, 56, 60),
+    "Q420qD": (10, 12, 14, 16, 18, 20, 22, 24, 25, 28, 30, 32, 36, 40, 44, 50),
+}
+
+
+# =============== 1. 厚度目录 ===============
+class PlateCatalog:
+    """有序、去重的可供货板厚表 thicknesses (mm)"""
+
+    def __init__(self, thicknesses, grade=None):
+        self.thicknesses = np.unique(np.asarray(thicknesses, dtype=float))
+        self.grade = grade
+
+    @classmethod
+    def from_grade(cls, grade):
+        if grade not in CATALOGS:
+            raise ValueError(f"未知钢种 {grade!r}，可选：{', '.join(CATALOGS)}")
+        return cls(CATALOGS[grade], grade)
+
+    def __len__(self):
+        return self.thicknesses.size
+
+    def __repr__(self):
+        return f"PlateCatalog({self.grade or '自定义'}: {', '.join(f'{t:g}' for t in self.thicknesses)})"
+
+    def index_up(self, t):
+        """不小于 t 的最薄档位下标（超出最厚档时为 len(self)）"""
+        return np.searchsorted(self.thicknesses, np.asarray(t, dtype=float), side="left")
+
+    def snap_up(self, t):
+        """不小于 t 的最薄目录板厚（标量或数组）；超出最厚档时为 nan"""
+        i = self.index_up(t)
+        return np.where(i < len(self), self.thicknesses[np.minimum(i, len(self) - 1)], np.nan)
+
+    def values(self, t_min=None, t_max=None):
+        """[t_min, t_max] 内的目录板厚（优化器的厚度轴）"""
+        t = self.thicknesses
+        if t_min is not None:
+            t = t[t >= t_min]
+        if t_max is not None:
+            t = t[t <= t_max]
+        return t
+
+
+# =============== 2. 预计算构件表 ===============
+class CatalogTables:
+    """
+    项目网格 B_values × H_values (mm) 上、按目录板厚预计算的构件表。
+    下标约定：iB / iH 为网格下标，i_top / i_bot / i_web 为目录档位下标（标量或可广播的数组）。
+    """
+
+    def __init__(self, catalog, B_values, H_values):
+        self.catalog = catalog
+        self.B = np.asarray(B_values, dtype=float)
+        self.H = np.asarray(H_values, dtype=float)
+        T = catalog.thicknesses
+        B, H = self.B[:, None], self.H[:, None]
+
+        # 顶板：面积 / 自身惯性矩 (B, T)，形心高度 (H, T)，一次矩 (B, H, T)
+        self.A_flange = B * T
+        self.I0_flange = (B * (T * T * T)) / 12
+        self.y_top = H - T / 2
+        self.S_top = self.A_flange[:, None, :] * self.y_top[None, :, :]
+        # 底板：面积 / 自身惯性矩同顶板，形心高度 (T)，一次矩 (B, T)
+        self.y_bot = T / 2
+        self.S_bot = self.A_flange * self.y_bot
+        # 腹板净高及其立方、形心高度 (H, T_top, T_bot)
+        self.h_web = np.maximum(self.H[:, None, None] - T[None, :, None] - T[None, None, :], 0.0)
+        self.h3_web = self.h_web * self.h_web * self.h_web
+        self.y_web = T[None, None, :] + self.h_web / 2
+
+    @property
+    def nbytes(self):
+        return sum(a.nbytes for a in (self.A_flange, self.I0_flange, self.y_top, self.S_top, self.y_bot,
+                                      self.S_bot, self.h_web, self.h3_web, self.y_web))
+
+    def properties(self, iB, iH, i_top, i_bot, i_web, Nc):
+        """按下标取表合成截面属性 dict（Area, y_c, Ixx, W_top, W_bot），与 batch_properties 逐位一致"""
+        A_t, I_t = self.A_flange[iB, i_top], self.I0_flange[iB, i_top]
+        A_b, I_b = self.A_flange[iB, i_bot], self.I0_flange[iB, i_bot]
+        top = (A_t, self.S_top[iB, iH, i_top], self.y_top[iH, i_top], 1.0, I_t, A_t)
+        bot = (A_b, self.S_bot[iB, i_bot], self.y_bot[i_bot], 1.0, I_b, A_b)
+
+        n_webs = np.asarray(Nc, dtype=float) + 1
+        t_web = self.catalog.thicknesses[i_web]
+        h = self.h_web[iH, i_top, i_bot]
+        A_w = n_webs * t_web * h
+        y_w = self.y_web[iH, i_top, i_bot]
+        webs = (A_w, A_w * y_w, y_w, n_webs, (t_web * self.h3_web[iH, i_top, i_bot]) / 12, t_web * h)
+        return _combine_moments(top, bot, webs, self.H[iH])
+
+    def check(self, iB, iH, i_top, i_bot, i_web, Nc, fy, gamma0, M_pos_kN, M_neg_kN, V_kN):
+        """属性 + 利用率 dict（同 batch_check）"""
+        props = self.properties(iB, iH, i_top, i_bot, i_web, Nc)
+        props.update(batch_ur(self.H[iH], self.catalog.thicknesses[i_web], Nc, fy, gamma0,
+                              props["W_top"], props["W_bot"], M_pos_kN, M_neg_kN, V_kN))
+        return props
+
+    def optimize(self, M_pos, M_neg, V, fy, gamma0, t_top_min=16, t_bot_min=14, t_web_min=12,
+                 t_max=None, Nc_values=(1, 2, 3, 4), block=16, stability=None):
+        """
+        网格上每个 (B, H, Nc) 的最小面积目录截面（UR_max ≤ 1）。
+        剪枝同 grid_optimize（剪切 -> t_web 下限；ur_top / ur_bot 分别沿 t_top / t_bot 单调），
+        只是各列同时做、且沿目录下标二分；block 为每次处理的列数。stability 同 grid_optimize。
+        返回 dict（形状 (nB, nH, nNc) 的数组）：success, t_top, t_bot, t_web, Area, ur_max,
+        以及 n_evaluated（含二分）与 n_checked（剪枝后逐个校核的候选数）
+        """
+        T = self.catalog.thicknesses
+        k_top, k_bot, k_web = (int(self.catalog.index_up(t)) for t in (t_top_min, t_bot_min, t_web_min))
+        n_end = len(T) if t_max is None else int(np.searchsorted(T, t_max, side="right"))
+        n_tt, n_tb, n_tw = n_end - k_top, n_end - k_bot, n_end - k_web
+        nc = np.asarray(Nc_values, dtype=float)
+        shape = (self.B.size, self.H.size, nc.size)
+        cB, cH, cN = (a.ravel() for a in np.meshgrid(np.arange(shape[0]), np.arange(shape[1]),
+                                                      np.arange(shape[2]), indexing="ij"))
+        out = {k: np.full(cB.size, np.nan) for k in ("t_top", "t_bot", "t_web", "Area", "ur_max")}
+        n_eval = n_checked = 0
+        if min(n_tt, n_tb, n_tw) <= 0:
+            out = {k: v.reshape(shape) for k, v in out.items()}
+            out.update(success=np.zeros(shape, dtype=bool), n_evaluated=0, n_checked=0)
+            return out
+
+        def check(c, i_tt, i_tb, i_tw):
+            res = self.check(cB[c], cH[c], k_top + i_tt, k_bot + i_tb, k_web + i_tw, nc[cN[c]],
+                             fy, gamma0, M_pos, M_neg, V)
+            if stability is not None:
+                stability.fuse(res, self.B[cB[c]], self.H[cH[c]], T[k_top + i_tt], T[k_bot + i_tb],
+                               T[k_web + i_tw], nc[cN[c]], fy, M_pos, M_neg, V)
+            return res
+
+        for s in range(0, cB.size, block):
+            cols = np.arange(s, min(s + block, cB.size))
+            n_c = cols.size
+            # 1. 剪切：各列 t_web 下限（最厚翼缘处，同 grid_optimize）
+            thr_web, n = _first_ok_index(
+                lambda a, mid: _plate_ur(check(cols[a], n_tt - 1, n_tb - 1, mid), "web") <= 1.0, n_tw, n_c)
+            n_eval += n
+            # 2. 顶/底板：其余厚度固定时的下限（列 × 另一板 × 腹板）
+            g_c, g_b, g_w = (a.ravel() for a in np.meshgrid(np.arange(n_c), np.arange(n_tb), np.arange(n_tw),
+                                                            indexing="ij"))
+            thr_top, n = _first_ok_index(
+                lambda a, mid: _plate_ur(check(cols[g_c[a]], mid, g_b[a], g_w[a]), "top") <= 1.0, n_tt, g_c.size)
+            n_eval += n
+            h_c, h_t, h_w = (a.ravel() for a in np.meshgrid(np.arange(n_c), np.arange(n_tt), np.arange(n_tw),
+                                                            indexing="ij"))
+            thr_bot, n = _first_ok_index(
+                lambda a, mid: _plate_ur(check(cols[h_c[a]], h_t[a], mid, h_w[a]), "bot") <= 1.0, n_tb, h_c.size)
+            n_eval += n
+
+            # 3. 剩余候选全部校核，按列取面积最小的可行解（同面积取候选顺序在前者，与 grid_optimize 一致）
+            I_c, I_tt, I_tb, I_tw = np.meshgrid(np.arange(n_c), np.arange(n_tt), np.arange(n_tb), np.arange(n_tw),
+                                                indexing="ij")
+            keep = ((I_tw >= thr_web[I_c])
+                    & (I_tt >= thr_top.reshape(n_c, n_tb, n_tw)[I_c, I_tb, I_tw])
+                    & (I_tb >= thr_bot.reshape(n_c, n_tt, n_tw)[I_c, I_tt, I_tw]))
+            I_c, I_tt, I_tb, I_tw = I_c[keep], I_tt[keep], I_tb[keep], I_tw[keep]
+            res = check(cols[I_c], I_tt, I_tb, I_tw)
+            n_eval += I_c.size
+            n_checked += I_c.size
+            ok = np.nonzero(res["ur_max"] <= 1.0)[0]
+            order = ok[np.lexsort((res["Area"][ok], I_c[ok]))]
+            first = order[np.r_[True, np.diff(I_c[order]) != 0]] if order.size else order
+            c = cols[I_c[first]]
+            out["t_top"][c] = T[k_top + I_tt[first]]
+            out["t_bot"][c] = T[k_bot + I_tb[first]]
+            out["t_web"][c] = T[k_web + I_tw[first]]
+            out["Area"][c] = res["Area"][first]
+            out["ur_max"][c] = res["ur_max"][first]
+
+        out = {k: v.reshape(shape) for k, v in out.items()}
+        out.update(success=~np.isnan(out["Area"]), n_evaluated=int(n_eval), n_checked=int(n_checked))
+        return out
+
+
+# =============== 3. 目录约束的单点优化 ===============
+@lru_cache(maxsize=64)
+def _tables(thicknesses, B_box_mm, H_mm):
+    """单个 (B, H) 的构件表（按目录板厚元组与尺寸缓存）"""
+    return CatalogTables(PlateCatalog(thicknesses), (B_box_mm,), (H_mm,))
+
+
+def catalog_optimize(catalog, B_box_mm, H_mm, M_pos, M_neg, V, fy, gamma0,
+                     t_top_min=16, t_bot_min=14, t_web_min=12, t_max=80, Nc_values=(1, 2, 3, 4),
+                     stability=None, progress=None):
+    """
+    目录板厚约束下的最小面积截面（CatalogTables.optimize 对单个 (B, H) 各 Nc 同时求解）。
+    结果与 grid_optimize(..., t_*_values=catalog.values(t_*_min, t_max)) 相同（同面积时同样取
+    (t_top, t_bot, t_web, Nc) 顺序在前者），返回的 dict 键也相同：
+    success, t_top, t_bot, t_web, Nc, Area, ur_*, n_total, n_evaluated, n_pruned
+    （剩余候选全部校核、不按面积界提前结束，故 n_pruned 只计单调界剪去的格点）。
+    progress(done, total) 为可选回调（求解前后各调用一次）。
+    """
+    T = catalog.thicknesses
+    tables = _tables(tuple(T.tolist()), float(B_box_mm), float(H_mm))
+    nc = np.asarray(Nc_values, dtype=float)
+    if progress is not None:
+        progress(0, nc.size)
+    res = tables.optimize(M_pos, M_neg, V, fy, gamma0, t_top_min, t_bot_min, t_web_min, t_max=t_max,
+                          Nc_values=nc, stability=stability)
+    if progress is not None:
+        progress(nc.size, nc.size)
+    n_total = int(np.prod([catalog.values(t, t_max).size for t in (t_top_min, t_bot_min, t_web_min)])) * nc.size
+    out = {"success": bool(res["success"].any()),
+           "n_total": n_total,
+           "n_evaluated": res["n_evaluated"],
+           "n_pruned": n_total - res["n_checked"]}
+    if not out["success"]:
+        return out
+
+    # 各 Nc 的最优解中取面积最小者；同面积按 (t_top, t_bot, t_web, Nc) 取在前者，与 grid_optimize 的候选顺序一致
+    t_top, t_bot, t_web, area = (res[k][0, 0] for k in ("t_top", "t_bot", "t_web", "Area"))
+    ok = np.nonzero(res["success"][0, 0])[0]
+    j = ok[np.lexsort((ok, t_web[ok], t_bot[ok], t_top[ok], area[ok]))[0]]
+    idx = [int(np.searchsorted(T, t)) for t in (t_top[j], t_bot[j], t_web[j])]
+    best = tables.check(0, 0, *idx, nc[j], fy, gamma0, M_pos, M_neg, V)
+    if stability is not None:
+        stability.fuse(best, tables.B[0], tables.H[0], t_top[j], t_bot[j], t_web[j], nc[j], fy, M_pos, M_neg, V)
+    out.update({k: float(v) for k, v in best.items()})
+    out.update(t_top=float(t_top[j]), t_bot=float(t_bot[j]), t_web=float(t_web[j]), Nc=int(nc[j]))
+    return out
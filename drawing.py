@@ -0,0 +1,238 @@
+# -*- coding: utf-8 -*-
+"""
+截面示意图绘制（CAD 风格二维图 / 伪 3D 梁段）
+
+使用 matplotlib 面向对象接口（Figure），不经过 pyplot 全局状态：图对象不会在 pyplot 中累积，
+可在多线程会话中安全使用。render_section 直接输出 PNG/SVG 字节并按几何参数缓存，
+界面显示与下载共用同一份字节。
+
+matplotlib 在首次绘图时才导入（约占应用冷启动的大半），导入本模块本身很轻；
+后端固定为非交互的 Agg（仅在未通过 MPLBACKEND 另行指定时），不探测 GUI 工具包。
+"""
+import io
+import os
+
+os.environ.setdefault("MPLBACKEND", "Agg")
+
+from cad_export import DIM_CLR, PLATE_CLR, cad_geometry
+from project_store import STORE
+from section_geometry import RIB_BOT, RIB_TOP, box_geometry, web_positions
+from section_cache import SectionCache
+
+# =============== 1. 线段批处理 ===============
+
+class SegmentBatch:
+    """
+    收集尺寸线、箭头、腹板等直线段，最后以一个 LineCollection 加入坐标轴
+    （逐段 ax.plot 每段生成一个 Line2D，箱室/标注越多越慢）。
+    """
+
+    def __init__(self):
+        self.segments = []
+        self.widths = []
+
+    def line(self, xs, ys, lw=1.0):
+        self.segments.append(((xs[0], ys[0]), (xs[1], ys[1])))
+        self.widths.append(lw)
+
+    def add_to(self, ax, batched=True, color=DIM_CLR):
+        from matplotlib.collections import LineCollection
+        if not batched:
+            for ((x0, y0), (x1, y1)), lw in zip(self.segments, self.widths):
+                ax.plot([x0, x1], [y0, y1], color=color, lw=lw)
+            return
+        if self.segments:
+            ax.add_collection(LineCollection(self.segments, colors=color, linewidths=self.widths,
+                                             capstyle="projecting", zorder=2), autolim=False)
+
+
+# =============== 2. 绘图函数 ===============
+
+def draw_section_cad(
+    B_deck, B_box_mm, H_mm,
+    t_top, t_bot, t_web, Nc,
+    out_top, out_bot, e_web,
+    dim_gap=120,       # 尺寸整体外移距离（mm）
+    batched=True,      # False：逐段 ax.plot（旧画法，仅供基准对比）
+    top_ribs=None, bot_ribs=None,  # U 肋 (间距, a, b, h, t)，见 section_geometry
+    ax=None            # 给出时画到该坐标轴上（如计算书页面），否则新建 Figure
+):
+    """二维工程图（CAD风格）；图元坐标来自 cad_export.cad_geometry，与 SVG/DXF 导出一致"""
+    from matplotlib.figure import Figure
+    from matplotlib.patches import Rectangle
+
+    g = cad_geometry(B_deck, B_box_mm, H_mm, t_top, t_bot, t_web, Nc,
+                     out_top, out_bot, e_web, dim_gap, top_ribs, bot_ribs)
+    if ax is None:
+        fig = Figure(figsize=(10.0, 5.2), dpi=150)
+        ax = fig.subplots()
+    else:
+        fig = ax.figure
+
+    # 外轮廓 & 顶/底板着色
+    for x, y, w, h, kind in g.rects:
+        if kind == "plate":
+            ax.add_patch(Rectangle((x, y), w, h, facecolor=PLATE_CLR, edgecolor=DIM_CLR, lw=1.0, alpha=0.35))
+        else:
+            ax.add_patch(Rectangle((x, y), w, h, fill=False, linewidth=1.2, edgecolor=DIM_CLR))
+
+    # 腹板 + 尺寸线
+    segs = SegmentBatch()
+    segs.segments, segs.widths = g.segments, g.widths
+    segs.add_to(ax, batched)
+
+    # 文字
+    for x, y, txt, ha, va, rot, size, color in g.texts:
+        ax.text(x, y, txt, ha=ha, va=va, rotation=rot, fontsize=size, color=color)
+
+    ax.set_aspect("equal")
+    ax.set_xlim(*g.xlim)
+    ax.set_ylim(*g.ylim)
+    ax.axis("off")
+    return fig
+
+
+def draw_section_3d(
+    B_deck, B_box_mm, H_mm,
+    t_top, t_bot, t_web, Nc,
+    out_top, out_bot, e_web,
+    L_seg_mm=1500, dim_gap=120, batched=True, top_ribs=None, bot_ribs=None
+):
+    """简易“伪3D”立体示意（短梁段），论文配图友好"""
+    from matplotlib.figure import Figure
+    from matplotlib.patches import Polygon
+
+    fig = Figure(figsize=(10.5, 5.8), dpi=150)
+    ax = fig.subplots()
+    segs = SegmentBatch()
+
+    # 透视偏移
+    dx = 0.30 * L_seg_mm
+    dy = 0.18 * L_seg_mm
+
+    # 等室宽（整数mm）；腹板位置与构件几何共用
+    x_all, cell_w = web_positions(B_box_mm, Nc, e_web)
+    xL, xR, x_webs = x_all[0], x_all[1], x_all[2:]
+
+    # 顶部桥面总宽
+    B_deck_mm = int(round(B_deck * 1000))
+    oh = max(int(round((B_deck_mm - B_box_mm)/2)), 0)
+
+    # 前后外框
+    front = [(0,0), (B_box_mm,0), (B_box_mm,H_mm), (0,H_mm)]
+    back  = [(x+dx, y+dy) for (x,y) in front]
+    # 连接线
+    for (x0,y0),(x1,y1) in zip(front, back):
+        segs.line([x0,x1], [y0,y1], lw=1.0)
+    ax.add_patch(Polygon(front, closed=True, fill=False, edgecolor=DIM_CLR, lw=1.2))
+    ax.add_patch(Polygon(back,  closed=True, fill=False, edgecolor=DIM_CLR, lw=1.0))
+
+    # 顶/底板（含翼缘，前后各一）
+    topF = [(-out_top, H_mm-t_top), (B_box_mm+out_top, H_mm-t_top),
+            (B_box_mm+out_top, H_mm), (-out_top, H_mm)]
+    topB = [(x+dx, y+dy) for (x,y) in topF]
+    botF = [(-out_bot, 0), (B_box_mm+out_bot, 0),
+            (B_box_mm+out_bot, t_bot), (-out_bot, t_bot)]
+    botB = [(x+dx, y+dy) for (x,y) in botF]
+    ax.add_patch(Polygon(topB, closed=True, facecolor="#dbe8ff", edgecolor=DIM_CLR, lw=0.8, alpha=0.55))
+    ax.add_patch(Polygon(topF, closed=True, facecolor="#c7d7ef",  edgecolor=DIM_CLR, lw=1.0, alpha=0.65))
+    ax.add_patch(Polygon(botB, closed=True, facecolor="#dbe8ff", edgecolor=DIM_CLR, lw=0.8, alpha=0.55))
+    ax.add_patch(Polygon(botF, closed=True, facecolor="#c7d7ef",  edgecolor=DIM_CLR, lw=1.0, alpha=0.65))
+
+    # 腹板（前后+连线）
+    def draw_web(x):
+        segs.line([x, x], [t_bot, H_mm-t_top], lw=1.2)
+        segs.line([x+dx, x+dx], [t_bot+dy, H_mm-t_top+dy], lw=1.0)
+        segs.line([x, x+dx],   [t_bot, t_bot+dy], lw=0.9)
+        segs.line([x, x+dx],   [H_mm-t_top, H_mm-t_top+dy], lw=0.9)
+    for x in [xL, xR] + x_webs:
+        draw_web(x)
+
+    # U 肋（前端面轮廓）
+    if top_ribs is not None or bot_ribs is not None:
+        sec = box_geometry(B_box_mm, H_mm, t_top, t_bot, t_web, Nc, out_top, out_bot, e_web, top_ribs, bot_ribs)
+        for p in sec.polygons(RIB_TOP) + sec.polygons(RIB_BOT):
+            ax.add_patch(Polygon(p, closed=True, facecolor="#c7d7ef", edgecolor=DIM_CLR, lw=0.6, alpha=0.65))
+
+    # 尺寸线（整体外移）
+    def dim_h(x0, x1, y, txt):
+        segs.line([x0, x1], [y, y], lw=1.0)
+        s = 22
+        segs.line([x0, x0+s], [y, y+s*0.5], lw=1.0)
+        segs.line([x0, x0+s], [y, y-s*0.5], lw=1.0)
+        segs.line([x1, x1-s], [y, y+s*0.5], lw=1.0)
+        segs.line([x1, x1-s], [y, y-s*0.5], lw=1.0)
+        ax.text((x0+x1)/2, y+28, txt, ha="center", va="bottom", fontsize=9)
+
+    def dim_v(x, y0, y1, txt):
+        segs.line([x, x], [y0, y1], lw=1.0)
+        s = 22
+        segs.line([x, x - s*0.5], [y0, y0 + s], lw=1.0)
+        segs.line([x, x + s*0.5], [y0, y0 + s], lw=1.0)
+        segs.line([x, x - s*0.5], [y1, y1 - s], lw=1.0)
+        segs.line([x, x + s*0.5], [y1, y1 - s], lw=1.0)
+        ax.text(x - 34, (y0+y1)/2, txt, ha="center", va="center", rotation=90, fontsize=9)
+
+    # 上：B_deck（对称）
+    y_top = H_mm + dim_gap
+    dim_h(0 - oh, B_box_mm + oh, y_top, "")
+    dim_h(0 - oh, 0, y_top, f"{oh}")
+    x0 = 0
+    clear_w = B_box_mm - 2*e_web
+    cell_w  = int(round(clear_w / Nc))
+    for _ in range(Nc):
+        x1 = x0 + cell_w
+        dim_h(x0, x1, y_top, f"{cell_w}")
+        x0 = x1
+    dim_h(B_box_mm, B_box_mm + oh, y_top, f"{oh}")
+    ax.text(B_box_mm/2, y_top + 45, f"B_deck = {B_deck_mm} mm", ha="center", va="bottom", fontsize=10)
+
+    # 下：B_box
+    y_bot = -dim_gap
+    dim_h(0, B_box_mm, y_bot, "")
+    dim_h(0, out_bot, y_bot, f"{int(out_bot)}")
+    x0 = out_bot
+    for _ in range(Nc):
+        x1 = x0 + cell_w
+        dim_h(x0, x1, y_bot, f"{cell_w}")
+        x0 = x1
+    dim_h(B_box_mm - out_bot, B_box_mm, y_bot, f"{int(out_bot)}")
+    ax.text(B_box_mm/2, y_bot - 45, f"B_box = {B_box_mm:.0f} mm", ha="center", va="top", fontsize=10)
+
+    # 左：H
+    dim_v(-dim_gap, 0, H_mm, f"H = {int(H_mm)} mm")
+
+    # 厚度说明
+    ax.text(e_web*0.4, H_mm - t_top/2, f"t_top={int(t_top)} mm",  va="center", fontsize=9, color=DIM_CLR)
+    ax.text(e_web*0.4, t_bot/2,        f"t_bot={int(t_bot)} mm",  va="center", fontsize=9, color=DIM_CLR)
+    ax.text(B_box_mm/2, y_bot + 20,    f"t_web={int(t_web)} mm (×{Nc+1} webs)",
+            ha="center", va="bottom", fontsize=9)
+
+    segs.add_to(ax, batched)
+    ax.set_aspect("equal")
+    ax.set_xlim(-oh - dim_gap*1.3 - out_top, B_box_mm + dx + oh + dim_gap*1.1 + out_top)
+    ax.set_ylim(y_bot - 120, H_mm + dy + dim_gap + 160)
+    ax.axis("off")
+    return fig
+
+
+# =============== 3. 图像字节缓存 ===============
+FIGURE_CACHE = SectionCache(maxsize=256, store=STORE)
+
+_DRAWERS = {"cad": draw_section_cad, "3d": draw_section_3d}
+
+
+def render_section(view, fmt="png", dpi=200, cache=FIGURE_CACHE, **geom):
+    """
+    绘制截面并导出为字节（view: "cad" | "3d"；fmt: "png" | "svg"）。
+    geom 为 draw_section_cad / draw_section_3d 的关键字参数；结果按 (view, fmt, dpi, geom) 缓存。
+    """
+    key = cache.key("figure", view, fmt, dpi, tuple(sorted(geom.items())))
+
+    def compute():
+        fig = _DRAWERS[view](**geom)
+        buf = io.BytesIO()
+        fig.savefig(buf, format=fmt, bbox_inches="tight", dpi=dpi)
+        return buf.getvalue()
+
+    return cache.get_or_compute(key, compute)
@@ -0,0 +1,320 @@
+# -*- coding: utf-8 -*-
+"""
+全梁纵向分段设计：按沿跨 N 个截面的弯矩/剪力（包络图采样）求各截面所需板厚，
+再把相邻截面合并为板段（顶板 / 底板 / 腹板各自分段），满足最小板段长度与相邻板段厚度差限制。
+
+1. 逐截面所需板厚（批量）：腹板取剪切所需最小厚度档；顶/底板在该腹板厚下，于全部 (t_top, t_bot)
+   厚度组合中取面积最小的可行组合。截面属性与荷载无关，同一 (B, H, t_web) 的截面共用一次属性计算，
+   再按抗弯模量排序、向量化二分，不逐截面调用优化器。
+2. 分段（动态规划）：每块板的厚度沿梁分段为常数且不小于段内各截面所需厚度，最小化钢材体积；
+   段长 ≥ L_min，相邻段厚度差 ≤ dt_max。每个厚度档用单调队列维护可行起点窗口内的最小值，O(N·K)。
+3. 复核与修补：合并后各截面整截面复核；底板加厚会使顶缘应力增大（反之亦然），
+   若个别截面 UR > 1，则把该截面对应板的所需厚度提高一档后重新分段，直至全部满足。
+
+示例：
+    python girder.py diagram.csv --B 9500 --H 2000 --Nc 3 --L-min 6 --dt-max 8 -o segments.csv
+    diagram.csv 列：x (m)，M (kN·m，正弯矩为正) 或 M_pos / M_neg（包络绝对值），V (kN)
+"""
+import argparse
+import csv
+import sys
+import time
+from collections import deque
+
+import numpy as np
+
+from box_section import _first_ok_index, batch_check, batch_properties
+
+PLATES = ("t_top", "t_bot", "t_web")
+_PLATE_LABELS = {"t_top": "顶板", "t_bot": "底板", "t_web": "腹板"}
+STEEL_DENSITY = 7.85  # t/m³
+
+
+# =============== 1. 输入 ===============
+def read_stations(f):
+    """
+    读取弯矩/剪力图 CSV（文本流）：x, M 或 M_pos/M_neg, V。
+    返回按 x 升序的 (x, M_pos, M_neg, V) 数组；M 为带符号弯矩时拆为正/负弯矩绝对值。
+    """
+    rows = list(csv.DictReader(f))
+    if not rows:
+        raise ValueError("弯矩/剪力图为空")
+
+    def col(key):
+        try:
+            return np.array([float(r[key]) for r in rows])
+        except KeyError:
+            raise ValueError(f"缺少列 {key}") from None
+
+    x, V = col("x"), np.abs(col("V"))
+    if "M_pos" in rows[0] or "M_neg" in rows[0]:
+        M_pos, M_neg = np.abs(col("M_pos")), np.abs(col("M_neg"))
+    else:
+        M = col("M")
+        M_pos, M_neg = np.maximum(M, 0.0), np.maximum(-M, 0.0)
+    order = np.argsort(x, kind="stable")
+    return x[order], M_pos[order], M_neg[order], V[order]
+
+
+def station_bounds(x):
+    """各截面的分段边界（相邻截面中点，两端取首末截面）：长 N+1"""
+    x = np.asarray(x, dtype=float)
+    return np.concatenate(([x[0]], (x[:-1] + x[1:]) / 2, [x[-1]]))
+
+
+# =============== 2. 逐截面所需板厚（批量） ===============
+def station_requirements(M_pos, M_neg, V, B_box_mm, H_mm, Nc, fy, gamma0, tt, tb, tw,
+                         max_groups=64, block=1 << 20):
+    """
+    各截面最小所需厚度（取自厚度档 tt / tb / tw）。B_box_mm、H_mm 可为标量或逐截面数组；
+    (B, H, t_web) 组数超过 max_groups（变截面梁）时改为“截面 × 厚度组合”分块整体校核。
+    返回 dict：t_top, t_bot, t_web（逐截面），feasible（厚度上限内是否可行），n_evaluated
+    """
+    M_pos, M_neg, V, B, H = np.broadcast_arrays(*[np.asarray(a, dtype=float)
+                                                   for a in (M_pos, M_neg, V, B_box_mm, H_mm)])
+    N = M_pos.size
+
+    # 腹板：剪切只与 t_web 有关，截面 × 腹板厚度档一次校核，取首个满足的档
+    ok_w = batch_check(B[:, None], H[:, None], tt[0], tb[0], tw[None, :], Nc, fy, gamma0,
+                       M_pos[:, None], M_neg[:, None], V[:, None])["ur_shear"] <= 1.0
+    feasible = ok_w.any(axis=1)
+    t_web = tw[np.where(feasible, ok_w.argmax(axis=1), tw.size - 1)]
+    n_eval = ok_w.size
+
+    # 顶/底板：截面属性与荷载无关，按 (B, H, t_web) 分组，每组对全部 (t_top, t_bot) 组合只算一次属性。
+    # ur_top、ur_bot ≤ 1 等价于 M = max(M_pos, M_neg) 下 min(W_top, W_bot) 足够大：组内按该模量升序排列，
+    # 每个截面的可行组合是一个后缀（向量化二分求起点），后缀中面积最小者即所需厚度。
+    TT, TB = (a.ravel() for a in np.meshgrid(tt, tb, indexing="ij"))
+    t_top, t_bot = np.empty(N), np.empty(N)
+    M = np.maximum(M_pos, M_neg)
+    fd = fy / gamma0
+    groups, inv = np.unique(np.stack([B, H, t_web], axis=1), axis=0, return_inverse=True)
+    if groups.shape[0] > max_groups:
+        rows = max(1, block // TT.size)
+        for s0 in range(0, N, rows):
+            r = slice(s0, s0 + rows)
+            res = batch_check(B[r, None], H[r, None], TT[None, :], TB[None, :], t_web[r, None], Nc, fy, gamma0,
+                              M_pos[r, None], M_neg[r, None], V[r, None])
+            ok = (res["ur_top"] <= 1.0) & (res["ur_bot"] <= 1.0)
+            k = np.where(ok, res["Area"], np.inf).argmin(axis=1)
+            feasible[r] &= ok.any(axis=1)
+            t_top[r], t_bot[r] = TT[k], TB[k]
+            n_eval += ok.size
+    else:
+        for g, (Bg, Hg, twg) in enumerate(groups):
+            idx = np.nonzero(inv.ravel() == g)[0]
+            props = batch_properties(Bg, Hg, TT, TB, twg, Nc)
+            order = np.argsort(np.minimum(props["W_top"], props["W_bot"]), kind="stable")
+            W = np.minimum(props["W_top"], props["W_bot"])[order]
+            # 后缀最小面积的位置（并列取靠前者）
+            rev = props["Area"][order][::-1]
+            hit = np.where(rev == np.minimum.accumulate(rev), np.arange(rev.size), 0)
+            best = (rev.size - 1 - np.maximum.accumulate(hit))[::-1]
+            # 与 batch_ur 相同的运算顺序，判定逐位一致
+            Mg = M[idx]
+            first, n = _first_ok_index(lambda cols, mid: ((Mg[cols] * 1e6) / W[mid]) / fd <= 1.0, W.size, idx.size)
+            ok = first < W.size
+            k = order[best[np.minimum(first, W.size - 1)]]
+            feasible[idx] &= ok
+            t_top[idx], t_bot[idx] = TT[k], TB[k]
+            n_eval += props["Area"].size + n
+    return {"t_top": t_top, "t_bot": t_bot, "t_web": t_web, "feasible": feasible, "n_evaluated": n_eval}
+
+
+# =============== 3. 单块板分段（动态规划） ===============
+def segment_plate(req, levels, bounds, weights, L_min, dt_max):
+    """
+    单块板的最小体积分段（无可行分段时抛出 ValueError）。
+        req      逐截面所需厚度 (N,)，取值须在 levels 中
+        levels   可选厚度（升序）
+        bounds   分段边界位置 (N+1,)，单位同 L_min
+        weights  逐截面“单位厚度的钢材体积”（受荷长度 × 板宽）(N,)
+    段厚为常数且 ≥ 段内各截面 req；段长 ≥ L_min（全梁不足 L_min 时整梁一段）；相邻段厚差 ≤ dt_max。
+    返回 (逐截面采用厚度 (N,), 板段列表 [(起始截面, 终止截面(不含), 厚度), ...])
+    """
+    N = req.size
+    r = np.searchsorted(levels, req)
+    # 低于最小所需厚度的档不可能用到，高于最大所需厚度的档也不会更优
+    levels = levels[r.min():r.max() + 1]
+    r = r - r.min()
+    K = levels.size
+    P = np.concatenate(([0.0], np.cumsum(weights)))
+    L_min = min(L_min, bounds[-1] - bounds[0])
+    # J[i]：满足段长 ≥ L_min 的最大起点边界
+    J = np.searchsorted(bounds, bounds - L_min + 1e-9 * max(L_min, 1.0), side="right") - 1
+    compat = np.abs(levels[:, None] - levels[None, :]) <= dt_max + 1e-9
+
+    f = np.full((N + 1, K), np.inf)      # f[i, k]：前 i 个截面分段完毕、最后一段厚度档 k 的最小体积
+    from_j = np.zeros((N + 1, K), dtype=np.int64)
+    prev_k = np.zeros((N + 1, K), dtype=np.int64)
+    queues = [deque() for _ in range(K)]
+    last_bad = np.full(K, -1)            # 档 k 不足的最后一个截面
+    pushed = 0
+    for i in range(1, N + 1):
+        last_bad[:r[i - 1]] = i - 1
+        # 新进入窗口的起点 j：g[j, k] = 与 k 厚差相容的前一段最优值
+        for j in range(pushed, min(J[i], i - 1) + 1):
+            if j == 0:
+                g, pk = np.zeros(K), np.zeros(K, dtype=np.int64)
+            else:
+                cand = np.where(compat, f[j][None, :], np.inf)
+                pk = cand.argmin(axis=1)
+                g = cand[np.arange(K), pk]
+            prev_k[j] = pk
+            val = g - P[j] * levels
+            for k in np.nonzero(np.isfinite(val))[0]:
+                q, v = queues[k], val[k]
+                while q and q[-1][1] >= v:
+                    q.pop()
+                q.append((j, v))
+            pushed = j + 1
+        for k in range(K):
+            q = queues[k]
+            while q and q[0][0] <= last_bad[k]:
+                q.popleft()
+            if q:
+                f[i, k] = P[i] * levels[k] + q[0][1]
+                from_j[i, k] = q[0][0]
+
+    if np.isinf(f[N]).all():
+        raise ValueError(f"厚度档 {levels.tolist()} 下不存在满足段长 ≥ {L_min:g}、相邻段厚差 ≤ {dt_max:g} 的分段")
+
+    # 回溯；等厚的相邻段并为一段（体积相同，仍满足段长与厚差限制）
+    t = np.empty(N)
+    segs = []
+    i, k = N, int(f[N].argmin())
+    while i > 0:
+        j = int(from_j[i, k])
+        t[j:i] = levels[k]
+        if segs and segs[-1][2] == levels[k]:
+            segs[-1] = (j, segs[-1][1], segs[-1][2])
+        else:
+            segs.append((j, i, float(levels[k])))
+        i, k = j, int(prev_k[j, k])
+    return t, segs[::-1]
+
+
+# =============== 4. 全梁设计 ===============
+def size_girder(x, M_pos, M_neg, V, B_box_mm, H_mm, Nc, fy=345.0, gamma0=1.1,
+                t_top_min=16, t_bot_min=14, t_web_min=12, t_max=80, step=2,
+                L_min=6.0, dt_max=8.0, max_rounds=20):
+    """
+    全梁纵向分段设计。x (m) 为截面位置（升序），M_pos / M_neg (kN·m)、V (kN) 为逐截面内力；
+    B_box_mm、H_mm 可为标量或逐截面数组（变高梁）；L_min (m) 最小板段长，dt_max (mm) 相邻段厚度差上限。
+
+    返回 dict：
+        x, t_top, t_bot, t_web        逐截面采用厚度
+        req_top, req_bot, req_web     逐截面所需厚度（分段前）
+        ur_max                        逐截面复核利用率
+        segments                      {板: [(x 起, x 止, 厚度), ...]}
+        volume, volume_req (m³)       分段后 / 逐截面取所需厚度时的钢材体积；mass (t)
+        n_stations, n_rounds, n_evaluated, elapsed
+    """
+    t0 = time.perf_counter()
+    x = np.asarray(x, dtype=float)
+    N = x.size
+    if N < 2 or x[-1] <= x[0]:
+        raise ValueError("纵向分段至少需要 2 个不同位置的截面")
+    B, H = (np.broadcast_to(np.asarray(a, dtype=float), (N,)) for a in (B_box_mm, H_mm))
+    lv = {p: np.arange(m, t_max + step / 2, step, dtype=float)
+          for p, m in zip(PLATES, (t_top_min, t_bot_min, t_web_min))}
+
+    req = station_requirements(M_pos, M_neg, V, B, H, Nc, fy, gamma0, lv["t_top"], lv["t_bot"], lv["t_web"])
+    if not req["feasible"].all():
+        bad = x[~req["feasible"]]
+        raise ValueError(f"{bad.size} 个截面在厚度上限 {t_max} mm 内无可行解（如 x = {bad[:5].tolist()} m），"
+                         "请加大梁高/箱宽或厚度上限")
+    n_eval = req["n_evaluated"]
+    need = {p: req[p].copy() for p in PLATES}
+
+    bounds = station_bounds(x)
+    trib = np.diff(bounds)
+    h_web = np.maximum(H - need["t_top"] - need["t_bot"], 0.0)
+    # 单位厚度 (mm) 的钢材体积 (m³)
+    weights = {"t_top": B * trib * 1e-6, "t_bot": B * trib * 1e-6, "t_web": (Nc + 1) * h_web * trib * 1e-6}
+
+    adopted, segs = {}, {}
+    dirty = set(PLATES)
+    for n_rounds in range(1, max_rounds + 1):
+        for p in dirty:
+            adopted[p], segs[p] = segment_plate(need[p], lv[p], bounds, weights[p], L_min, dt_max)
+        chk = batch_check(B, H, adopted["t_top"], adopted["t_bot"], adopted["t_web"], Nc, fy, gamma0,
+                          M_pos, M_neg, V)
+        n_eval += N
+        dirty = set()
+        for p, ur in (("t_top", chk["ur_top"]), ("t_bot", chk["ur_bot"]), ("t_web", chk["ur_shear"])):
+            bad = ur > 1.0
+            if bad.any():
+                # 不满足处该板已是最厚一档：再修补也无济于事，直接报出截面与板件
+                capped = bad & (adopted[p] >= lv[p][-1])
+                if capped.any():
+                    raise ValueError(f"x = {x[capped][:5].tolist()} m 处{_PLATE_LABELS[p]}已取厚度上限 {t_max} mm，"
+                                     "分段后 UR 仍 > 1，请加大梁高/箱宽或厚度上限")
+                # 该板在不满足截面处至少再加厚一档
+                raised = np.minimum(adopted[p][bad] + step, lv[p][-1])
+                need[p][bad] = np.maximum(need[p][bad], raised)
+                dirty.add(p)
+        if not dirty:
+            break
+    else:
+        raise RuntimeError(f"分段修补 {max_rounds} 轮后仍有截面 UR > 1")
+
+    volume = float((chk["Area"] * trib).sum() * 1e-6)
+    req_area = batch_check(B, H, req["t_top"], req["t_bot"], req["t_web"], Nc, fy, gamma0, 0.0, 0.0, 0.0)["Area"]
+    return {
+        "x": x,
+        "t_top": adopted["t_top"], "t_bot": adopted["t_bot"], "t_web": adopted["t_web"],
+        "req_top": req["t_top"], "req_bot": req["t_bot"], "req_web": req["t_web"],
+        "ur_max": chk["ur_max"],
+        "segments": {p: [(float(bounds[a]), float(bounds[b]), t) for a, b, t in segs[p]] for p in PLATES},
+        "volume": volume,
+        "volume_req": float((req_area * trib).sum() * 1e-6),
+        "mass": volume * STEEL_DENSITY,
+        "n_stations": N,
+        "n_rounds": n_rounds,
+        "n_evaluated": int(n_eval),
+        "elapsed": time.perf_counter() - t0,
+    }
+
+
+# =============== 5. 命令行 ===============
+def main(argv=None):
+    p = argparse.ArgumentParser(description="钢箱梁全梁纵向分段设计")
+    p.add_argument("diagram", help="弯矩/剪力图 CSV：x (m), M 或 M_pos/M_neg (kN·m), V (kN)；'-' 为标准输入")
+    p.add_argument("--B", type=float, required=True, help="箱宽 B_box (mm)")
+    p.add_argument("--H", type=float, required=True, help="梁高 H (mm)")
+    p.add_argument("--Nc", type=int, default=3)
+    p.add_argument("--fy", type=float, default=345.0)
+    p.add_argument("--gamma0", type=float, default=1.1)
+    p.add_argument("--t-min", type=float, nargs=3, default=(16, 14, 12), metavar=("TOP", "BOT", "WEB"))
+    p.add_argument("--t-max", type=float, default=80)
+    p.add_argument("--step", type=float, default=2)
+    p.add_argument("--L-min", type=float, default=6.0, help="最小板段长 (m)")
+    p.add_argument("--dt-max", type=float, default=8.0, help="相邻板段厚度差上限 (mm)")
+    p.add_argument("-o", "--output", help="板段表 CSV（plate, x_start, x_end, t）")
+    args = p.parse_args(argv)
+
+    if args.diagram == "-":
+        x, M_pos, M_neg, V = read_stations(sys.stdin)
+    else:
+        with open(args.diagram, encoding="utf-8-sig", newline="") as f:
+            x, M_pos, M_neg, V = read_stations(f)
+    res = size_girder(x, M_pos, M_neg, V, args.B, args.H, args.Nc, args.fy, args.gamma0,
+                      *args.t_min, t_max=args.t_max, step=args.step, L_min=args.L_min, dt_max=args.dt_max)
+
+    for plate in PLATES:
+        print(f"{plate}: " + "  ".join(f"[{a:g}–{b:g} m] {t:g}" for a, b, t in res["segments"][plate]))
+    print(f"{res['n_stations']} 个截面，修补 {res['n_rounds']} 轮，校核 {res['n_evaluated']} 次，"
+          f"{res['elapsed']:.2f} s；钢材 {res['volume']:.3f} m³ ({res['mass']:.1f} t)，"
+          f"逐截面取所需厚度为 {res['volume_req']:.3f} m³，UR_max {res['ur_max'].max():.3f}")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8", newline="") as f:
+            w = csv.writer(f)
+            w.writerow(["plate", "x_start", "x_end", "t"])
+            for plate in PLATES:
+                for a, b, t in res["segments"][plate]:
+                    w.writerow([plate, a, b, t])
+
+
+if __name__ == "__main__":
+    main()
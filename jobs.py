@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+"""
+后台作业队列（进程级，所有会话共享）
+
+耗时的优化 / 方案扫描提交到有界线程池中执行，Streamlit 脚本线程只负责提交与轮询，不再阻塞页面。
+作业函数的第一个参数为 Job，计算过程中调用 job.report(done, total, best=...) 汇报进度与当前最优
+（部分结果）；用户请求取消后，下一次 report 抛出 JobCancelled，作业随即结束。
+report 的签名与 grid_optimize / run_sweep 的 progress(done, total) 回调兼容，可直接传入。
+
+计算主体是 NumPy 批量运算（大部分时间释放 GIL），线程池即可让多个会话的作业并行；
+工作线程数有上限，每个会话（owner）同时排队/运行的作业数也有上限，避免单个用户占满线程池。
+"""
+import itertools
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from pareto import iter_pareto_front
+
+# 作业状态
+QUEUED, RUNNING, DONE, FAILED, CANCELLED = "queued", "running", "done", "failed", "cancelled"
+FINISHED = (DONE, FAILED, CANCELLED)
+
+_UNSET = object()
+
+
+class JobCancelled(Exception):
+    """作业已被请求取消（由 Job.report 抛出，JobManager 捕获）"""
+
+
+# =============== 1. 作业 ===============
+class Job:
+    """单个后台作业：状态、进度、部分结果与取消标志（线程安全）"""
+
+    def __init__(self, job_id, name, owner):
+        self.id = job_id
+        self.name = name
+        self.owner = owner
+        self.state = QUEUED
+        self.done = 0
+        self.total = 0
+        self.best = None
+        self.result = None
+        self.error = None
+        self.created = time.time()
+        self.started = self.finished = None
+        self._cancel = threading.Event()
+        self._lock = threading.Lock()
+        self._future = None
+
+    @property
+    def cancel_requested(self):
+        return self._cancel.is_set()
+
+    def report(self, done, total, best=_UNSET):
+        """汇报进度（及当前最优）；已请求取消时抛出 JobCancelled"""
+        with self._lock:
+            self.done, self.total = done, total
+            if best is not _UNSET:
+                self.best = best
+        if self._cancel.is_set():
+            raise JobCancelled(self.id)
+
+    def cancel(self):
+        """请求取消：排队中的作业直接取消，运行中的作业在下一次 report 时结束"""
+        self._cancel.set()
+        if self._future is not None and self._future.cancel():
+            self._finish(CANCELLED)
+
+    def snapshot(self):
+        """供界面轮询的状态快照（dict）"""
+        with self._lock:
+            end = self.finished or time.time()
+            return {
+                "id": self.id, "name": self.name, "state": self.state,
+                "done": self.done, "total": self.total,
+                "fraction": self.done / self.total if self.total else 0.0,
+                "best": self.best, "result": self.result, "error": self.error,
+                "elapsed": end - self.started if self.started else 0.0,
+                "cancel_requested": self._cancel.is_set(),
+            }
+
+    def _run(self, fn, args, kwargs):
+        with self._lock:
+            if self._cancel.is_set():
+                self.state, self.finished = CANCELLED, time.time()
+                return
+            self.state, self.started = RUNNING, time.time()
+        try:
+            result = fn(self, *args, **kwargs)
+        except JobCancelled:
+            self._finish(CANCELLED)
+        except Exception as e:  # 作业失败只记录在作业上，不影响线程池
+            self._finish(FAILED, error=f"{type(e).__name__}: {e}")
+        else:
+            self._finish(DONE, result=result)
+
+    def _finish(self, state, result=None, error=None):
+        with self._lock:
+            if self.state in FINISHED:
+                return
+            self.state, self.result, self.error, self.finished = state, result, error, time.time()
+
+
+# =============== 2. 作业管理器 ===============
+class JobManager:
+    """
+    有界线程池 + 作业表。
+    max_workers:   同时运行的作业数（缺省按 CPU 核数，至少 2）
+    max_per_owner: 每个 owner 未结束（排队 + 运行）作业数上限，超出时 submit 抛出 RuntimeError；
+                   缺省为线程数的一半（至少 1），单个会话占不满线程池
+    keep:          作业表保留的已结束作业数（超出按提交顺序淘汰最旧的）
+    """
+
+    def __init__(self, max_workers=None, max_per_owner=None, keep=256):
+        if max_workers is None:
+            max_workers = max(2, os.cpu_count() or 1)
+        if max_per_owner is None:
+            max_per_owner = max(1, max_workers // 2)
+        self.max_workers = max_workers
+        self.max_per_owner = max_per_owner
+        self.keep = keep
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self._jobs = OrderedDict()
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def submit(self, fn, *args, name=None, owner=None, **kwargs):
+        """提交 fn(job, *args, **kwargs)，返回 Job"""
+        with self._lock:
+            active = sum(1 for j in self._jobs.values() if j.owner == owner and j.state not in FINISHED)
+            if owner is not None and active >= self.max_per_owner:
+                raise RuntimeError(f"已有 {active} 个作业未完成，请等待或取消后再提交。")
+            job = Job(f"job-{next(self._ids)}", name or getattr(fn, "__name__", "job"), owner)
+            self._jobs[job.id] = job
+            self._prune()
+        job._future = self._pool.submit(job._run, fn, args, kwargs)
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def jobs(self, owner=None):
+        with self._lock:
+            return [j for j in self._jobs.values() if owner is None or j.owner == owner]
+
+    def cancel(self, job_id):
+        job = self.get(job_id)
+        if job is not None:
+            job.cancel()
+        return job
+
+    def stats(self):
+        with self._lock:
+            states = [j.state for j in self._jobs.values()]
+        return {"max_workers": self.max_workers, "jobs": len(states),
+                **{s: states.count(s) for s in (QUEUED, RUNNING, DONE, FAILED, CANCELLED)}}
+
+    def shutdown(self, cancel=True):
+        if cancel:
+            for job in self.jobs():
+                job.cancel()
+        self._pool.shutdown(wait=True)
+
+    def _prune(self):
+        finished = [k for k, j in self._jobs.items() if j.state in FINISHED]
+        for k in finished[:max(0, len(finished) - self.keep)]:
+            del self._jobs[k]
+
+
+# 全局共享实例
+JOB_MANAGER = JobManager()
+
+
+# =============== 3. 作业函数 ===============
+def optimize_job(job, section, M_pos, M_neg, V, t_max=80, step=2, catalog=None, method="grid", stability=None):
+    """
+    BoxGirderSection.optimize 的作业版（section 就地更新），返回 success, log 与优化后厚度。
+    method="gradient" 时改用 optimize_gradient（只需十余次校核，不汇报中间进度）；stability 原样传入。
+    """
+    if method == "gradient":
+        success, log = section.optimize_gradient(M_pos, M_neg, V, t_max=t_max, step=step, catalog=catalog,
+                                                 stability=stability)
+    else:
+        success, log = section.optimize(M_pos, M_neg, V, t_max=t_max, step=step, progress=job.report,
+                                        catalog=catalog, stability=stability)
+    return {"success": success, "log": list(log),
+            "t_top": section.t_top, "t_bot": section.t_bot, "t_web": section.t_web}
+
+
+def pareto_job(job, *args, **kwargs):
+    """iter_pareto_front 的作业版：每处理完一块把当前前沿作为部分结果汇报，返回最终前沿"""
+    front = None
+    for step in iter_pareto_front(*args, **kwargs):
+        front = step["front"]
+        job.report(step["done"], step["total"], best=front)
+    return front
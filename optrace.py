@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+"""
+优化器的迭代追踪（BoxGirderSection.optimize_stepwise、grid_optimize、sensitivity.gradient_optimize）
+
+1. StepLog：步进优化单次的日志。每步只追加一个事件元组，文字行在显示（迭代/取下标/join）时才格式化，
+   内容与原逐行 f-string 日志一致。
+2. OptimizerTrace：跨多次优化的结构化追踪，事件写入预分配的环形缓冲区（NumPy 结构化数组，
+   写满后覆盖最旧事件），字段含厚度、各项利用率、所选动作与自本次优化开始的耗时；
+   可导出 CSV / JSON，或按次汇总迭代数与收敛情况。未传入 trace 时优化器只多一次 `is None` 判断。
+   非线程安全：每个线程 / 作业各用一个实例。
+   网格优化记录各 Nc 的剪枝下限（prune，利用率为 nan）与每块校核中各 Nc 面积最小的候选（candidate）；
+   梯度优化记录牛顿迭代（newton）、取整补足（round）与局部改进（polish）各步；两者以 converged / infeasible 结束。
+
+命令行（随机荷载下批量运行并统计收敛行为）：
+    python optrace.py -n 5000 --csv trace.csv --json trace.json
+    python optrace.py -n 200 --method gradient
+"""
+import argparse
+import csv
+import json
+import math
+import time
+from collections.abc import Sequence
+
+import numpy as np
+
+# 每步动作（事件中存下标）；CONVERGED / FLOOR / INFEASIBLE 为终止事件
+MOVES = ("+t_web", "+t_top", "+t_bot", "-t_web", "-t_top", "-t_bot", "converged", "floor",
+         "prune", "candidate", "newton", "round", "polish", "infeasible")
+(ADD_WEB, ADD_TOP, ADD_BOT, CUT_WEB, CUT_TOP, CUT_BOT, CONVERGED, FLOOR,
+ PRUNE, CANDIDATE, NEWTON, ROUND, POLISH, INFEASIBLE) = range(len(MOVES))
+
+# StepLog 事件元组与 OptimizerTrace 环形缓冲区的字段（后者另有 run、Nc 与 elapsed）
+EVENT_FIELDS = ("iter", "t_top", "t_bot", "t_web", "ur_top", "ur_bot", "ur_shear", "ur_max", "move")
+TRACE_DTYPE = np.dtype([("run", "i8"), ("iter", "i4"), ("Nc", "i4"),
+                        ("t_top", "f8"), ("t_bot", "f8"), ("t_web", "f8"),
+                        ("ur_top", "f8"), ("ur_bot", "f8"), ("ur_shear", "f8"), ("ur_max", "f8"),
+                        ("move", "i1"), ("elapsed", "f8")])
+
+
+# =============== 1. 单次优化日志（延迟格式化） ===============
+def format_step(i, t_top, t_bot, t_web, ur_max):
+    return f"Iter {i:02d}: t=({t_top}, {t_bot}, {t_web}) -> UR_max={ur_max:.3f}"
+
+
+def format_stop(i, move):
+    if move == CONVERGED:
+        return f"✅ 在第 {i} 次迭代收敛到最优区间 (0.9-1.0)。"
+    return "⚠️ 达到构造最小厚度限制，无法进一步优化。"
+
+
+class StepLog(Sequence):
+    """
+    optimize_stepwise 的日志：events 为 EVENT_FIELDS 顺序的元组列表。
+    作为字符串序列使用（len / 下标 / 迭代 / "\\n".join），首次访问时才格式化并缓存。
+    """
+
+    def __init__(self, events=None):
+        self.events = [] if events is None else events
+        self._lines, self._n = None, -1
+
+    def _materialize(self):
+        if self._n != len(self.events):
+            lines = []
+            for i, tt, tb, tw, _, _, _, ur_max, move in self.events:
+                lines.append(format_step(i, tt, tb, tw, ur_max))
+            if self.events and self.events[-1][-1] >= CONVERGED:
+                lines.append(format_stop(self.events[-1][0], self.events[-1][-1]))
+            self._lines, self._n = lines, len(self.events)
+        return self._lines
+
+    def __len__(self):
+        return len(self._materialize())
+
+    def __getitem__(self, k):
+        return self._materialize()[k]
+
+    def __eq__(self, other):
+        return isinstance(other, Sequence) and list(self) == list(other)
+
+    def __repr__(self):
+        return f"StepLog({len(self.events)} 步)"
+
+
+# =============== 2. 跨次追踪（环形缓冲区） ===============
+class OptimizerTrace:
+    """预分配 capacity 条事件的环形缓冲区；n_recorded 为累计写入数，超出容量的最旧事件被覆盖"""
+
+    def __init__(self, capacity=65536):
+        self.capacity = int(capacity)
+        self._buf = np.zeros(self.capacity, dtype=TRACE_DTYPE)
+        self.n_recorded = 0
+        self.n_runs = 0
+
+    def begin(self):
+        """开始一次优化，返回 (run 编号, 起始时刻)"""
+        self.n_runs += 1
+        return self.n_runs - 1, time.perf_counter()
+
+    def record(self, run, t0, i, t_top, t_bot, t_web, ur_top, ur_bot, ur_shear, ur_max, move, Nc=0):
+        self._buf[self.n_recorded % self.capacity] = (run, i, Nc, t_top, t_bot, t_web, ur_top, ur_bot,
+                                                      ur_shear, ur_max, move, time.perf_counter() - t0)
+        self.n_recorded += 1
+
+    def __len__(self):
+        return min(self.n_recorded, self.capacity)
+
+    @property
+    def dropped(self):
+        return max(0, self.n_recorded - self.capacity)
+
+    def clear(self):
+        self.n_recorded = self.n_runs = 0
+
+    def events(self):
+        """按写入顺序排列的事件（结构化数组副本）"""
+        n, cap = self.n_recorded, self.capacity
+        if n <= cap:
+            return self._buf[:n].copy()
+        k = n % cap
+        return np.concatenate([self._buf[k:], self._buf[:k]])
+
+    def runs(self):
+        """
+        按次汇总（缓冲区内尚存的事件）：结构化数组，字段
+        run, n_iter, converged（以 converged 结束）, floor（触底结束）, ur_max（末步）, elapsed（末步耗时 s）
+        """
+        ev = self.events()
+        out = np.zeros(0, dtype=[("run", "i8"), ("n_iter", "i4"), ("converged", "?"), ("floor", "?"),
+                                 ("ur_max", "f8"), ("elapsed", "f8")])
+        if ev.size == 0:
+            return out
+        last = np.r_[np.nonzero(np.diff(ev["run"]))[0], ev.size - 1]
+        out = np.zeros(last.size, dtype=out.dtype)
+        out["run"] = ev["run"][last]
+        out["n_iter"] = ev["iter"][last]
+        out["converged"] = ev["move"][last] == CONVERGED
+        out["floor"] = ev["move"][last] == FLOOR
+        out["ur_max"] = ev["ur_max"][last]
+        out["elapsed"] = ev["elapsed"][last]
+        return out
+
+    def lines(self, run=None):
+        """逐事件格式化为文字（只在调用时格式化）；run 指定时只取该次优化"""
+        ev = self.events()
+        if run is not None:
+            ev = ev[ev["run"] == run]
+        for e in ev:
+            yield (f"[{e['run']}] " + format_step(int(e["iter"]), e["t_top"], e["t_bot"], e["t_web"], e["ur_max"])
+                   + f"  Nc={e['Nc']}  {MOVES[e['move']]}  {e['elapsed'] * 1e6:.1f} µs")
+
+    def to_records(self):
+        """事件列表（dict，move 为动作名；nan / inf 记为 None，保证 JSON 合法）"""
+        names = TRACE_DTYPE.names
+        return [{k: (MOVES[v] if k == "move" else
+                     None if isinstance(v, float) and not math.isfinite(v) else v) for k, v in zip(names, row)}
+                for row in self.events().tolist()]
+
+    def to_csv(self, f):
+        """写入文本流（表头为 TRACE_DTYPE 字段名）"""
+        w = csv.writer(f)
+        w.writerow(TRACE_DTYPE.names)
+        for row in self.events().tolist():
+            w.writerow([MOVES[v] if k == "move" else v for k, v in zip(TRACE_DTYPE.names, row)])
+
+    def to_json(self, f=None):
+        """JSON：{"capacity", "n_recorded", "dropped", "events": [...]}；f 为 None 时返回字符串"""
+        doc = {"capacity": self.capacity, "n_recorded": self.n_recorded, "dropped": self.dropped,
+               "events": self.to_records()}
+        if f is None:
+            return json.dumps(doc, ensure_ascii=False, allow_nan=False)
+        json.dump(doc, f, ensure_ascii=False, allow_nan=False)
+
+
+# =============== 3. 命令行：批量收敛统计 ===============
+def main(argv=None):
+    from box_section import BoxGirderSection, grid_optimize
+    from sensitivity import gradient_optimize
+
+    p = argparse.ArgumentParser(description="优化器收敛行为统计（随机荷载批量运行）")
+    p.add_argument("-n", "--runs", type=int, default=1000)
+    p.add_argument("--method", choices=("stepwise", "grid", "gradient"), default="stepwise")
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--capacity", type=int, default=1 << 16, help="环形缓冲区容量（事件数）")
+    p.add_argument("--max-iter", type=int, default=20)
+    p.add_argument("--csv", help="导出事件 CSV")
+    p.add_argument("--json", help="导出事件 JSON")
+    args = p.parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    loads = rng.uniform((5000, 10000, 2000), (80000, 120000, 20000), (args.runs, 3))
+    trace = OptimizerTrace(args.capacity)
+    t0 = time.perf_counter()
+    for M_pos, M_neg, V in loads.tolist():
+        if args.method == "grid":
+            grid_optimize(9500.0, 2000.0, M_pos, M_neg, V, 345.0, 1.1, trace=trace)
+        elif args.method == "gradient":
+            gradient_optimize(9500.0, 2000.0, M_pos, M_neg, V, 345.0, 1.1, 3, max_iter=args.max_iter, trace=trace)
+        else:
+            BoxGirderSection(9500.0, 2000.0, 16, 14, 12, 3, 345.0, 1.1).optimize_stepwise(
+                M_pos, M_neg, V, max_iter=args.max_iter, trace=trace)
+    elapsed = time.perf_counter() - t0
+
+    r = trace.runs()
+    moves = np.bincount(trace.events()["move"], minlength=len(MOVES))
+    print(f"{args.runs} 次优化，{trace.n_recorded} 步，{elapsed:.3f} s（缓冲区保留 {len(trace)} 步，覆盖 {trace.dropped}）")
+    print(f"收敛 {r['converged'].mean():.1%}  触底 {r['floor'].mean():.1%}  "
+          f"未收敛（达到 max_iter / 无可行解） {(~r['converged'] & ~r['floor']).mean():.1%}")
+    print(f"迭代数 p50 {np.percentile(r['n_iter'], 50):.0f}  p99 {np.percentile(r['n_iter'], 99):.0f}  "
+          f"max {r['n_iter'].max()}；单次耗时 p50 {np.percentile(r['elapsed'], 50) * 1e6:.1f} µs")
+    print("动作分布: " + "  ".join(f"{m} {c}" for m, c in zip(MOVES, moves)))
+    if args.csv:
+        with open(args.csv, "w", encoding="utf-8", newline="") as f:
+            trace.to_csv(f)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            trace.to_json(f)
+
+
+if __name__ == "__main__":
+    main()
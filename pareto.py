@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+"""方案比选：面积 / 梁高 / 箱室数 / 箱宽（可加利用率）的 Pareto 前沿（分块流式计算，不依赖 streamlit）"""
+import numpy as np
+
+from box_section import SectionArray
+
+# 前沿中保留的字段（设计参数 + 结果）
+FRONT_KEYS = ("B", "H", "Nc", "t_top", "t_bot", "t_web", "Area", "ur_max")
+# 缺省目标（均越小越好）：钢材面积、梁高、箱室数（腹板 / 制造工作量）、箱宽
+OBJECTIVES = ("Area", "H", "Nc", "B")
+
+
+# =============== 1. 非支配排序 ===============
+def _pareto_mask_2d(objs):
+    """两目标快速路径：字典序排序 + 累积最小值，O(n log n)"""
+    order = np.lexsort((objs[:, 1], objs[:, 0]))
+    a, b = objs[order, 0], objs[order, 1]
+    # 每个 a 值分组的起点；组内第一个点的 b 最小
+    start = np.r_[0, np.nonzero(np.diff(a))[0] + 1]
+    grp = np.repeat(np.arange(start.size), np.diff(np.r_[start, a.size]))
+    # 严格更小的 a 中 b 的最小值
+    cm = np.minimum.accumulate(b)
+    prev = np.r_[np.inf, cm[start[1:] - 1]][grp]
+    keep = (b < prev) & (b == b[start[grp]])
+    mask = np.zeros(a.size, dtype=bool)
+    mask[order[keep]] = True
+    return mask
+
+
+def pareto_mask(objs, block=1024):
+    """
+    求非支配点掩码（各目标均为越小越好，目标值完全相同的点均保留）。
+    objs: (n, k) 数组。两目标走排序 + 累积最小值的快速路径；
+    多目标先按字典序排序——排在后面的点不可能支配前面的点，
+    因此逐块与“已保留前沿 + 块内点”比较即可，内存占用为 O(block × 前沿)。
+    """
+    objs = np.asarray(objs, dtype=float)
+    n = objs.shape[0]
+    mask = np.zeros(n, dtype=bool)
+    if n == 0:
+        return mask
+    if objs.shape[1] == 2:
+        return _pareto_mask_2d(objs)
+    order = np.lexsort(objs.T[::-1])
+    kept = np.empty((0, objs.shape[1]))
+    for s in range(0, n, block):
+        idx = order[s:s + block]
+        P = objs[idx]
+        # 1) 被已保留前沿支配
+        if kept.shape[0]:
+            le = (kept[None, :, :] <= P[:, None, :]).all(axis=2)
+            lt = (kept[None, :, :] < P[:, None, :]).any(axis=2)
+            alive = ~(le & lt).any(axis=1)
+        else:
+            alive = np.ones(idx.size, dtype=bool)
+        # 2) 被块内其它点支配
+        Q = P[alive]
+        le = (Q[None, :, :] <= Q[:, None, :]).all(axis=2)
+        lt = (Q[None, :, :] < Q[:, None, :]).any(axis=2)
+        alive[np.nonzero(alive)[0][(le & lt).any(axis=1)]] = False
+        mask[idx[alive]] = True
+        kept = np.vstack([kept, P[alive]])
+    return mask
+
+
+# =============== 2. 分块工具（sweep.py 的多进程扫描共用） ===============
+def empty_front():
+    return {k: np.empty(0) for k in FRONT_KEYS}
+
+
+def grid_block(axes, start, stop):
+    """按扁平下标 [start, stop) 展开参数格点 axes=(B, H, Nc, t_top, t_bot, t_web) 的一块"""
+    shape = tuple(a.size for a in axes)
+    flat = np.arange(start, stop)
+    return [a[i] for a, i in zip(axes, np.unravel_index(flat, shape))]
+
+
+def feasible_block(axes, start, stop, M_pos, M_neg, V, fy, gamma0):
+    """校核一块格点，只返回 UR_max ≤ 1 的可行解（字段见 FRONT_KEYS）"""
+    B, H, Nc, t_top, t_bot, t_web = grid_block(axes, start, stop)
+    sa = SectionArray.from_inputs(B, H, t_top, t_bot, t_web, Nc, fy, gamma0)
+    ur_max = sa.check_capacity(M_pos, M_neg, V)["ur_max"]
+    ok = ur_max <= 1.0
+    cand = {"B": B, "H": H, "Nc": Nc, "t_top": t_top, "t_bot": t_bot, "t_web": t_web,
+            "Area": sa["Area"], "ur_max": ur_max}
+    return {k: v[ok] for k, v in cand.items()}
+
+
+def merge_front(front, cand, objectives=OBJECTIVES):
+    """把候选并入前沿，返回新的非支配集"""
+    merged = {k: np.concatenate([front[k], cand[k]]) for k in FRONT_KEYS}
+    keep = pareto_mask(np.column_stack([merged[k] for k in objectives]))
+    return {k: v[keep] for k, v in merged.items()}
+
+
+# =============== 3. 流式扫描 ===============
+def iter_pareto_front(B_values, H_values, Nc_values, M_pos, M_neg, V, fy, gamma0,
+                      t_top_values, t_bot_values, t_web_values,
+                      objectives=OBJECTIVES, chunk=65536):
+    """
+    对 (B, H, Nc, t_top, t_bot, t_web) 全组合做分块批量校核，仅保留 UR_max ≤ 1 的可行解，
+    并与当前前沿合并。默认目标为面积、梁高、箱室数与箱宽（OBJECTIVES），前沿中同时给出各点利用率；
+    objectives=("Area", "H") 为只比面积与梁高的两目标前沿（走快速路径，点数少），加入 "ur_max" 则点数会明显增多。
+    每处理完一块 yield 一次：
+        {"front": {字段: 数组}, "done": 已处理数, "total": 总数}
+    全组合按下标在块内展开，任何时刻只持有一块候选与当前前沿。
+    """
+    axes = [np.asarray(a, dtype=float) for a in
+            (B_values, H_values, Nc_values, t_top_values, t_bot_values, t_web_values)]
+    total = int(np.prod([a.size for a in axes]))
+    front = empty_front()
+
+    for start in range(0, total, chunk):
+        stop = min(start + chunk, total)
+        cand = feasible_block(axes, start, stop, M_pos, M_neg, V, fy, gamma0)
+        front = merge_front(front, cand, objectives)
+        yield {"front": front, "done": stop, "total": total}
+
+
+def pareto_front(*args, **kwargs):
+    """一次性求最终前沿（iter_pareto_front 的便捷封装）"""
+    front = empty_front()
+    for step in iter_pareto_front(*args, **kwargs):
+        front = step["front"]
+    return front
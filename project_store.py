@@ -0,0 +1,234 @@
+# -*- coding: utf-8 -*-
+"""
+本地项目库（SQLite，跨会话、跨重启持久）
+
+1. 结果缓存：截面校核、规则法取厚、示意图字节等按“输入哈希”存盘，作为 SectionCache 的第二级
+   （内存未命中 -> 查库 -> 计算并写回）。同一桥梁方案重新打开、或服务重启后直接命中，不再重算 / 重绘。
+   键为量化后输入元组的 SHA-256，另含 CACHE_VERSION 与 CODE_HASH（计算 / 绘图模块源码的哈希）：
+   公式或图面改动后旧结果自动失效，不会从库中取到旧版本的结果。
+2. 方案：按名称保存一组界面输入（及优化得到的厚度），可列出 / 载入 / 删除。
+
+脚本、批处理与服务（STORE）需显式启用：环境变量 BOXGIRDER_STORE 设为库文件路径
+（或 1，使用 ~/.boxgirder/projects.sqlite3）；未设置时不启用，缓存只在内存中（STORE 为 None）。
+Streamlit 界面（app.py / app01.py，经 app_store()）缺省启用 ~/.boxgirder/projects.sqlite3，
+BOXGIRDER_STORE 设为 0 / off / 空字符串时关闭。
+连接在首次使用时才建立（不拖慢冷启动）；每个线程一个连接，WAL 模式允许多个进程同时读写。
+数据库出错（只读、锁超时、磁盘满等）只计数，不影响计算：缓存退化为仅内存。
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+
+CACHE_VERSION = 2
+DEFAULT_PATH = os.path.join(os.path.expanduser("~"), ".boxgirder", "projects.sqlite3")
+# 结果取决于这些模块的源码：任一文件改动即换用新的键空间
+_VERSIONED_SOURCES = ("box_section.py", "section_geometry.py", "stability.py", "catalog.py", "sensitivity.py",
+                      "section_cache.py", "cad_export.py", "drawing.py", "service.py")
+
+
+def _code_hash():
+    h = hashlib.sha256()
+    here = os.path.dirname(os.path.abspath(__file__))
+    for name in _VERSIONED_SOURCES:
+        try:
+            with open(os.path.join(here, name), "rb") as f:
+                h.update(name.encode() + b"\0" + f.read())
+        except OSError:
+            h.update(name.encode() + b"\0missing")
+    return h.hexdigest()[:16]
+
+
+CODE_HASH = _code_hash()
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key     TEXT PRIMARY KEY,
+    kind    TEXT NOT NULL,
+    fmt     TEXT NOT NULL,
+    value   BLOB NOT NULL,
+    created REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_created ON results (created);
+CREATE TABLE IF NOT EXISTS projects (
+    name    TEXT PRIMARY KEY,
+    app     TEXT NOT NULL,
+    inputs  TEXT NOT NULL,
+    updated REAL NOT NULL
+);
+"""
+
+
+# =============== 1. 键与编码 ===============
+def input_hash(key):
+    """量化后输入元组（数值 / 字符串 / None / 元组）的稳定哈希"""
+    return hashlib.sha256(repr((CACHE_VERSION, CODE_HASH, key)).encode("utf-8")).hexdigest()
+
+
+def _encode(value):
+    """bytes 原样存 BLOB；其余（dict / 标量，含 nan）存 JSON"""
+    if isinstance(value, (bytes, bytearray)):
+        return "bytes", bytes(value)
+    return "json", json.dumps(value, ensure_ascii=False)
+
+
+_OFF = ("", "0", "off", "false", "no")
+
+
+def _decode(fmt, value):
+    return bytes(value) if fmt == "bytes" else json.loads(value)
+
+
+# =============== 2. 项目库 ===============
+class ProjectStore:
+    """
+    path:      SQLite 文件路径（目录不存在时自动创建）
+    max_rows:  结果表行数上限；每写入 prune_every 条检查一次，超出时按写入时间删除最旧的
+    """
+
+    def __init__(self, path, max_rows=200_000, prune_every=1000):
+        self.path = path
+        self.max_rows = max_rows
+        self.prune_every = prune_every
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.writes = self.errors = 0
+
+    @classmethod
+    def from_env(cls, default=None):
+        """
+        按环境变量 BOXGIRDER_STORE 创建：路径，或 1 表示缺省路径；0 / off / 空字符串返回 None（不启用）。
+        未设置时按 default（库文件路径，None 表示不启用）。
+        """
+        path = os.environ.get("BOXGIRDER_STORE")
+        if path is None:
+            return None if default is None else cls(default)
+        path = path.strip()
+        if path.lower() in _OFF:
+            return None
+        return cls(DEFAULT_PATH if path == "1" else path)
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            import sqlite3
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def _count(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    # ---- 结果缓存 ----
+    def get(self, key):
+        """按输入元组取缓存值，未命中或出错返回 None"""
+        import sqlite3
+        try:
+            row = self._conn().execute("SELECT fmt, value FROM results WHERE key = ?",
+                                       (input_hash(key),)).fetchone()
+        except (sqlite3.Error, OSError):
+            self._count("errors")
+            return None
+        self._count("hits" if row else "misses")
+        return None if row is None else _decode(*row)
+
+    def put(self, key, value):
+        """写入（覆盖）缓存值；key[0] 为结果类别（如 "check" / "figure"）"""
+        import sqlite3
+        fmt, blob = _encode(value)
+        try:
+            self._conn().execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)",
+                                 (input_hash(key), str(key[0]), fmt, blob, time.time()))
+        except (sqlite3.Error, OSError):
+            self._count("errors")
+            return
+        self._count("writes")
+        if self.writes % self.prune_every == 0:
+            self.prune()
+
+    def prune(self, max_rows=None):
+        """结果表只保留最新的 max_rows 行，返回删除行数"""
+        import sqlite3
+        max_rows = self.max_rows if max_rows is None else max_rows
+        try:
+            cur = self._conn().execute(
+                "DELETE FROM results WHERE key IN (SELECT key FROM results ORDER BY created DESC LIMIT -1 OFFSET ?)",
+                (max_rows,))
+        except (sqlite3.Error, OSError):
+            self._count("errors")
+            return 0
+        return cur.rowcount
+
+    def clear(self, kind=None):
+        """清空结果缓存（kind 给出时只清该类别）；不影响已保存的方案"""
+        if kind is None:
+            self._conn().execute("DELETE FROM results")
+        else:
+            self._conn().execute("DELETE FROM results WHERE kind = ?", (kind,))
+
+    def stats(self):
+        out = {"path": self.path, "hits": self.hits, "misses": self.misses,
+               "writes": self.writes, "errors": self.errors}
+        try:
+            out["rows"] = dict(self._conn().execute("SELECT kind, COUNT(*) FROM results GROUP BY kind").fetchall())
+            out["bytes"] = os.path.getsize(self.path)
+        except Exception:  # 库不可用时只返回计数
+            pass
+        return out
+
+    # ---- 方案 ----
+    def save_project(self, name, inputs, app=""):
+        """保存 / 覆盖一个方案（inputs 为可 JSON 序列化的 dict）"""
+        self._conn().execute("INSERT OR REPLACE INTO projects VALUES (?, ?, ?, ?)",
+                             (name, app, json.dumps(inputs, ensure_ascii=False), time.time()))
+
+    def load_project(self, name):
+        """方案输入 dict，不存在时为 None"""
+        row = self._conn().execute("SELECT inputs FROM projects WHERE name = ?", (name,)).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def list_projects(self, app=None):
+        """[(name, updated 时间戳)]，按更新时间倒序"""
+        sql, args = "SELECT name, updated FROM projects", ()
+        if app is not None:
+            sql, args = sql + " WHERE app = ?", (app,)
+        return self._conn().execute(sql + " ORDER BY updated DESC", args).fetchall()
+
+    def delete_project(self, name):
+        self._conn().execute("DELETE FROM projects WHERE name = ?", (name,))
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+# 全局共享实例（未通过 BOXGIRDER_STORE 启用时为 None）
+STORE = ProjectStore.from_env()
+_APP_STORE = []        # app_store() 的单例（列表作可变容器，None 也只解析一次）
+_APP_LOCK = threading.Lock()
+
+
+def app_store():
+    """
+    Streamlit 界面的项目库：BOXGIRDER_STORE 未设置时缺省启用 DEFAULT_PATH（设为 0 / off / 空字符串关闭）。
+    首次调用时挂到全局 SECTION_CACHE 与 drawing.FIGURE_CACHE 作为第二级缓存；返回 ProjectStore 或 None。
+    """
+    with _APP_LOCK:
+        if not _APP_STORE:
+            store = STORE if STORE is not None else ProjectStore.from_env(default=DEFAULT_PATH)
+            if store is not None:
+                from drawing import FIGURE_CACHE
+                from section_cache import SECTION_CACHE
+                for cache in (SECTION_CACHE, FIGURE_CACHE):
+                    if cache.store is None:
+                        cache.store = store
+            _APP_STORE.append(store)
+        return _APP_STORE[0]
@@ -0,0 +1,323 @@
+# -*- coding: utf-8 -*-
+"""
+Monte Carlo 可靠度分析：截面利用率 ur_max 的失效概率（旧桥加固评估用）
+
+check_capacity 按 fy / gamma0 与确定荷载校核；这里把屈服强度、荷载与板厚（轧制公差、锈蚀损失）
+看作随机变量，抽样后用 batch_check 的向量化截面算法求 ur_max，失效事件为 ur_max > 1。
+
+- 按固定块（chunk 个样本）抽样与校核，统计量在线累积（Chan 合并的均值 / 方差、固定分箱直方图、
+  各控制项计数），内存只与块大小有关：千万级样本也只占几十 MB；
+- 失效概率 pf 的标准误 sqrt(pf (1 - pf) / n) 与变异系数 cov = se / pf 作为收敛估计，
+  每块记录一次 (n, pf, cov) 收敛历程；给出 target_cov 时达到即提前停止；
+- 同一 seed 结果可复现（各块依次从同一 numpy Generator 取数）。
+
+随机变量（variables 字典，缺省见 default_variables）：
+    fy      屈服强度 (MPa)
+    load    荷载效应乘子（M_pos、M_neg、V 共用一个样本，视为同一荷载事件、完全相关）
+    t_tol   板厚公差 (mm，三块板各自独立抽样，加到名义厚度上)
+    t_corr  锈蚀损失 (mm，三块板各自独立抽样，从厚度中扣除)
+评估实际承载力时 gamma0 取 1.0（缺省）；荷载输入视为均值，load 乘子均值取 1。
+
+示例：
+    python reliability.py --B 9500 --H 2000 --t-top 20 --t-bot 18 --t-web 14 --Nc 3 \\
+        --M-pos 15400 --M-neg 32200 --V 5360 -n 10000000 --t-corr 2
+"""
+import argparse
+import math
+import time
+from statistics import NormalDist
+
+import numpy as np
+
+from box_section import batch_check
+
+UR_TERMS = ("ur_top", "ur_bot", "ur_shear")
+_EULER = 0.5772156649015329
+
+
+# =============== 1. 概率分布 ===============
+class Normal:
+    """正态分布（给 cov 时 std = cov · |mean|）"""
+
+    def __init__(self, mean, cov=None, std=None):
+        self.mean = float(mean)
+        self.std = float(std if std is not None else cov * abs(mean))
+
+    def __repr__(self):
+        return f"Normal(mean={self.mean:g}, std={self.std:g})"
+
+    def sample(self, rng, n):
+        return rng.normal(self.mean, self.std, n)
+
+
+class Lognormal:
+    """对数正态分布（按均值与变异系数给定；材料强度、锈蚀量常用）"""
+
+    def __init__(self, mean, cov):
+        self.mean = float(mean)
+        self.cov = float(cov)
+        self.std = self.mean * self.cov
+        self._s = math.sqrt(math.log1p(cov * cov))
+        self._mu = math.log(mean) - self._s * self._s / 2
+
+    def __repr__(self):
+        return f"Lognormal(mean={self.mean:g}, cov={self.cov:g})"
+
+    def sample(self, rng, n):
+        return rng.lognormal(self._mu, self._s, n)
+
+
+class Gumbel:
+    """极值 I 型（最大值）分布（按均值与变异系数给定；可变荷载效应常用）"""
+
+    def __init__(self, mean, cov):
+        self.mean = float(mean)
+        self.cov = float(cov)
+        self.std = self.mean * self.cov
+        self._beta = self.std * math.sqrt(6) / math.pi
+        self._mu = self.mean - _EULER * self._beta
+
+    def __repr__(self):
+        return f"Gumbel(mean={self.mean:g}, cov={self.cov:g})"
+
+    def sample(self, rng, n):
+        return rng.gumbel(self._mu, self._beta, n)
+
+
+class Uniform:
+    """均匀分布 [low, high]"""
+
+    def __init__(self, low, high):
+        self.low, self.high = float(low), float(high)
+        self.mean = (self.low + self.high) / 2
+        self.std = (self.high - self.low) / math.sqrt(12)
+
+    def __repr__(self):
+        return f"Uniform({self.low:g}, {self.high:g})"
+
+    def sample(self, rng, n):
+        return rng.uniform(self.low, self.high, n)
+
+
+class Fixed:
+    """确定值（不抽样，每个样本取同一值）"""
+
+    def __init__(self, value):
+        self.mean = float(value)
+        self.std = 0.0
+
+    def __repr__(self):
+        return f"Fixed({self.mean:g})"
+
+    def sample(self, rng, n):
+        return np.full(n, self.mean)
+
+
+def default_variables(fy=345.0, t_corr=0.0, fy_cov=0.07, load_cov=0.15, t_tol_std=0.3):
+    """
+    缺省随机变量：fy 为标准值（5% 分位），均值取 fy / (1 - 1.645 cov) 的对数正态；
+    荷载乘子为均值 1 的 Gumbel；板厚公差为零均值正态；t_corr > 0 时锈蚀损失为均值 t_corr、cov 0.5 的对数正态。
+    """
+    return {
+        "fy": Lognormal(fy / (1 - 1.645 * fy_cov), fy_cov),
+        "load": Gumbel(1.0, load_cov),
+        "t_tol": Normal(0.0, std=t_tol_std),
+        "t_corr": Lognormal(t_corr, 0.5) if t_corr > 0 else Fixed(0.0),
+    }
+
+
+# =============== 2. 在线统计 ===============
+class RunningStats:
+    """
+    分块在线统计：样本数、均值 / 方差（Chan 合并）、最小 / 最大值、超限计数，
+    以及 [0, hist_max) 的固定分箱直方图（求分位数；超出部分计入末箱之外的溢出计数）。
+    """
+
+    def __init__(self, hist_max=3.0, n_bins=3000):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.n_fail = 0
+        self.edges = np.linspace(0.0, hist_max, n_bins + 1)
+        self.counts = np.zeros(n_bins + 1, dtype=np.int64)   # 末项为溢出 (≥ hist_max)
+
+    def update(self, x, limit=1.0):
+        n_b = x.size
+        if not n_b:
+            return
+        mean_b = float(x.mean())
+        m2_b = float(np.square(x - mean_b).sum())
+        n = self.n + n_b
+        delta = mean_b - self.mean
+        self.mean += delta * n_b / n
+        self.m2 += m2_b + delta * delta * self.n * n_b / n
+        self.n = n
+        self.min = min(self.min, float(x.min()))
+        self.max = max(self.max, float(x.max()))
+        self.n_fail += int(np.count_nonzero(x > limit))
+        n_bins = self.counts.size - 1
+        idx = np.minimum((x * (n_bins / self.edges[-1])).astype(np.int64), n_bins)
+        self.counts += np.bincount(np.maximum(idx, 0), minlength=n_bins + 1)
+
+    @property
+    def std(self):
+        return math.sqrt(self.m2 / (self.n - 1)) if self.n > 1 else 0.0
+
+    def quantile(self, q):
+        """直方图分位数（箱内线性插值，精度为箱宽）；落在溢出区时返回 max"""
+        target = q * self.n
+        cum = np.cumsum(self.counts[:-1])
+        i = int(np.searchsorted(cum, target, side="left"))
+        if i >= cum.size:
+            return self.max
+        lo = cum[i - 1] if i else 0
+        w = self.edges[i + 1] - self.edges[i]
+        frac = (target - lo) / self.counts[i] if self.counts[i] else 0.0
+        return float(self.edges[i] + frac * w)
+
+
+def pf_estimate(n_fail, n):
+    """(pf, 标准误, 变异系数, 可靠指标 β)；无失效样本时 pf = 0，cov / β 为 inf"""
+    if n == 0:
+        return 0.0, 0.0, math.inf, math.inf
+    pf = n_fail / n
+    se = math.sqrt(pf * (1 - pf) / n)
+    if pf == 0.0:
+        return 0.0, 0.0, math.inf, math.inf
+    beta = -NormalDist().inv_cdf(pf) if pf < 1.0 else -math.inf
+    return pf, se, se / pf, beta
+
+
+# =============== 3. 分块抽样 ===============
+def sample_chunk(rng, n, t_top, t_bot, t_web, variables):
+    """一块样本：返回 (fy, 荷载乘子, t_top, t_bot, t_web) 数组（或标量，Fixed 时）"""
+    fy = variables["fy"].sample(rng, n)
+    load = variables["load"].sample(rng, n)
+    t = []
+    for t_nom in (t_top, t_bot, t_web):
+        ti = t_nom + variables["t_tol"].sample(rng, n) - variables["t_corr"].sample(rng, n)
+        t.append(np.maximum(ti, 0.1))
+    return fy, load, t[0], t[1], t[2]
+
+
+def run_reliability(B_box_mm, H_mm, t_top, t_bot, t_web, Nc, M_pos, M_neg, V, gamma0=1.0,
+                    variables=None, n_samples=1_000_000, chunk=1 << 18, seed=0, stability=None,
+                    target_cov=None, min_samples=100_000, progress=None, hist_max=3.0, n_bins=3000):
+    """
+    Monte Carlo 失效概率 P(ur_max > 1)。variables 缺省为 default_variables()（fy = 345）。
+    stability（stability.StabilityRules）给出时局部稳定项一并计入 ur_max。
+    target_cov 给出时，样本数达到 min_samples 且 pf 的变异系数不大于 target_cov 即停止。
+    progress(done, total) 为可选回调，每块调用一次。
+
+    返回 dict：n, n_fail, pf, se, cov, beta（可靠指标）, ur_mean, ur_std, ur_min, ur_max,
+              quantiles（ur_max 的 5% / 50% / 95% / 99% 分位）, governing（失效样本中各控制项占比）,
+              history（每块 (n, pf, cov)）, elapsed, samples_per_sec, converged
+    """
+    variables = {**default_variables(), **(variables or {})}
+    rng = np.random.default_rng(seed)
+    stats = RunningStats(hist_max, n_bins)
+    terms = UR_TERMS
+    if stability is not None:
+        from stability import STAB_KEYS
+        terms += STAB_KEYS
+    gov_counts = np.zeros(len(terms), dtype=np.int64)
+    history = []
+    converged = False
+    t0 = time.perf_counter()
+
+    done = 0
+    while done < n_samples:
+        n = min(chunk, n_samples - done)
+        fy, load, tt, tb, tw = sample_chunk(rng, n, t_top, t_bot, t_web, variables)
+        Mp, Mn, Vk = M_pos * load, M_neg * load, V * load
+        res = batch_check(B_box_mm, H_mm, tt, tb, tw, Nc, fy, gamma0, Mp, Mn, Vk)
+        if stability is not None:
+            stability.fuse(res, B_box_mm, H_mm, tt, tb, tw, Nc, fy, Mp, Mn, Vk)
+        ur = np.broadcast_to(res["ur_max"], (n,))       # 全部变量为确定值时各样本相同，仍按 n 计数
+        stats.update(ur)
+        fail = ur > 1.0
+        if fail.any():
+            stacked = np.stack([np.broadcast_to(res[k], ur.shape)[fail] for k in terms])
+            gov_counts += np.bincount(stacked.argmax(axis=0), minlength=len(terms))
+        done += n
+
+        pf, _, cov, _ = pf_estimate(stats.n_fail, stats.n)
+        history.append((done, pf, cov))
+        if progress is not None:
+            progress(done, n_samples)
+        if target_cov is not None and done >= min_samples and cov <= target_cov:
+            converged = True
+            break
+
+    elapsed = time.perf_counter() - t0
+    pf, se, cov, beta = pf_estimate(stats.n_fail, stats.n)
+    n_fail = max(stats.n_fail, 1)
+    return {
+        "n": stats.n, "n_fail": stats.n_fail, "pf": pf, "se": se, "cov": cov, "beta": beta,
+        "ur_mean": stats.mean, "ur_std": stats.std, "ur_min": stats.min, "ur_max": stats.max,
+        "quantiles": {q: stats.quantile(q) for q in (0.05, 0.5, 0.95, 0.99)},
+        "governing": {k: int(c) / n_fail for k, c in zip(terms, gov_counts)},
+        "history": history,
+        "elapsed": elapsed,
+        "samples_per_sec": stats.n / elapsed if elapsed > 0 else float("inf"),
+        "converged": converged,
+    }
+
+
+# =============== 4. 命令行 ===============
+def main(argv=None):
+    p = argparse.ArgumentParser(description="钢箱梁截面 Monte Carlo 可靠度分析（P[ur_max > 1]）")
+    p.add_argument("--B", type=float, default=9500.0, help="箱宽 B_box (mm)")
+    p.add_argument("--H", type=float, default=2000.0, help="梁高 H (mm)")
+    p.add_argument("--t-top", type=float, default=20.0, help="顶板名义厚 (mm)")
+    p.add_argument("--t-bot", type=float, default=18.0, help="底板名义厚 (mm)")
+    p.add_argument("--t-web", type=float, default=14.0, help="腹板名义厚 (mm)")
+    p.add_argument("--Nc", type=int, default=3, help="箱室数")
+    p.add_argument("--M-pos", type=float, default=15400.0, help="M+ 均值 (kN·m)")
+    p.add_argument("--M-neg", type=float, default=32200.0, help="M- 均值 (kN·m)")
+    p.add_argument("--V", type=float, default=5360.0, help="V 均值 (kN)")
+    p.add_argument("--fy", type=float, default=345.0, help="屈服强度标准值 (MPa)")
+    p.add_argument("--gamma0", type=float, default=1.0, help="抗力分项系数（实际承载力评估取 1.0）")
+    p.add_argument("--fy-cov", type=float, default=0.07)
+    p.add_argument("--load-cov", type=float, default=0.15, help="荷载乘子（Gumbel）变异系数")
+    p.add_argument("--t-tol", type=float, default=0.3, help="板厚公差标准差 (mm)")
+    p.add_argument("--t-corr", type=float, default=0.0, help="锈蚀损失均值 (mm)")
+    p.add_argument("-n", "--samples", type=int, default=1_000_000)
+    p.add_argument("--chunk", type=int, default=1 << 18, help="每块样本数（决定内存占用）")
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--target-cov", type=float, default=None, help="pf 变异系数达到该值即停止")
+    p.add_argument("--stability", action="store_true", help="计入局部稳定（宽厚比 / 腹板剪切屈曲）")
+    args = p.parse_args(argv)
+
+    stability = None
+    if args.stability:
+        from stability import StabilityRules
+        stability = StabilityRules()
+    variables = default_variables(args.fy, args.t_corr, args.fy_cov, args.load_cov, args.t_tol)
+    res = run_reliability(args.B, args.H, args.t_top, args.t_bot, args.t_web, args.Nc,
+                          args.M_pos, args.M_neg, args.V, args.gamma0, variables, args.samples, args.chunk,
+                          args.seed, stability, args.target_cov)
+
+    print("随机变量：" + "，".join(f"{k}={v!r}" for k, v in variables.items()))
+    print(f"样本 {res['n']:,}  耗时 {res['elapsed']:.2f} s（{res['samples_per_sec']:,.0f} 样本/秒）"
+          + ("  已收敛" if res["converged"] else ""))
+    print(f"ur_max：均值 {res['ur_mean']:.4f}  标准差 {res['ur_std']:.4f}  "
+          f"范围 [{res['ur_min']:.4f}, {res['ur_max']:.4f}]  "
+          + "  ".join(f"{q:.0%} 分位 {v:.4f}" for q, v in res["quantiles"].items()))
+    if res["n_fail"]:
+        print(f"失效概率 pf = {res['pf']:.3e}  (标准误 {res['se']:.2e}，变异系数 {res['cov']:.3f})  "
+              f"可靠指标 β = {res['beta']:.3f}")
+        print("失效样本控制项：" + "  ".join(f"{k} {v:.1%}" for k, v in res["governing"].items() if v))
+    else:
+        print(f"无失效样本：pf < {3 / res['n']:.1e}（95% 置信上界，三倍法则）")
+    print("收敛历程（样本数 / pf / 变异系数）：")
+    hist = res["history"]
+    for i in np.unique(np.linspace(0, len(hist) - 1, 11).astype(int)):
+        n, pf, cov = hist[i]
+        print(f"  {n:>12,}  {pf:.4e}  {cov:.3f}")
+
+
+if __name__ == "__main__":
+    main()
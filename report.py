@@ -0,0 +1,425 @@
+# -*- coding: utf-8 -*-
+"""
+多页 PDF 计算书：每个截面一页（二维工程图 + 截面参数 / 属性表 + 利用率汇总）
+
+输入与 batch_cli 相同（CSV / JSON / JSON Lines），通常直接用 batch_cli 的输出文件：
+    必填列：B_box, H (m), M_pos, M_neg, V；厚度列 t_top, t_bot, t_web (mm) 与 Nc 缺失时按规则法初选（batch_cli.size_chunk）
+    可选列：B_deck (m，缺省 B_box)、fy、gamma0、out_top、out_bot、e_web (mm)、name / id（页眉名称）、status
+    厚度为空 / NaN、或 status 为 beyond_catalog / infeasible 等未定截面的行输出“未定截面”页（不画图、不校核），
+    不中断整份计算书。
+
+流程（流式，内存只与在途页数有关）：
+1. 主进程按块读入行，向量化校核（batch_check，可选 stability.StabilityRules）得到每页数据；
+2. 各块分发到工作进程栅格化：每个进程只建一次 A4 页面模板（Figure + 坐标轴 + 文字），逐页只更新内容，
+   像素按 PNG Up 预测 + zlib 压缩后返回；
+3. 主进程按页序把压缩图像直接写成 PDF 图像页（PdfWriter：页对象写完即落盘，最后写页树与交叉引用表），
+   在途块数不超过 2 × 进程数，不在内存中保留全部图形。
+
+页面文字使用英文 / 符号（默认字体无中文字形，与 drawing 的图面一致）。
+
+示例：
+    python batch_cli.py cases.csv -o sized.csv --method optimize
+    python report.py sized.csv -o calc_book.pdf --workers 4 --stability
+"""
+import argparse
+import os
+import sys
+import time
+import zlib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import numpy as np
+
+from box_section import batch_check
+from batch_cli import DEFAULTS, iter_rows, size_chunk
+from section_geometry import U_RIB_BOTTOM, U_RIB_DECK
+
+A4_PT = (595.28, 841.89)          # A4 纵向 (pt)
+A4_IN = (8.27, 11.69)
+GEOM_DEFAULTS = {"out_top": 145.0, "out_bot": 60.0, "e_web": 60.0}   # 与 app.py 侧边栏默认值一致
+UR_KEYS = ("ur_top", "ur_bot", "ur_shear")
+OK_STATUS = ("", "rules", "optimized")   # batch_cli 的 status 列：其余（beyond_catalog、infeasible 等）为未定截面
+UR_LABELS = {"ur_top": "top flange σ", "ur_bot": "bottom flange σ", "ur_shear": "web τ",
+             "ur_bt_top": "top b/t", "ur_bt_bot": "bottom b/t", "ur_buckle": "web shear buckling"}
+
+
+# =============== 1. 流式 PDF 写出 ===============
+def _pdf_text(s):
+    """PDF 文本串（UTF-16BE 十六进制，支持中文标题）"""
+    return "<FEFF" + s.encode("utf-16-be").hex().upper() + ">"
+
+
+class PdfWriter:
+    """
+    最小 PDF 1.4 写出器：每页一幅 Flate 压缩的 RGB 图像（可带 PNG 预测器），铺满页面。
+    页对象写完即落盘（f 可为不可 seek 的二进制流），close 时补写页树、目录、交叉引用表。
+    """
+
+    def __init__(self, f, title=None, page_size=A4_PT):
+        self.f = f
+        self.page_size = page_size
+        self._pos = 0
+        self._offsets = {}
+        self._pages = []
+        self._next = 4           # 1 目录，2 页树，3 文档信息
+        self._write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        self.title = title
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return len(self._pages)
+
+    @property
+    def bytes_written(self):
+        return self._pos
+
+    def _write(self, data):
+        self.f.write(data)
+        self._pos += len(data)
+
+    def _obj(self, num, body, stream=None):
+        self._offsets[num] = self._pos
+        if stream is None:
+            self._write(b"%d 0 obj\n%s\nendobj\n" % (num, body))
+        else:
+            self._write(b"%d 0 obj\n<< %s /Length %d >>\nstream\n" % (num, body, len(stream)))
+            self._write(stream)
+            self._write(b"\nendstream\nendobj\n")
+
+    def add_image_page(self, width, height, data, predictor=True):
+        """追加一页：data 为 zlib 压缩的 8 位 RGB 像素（predictor=True 时每行前带 PNG 过滤类型字节）"""
+        img, content, page = self._next, self._next + 1, self._next + 2
+        self._next += 3
+        parms = b" /DecodeParms << /Predictor 15 /Colors 3 /BitsPerComponent 8 /Columns %d >>" % width \
+            if predictor else b""
+        self._obj(img, b"/Type /XObject /Subtype /Image /Width %d /Height %d /ColorSpace /DeviceRGB "
+                       b"/BitsPerComponent 8 /Filter /FlateDecode%s" % (width, height, parms), data)
+        w, h = self.page_size
+        self._obj(content, b"", b"q %.2f 0 0 %.2f 0 0 cm /Im0 Do Q" % (w, h))
+        self._obj(page, b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %.2f %.2f] "
+                        b"/Resources << /XObject << /Im0 %d 0 R >> >> /Contents %d 0 R >>" % (w, h, img, content))
+        self._pages.append(page)
+
+    def close(self):
+        if self.f is None:
+            return
+        kids = b" ".join(b"%d 0 R" % p for p in self._pages)
+        self._obj(2, b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(self._pages)))
+        self._obj(1, b"<< /Type /Catalog /Pages 2 0 R >>")
+        info = "/Producer (box girder report)"
+        if self.title:
+            info += " /Title " + _pdf_text(self.title)
+        self._obj(3, b"<< " + info.encode("ascii") + b" >>")
+        xref = self._pos
+        n = self._next
+        lines = [b"xref\n0 %d\n0000000000 65535 f \n" % n]
+        lines += [b"%010d 00000 n \n" % self._offsets[i] for i in range(1, n)]
+        self._write(b"".join(lines))
+        self._write(b"trailer\n<< /Size %d /Root 1 0 R /Info 3 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (n, xref))
+        self.f = None
+
+
+def encode_rgb(rgb, level=3):
+    """(h, w, 3) uint8 -> 每行 PNG Up 过滤后 zlib 压缩（配合 /Predictor 15 解码）；线稿页比直接压缩小数倍"""
+    h, w, _ = rgb.shape
+    rows = np.ascontiguousarray(rgb).reshape(h, w * 3)
+    out = np.empty((h, w * 3 + 1), dtype=np.uint8)
+    out[:, 0] = 2                                   # PNG 过滤类型 2：Up
+    out[0, 1:] = rows[0]
+    np.subtract(rows[1:], rows[:-1], out=out[1:, 1:])   # uint8 按 256 取模
+    return zlib.compress(out, level)
+
+
+# =============== 2. 页面模板（工作进程内） ===============
+_TEMPLATE = None
+
+
+class PageTemplate:
+    """
+    A4 页面：标题、二维工程图、参数 / 属性表、利用率条形图、页脚。
+    静态部分（表头、单位、坐标轴、刻度）只栅格化一次存为底图，各页恢复底图后只重绘变化的图元（blit），
+    文字渲染量约为整页重绘的一半以下。利用率轴固定为 0 ~ UR_AXIS，超出的条形截断，数值照常标注。
+    """
+
+    TABLE = (("B_box", "mm", "{:.0f}"), ("H", "mm", "{:.0f}"), ("Nc", "", "{:.0f}"),
+             ("t_top", "mm", "{:g}"), ("t_bot", "mm", "{:g}"), ("t_web", "mm", "{:g}"),
+             ("fy", "MPa", "{:g}"), ("γ0", "", "{:g}"),
+             ("M+", "kN·m", "{:,.0f}"), ("M−", "kN·m", "{:,.0f}"), ("V", "kN", "{:,.0f}"),
+             ("Area", "cm²", "{:,.1f}"), ("y_c", "mm", "{:.1f}"), ("Ixx", "m⁴", "{:.4f}"),
+             ("W_top", "m³", "{:.4f}"), ("W_bot", "m³", "{:.4f}"), ("fd", "MPa", "{:.1f}"))
+    UR_AXIS = 1.5
+
+    def __init__(self, dpi, ur_keys, title=""):
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        self.ur_keys = ur_keys
+        self.fig = fig = Figure(figsize=A4_IN, dpi=dpi)
+        self.canvas = FigureCanvasAgg(fig)
+        fig.text(0.07, 0.965, title, fontsize=10, color="0.35")
+        self.head = fig.text(0.07, 0.94, "", fontsize=15, weight="bold")
+        self.verdict = fig.text(0.93, 0.94, "", fontsize=15, weight="bold", ha="right")
+        self.foot = fig.text(0.5, 0.025, "", fontsize=9, ha="center", color="0.35")
+        fig.add_artist(_hline(fig, 0.928))
+        self.ax_cad = fig.add_axes((0.03, 0.56, 0.94, 0.36))
+
+        # 参数 / 属性表（名称、单位为静态，数值逐页 set_text）
+        ax_tab = fig.add_axes((0.07, 0.07, 0.40, 0.45))
+        ax_tab.axis("off")
+        ax_tab.text(0.0, 1.0, "Section data", fontsize=11, weight="bold", va="top")
+        n = len(self.TABLE)
+        self.cells = []
+        for i, (name, unit, _) in enumerate(self.TABLE):
+            y = 0.93 - i * 0.9 / n
+            ax_tab.text(0.0, y, name, fontsize=9.5, va="top")
+            self.cells.append(ax_tab.text(0.72, y, "", fontsize=9.5, va="top", ha="right"))
+            ax_tab.text(0.76, y, unit, fontsize=9.5, va="top", color="0.35")
+
+        # 利用率条形图
+        ax = self.ax_ur = fig.add_axes((0.60, 0.12, 0.34, 0.38))
+        k = len(ur_keys)
+        y = np.arange(k)[::-1]
+        self.bars = list(ax.barh(y, np.zeros(k), height=0.6))
+        self.labels = [ax.text(0, yi, "", va="center", fontsize=9) for yi in y]
+        ax.axvline(1.0, color="crimson", lw=1.2, ls="--")
+        ax.set_xlim(0, self.UR_AXIS)
+        ax.set_ylim(-0.6, k - 0.4)
+        ax.set_yticks(y, [UR_LABELS.get(key, key) for key in ur_keys], fontsize=9)
+        ax.set_title("Utilization (UR ≤ 1.0)", fontsize=11, weight="bold", loc="left")
+        ax.spines[["top", "right"]].set_visible(False)
+        self.ur_text = fig.text(0.60, 0.07, "", fontsize=10)
+
+        self.dynamic = [self.head, self.verdict, self.foot, self.ur_text, self.ax_cad,
+                        *self.cells, *self.bars, *self.labels]
+        for a in self.dynamic:
+            a.set_animated(True)
+        self.canvas.draw()
+        self._background = self.canvas.copy_from_bbox(fig.bbox)
+
+    def render(self, page):
+        """绘制一页，返回 (宽, 高, 压缩像素)"""
+        from drawing import draw_section_cad
+
+        self.head.set_text(page["name"])
+        sized = page["geom"] is not None
+        ok = sized and page["ur_max"] <= 1.0
+        self.verdict.set_text("OK" if ok else "NOT OK" if sized else "NOT SIZED")
+        self.verdict.set_color("seagreen" if ok else "crimson")
+        self.foot.set_text(f"Page {page['page']}")
+
+        ax = self.ax_cad
+        for a in (*ax.patches, *ax.collections, *ax.texts):
+            a.remove()
+        if sized:
+            draw_section_cad(**page["geom"], ax=ax)
+        else:
+            ax.axis("off")
+            ax.set_aspect("auto")
+            ax.set_xlim(0, 1)
+            ax.set_ylim(0, 1)
+            ax.text(0.5, 0.5, f"No section drawn: status = {page['status'] or 'invalid thickness'}\n"
+                              "(no feasible / catalog plate thickness; section not checked)",
+                    ha="center", va="center", fontsize=12, color="crimson")
+
+        for cell, (_, _, fmt), v in zip(self.cells, self.TABLE, page["table"]):
+            cell.set_text("—" if np.isnan(v) else fmt.format(v))
+
+        urs = [page[k] for k in self.ur_keys]
+        for bar, label, ur in zip(self.bars, self.labels, urs):
+            w = 0.0 if np.isnan(ur) else min(ur, self.UR_AXIS)
+            bar.set_width(w)
+            bar.set_color("seagreen" if ur <= 1.0 else "crimson")
+            label.set_x(w + 0.02)
+            label.set_text("—" if np.isnan(ur) else f"{ur:.3f}")
+        if sized:
+            gov = self.ur_keys[int(np.argmax(urs))]
+            self.ur_text.set_text(f"UR_max = {page['ur_max']:.3f}   governing: {UR_LABELS.get(gov, gov)}")
+        else:
+            self.ur_text.set_text("UR_max = —")
+
+        self.canvas.restore_region(self._background)
+        for a in self.dynamic:
+            self.fig.draw_artist(a)
+        rgba = np.asarray(self.canvas.buffer_rgba())
+        h, w = rgba.shape[:2]
+        return w, h, encode_rgb(rgba[..., :3])
+
+
+def _hline(fig, y):
+    from matplotlib.lines import Line2D
+    return Line2D((0.07, 0.93), (y, y), transform=fig.transFigure, color="0.6", lw=0.8)
+
+
+def _render_chunk(pages, dpi, ur_keys, title):
+    """工作进程入口：一块页面 -> [(宽, 高, 压缩像素), ...]；页面模板每进程只建一次"""
+    global _TEMPLATE
+    spec = (dpi, ur_keys, title)
+    if _TEMPLATE is None or _TEMPLATE[0] != spec:
+        _TEMPLATE = (spec, PageTemplate(dpi, ur_keys, title))
+    tpl = _TEMPLATE[1]
+    return [tpl.render(p) for p in pages]
+
+
+# =============== 3. 页面数据（主进程，向量化） ===============
+def _col(rows, key, default):
+    return np.array([float(r[key]) if r.get(key) not in (None, "") else default for r in rows])
+
+
+def page_data(rows, first_page=1, stability=None, top_ribs=None, bot_ribs=None):
+    """
+    一块输入行 -> 每页数据 dict 列表（厚度缺失的行先按规则法初选）。
+    top_ribs / bot_ribs 为图上画的 U 肋；给出 stability 时取其肋（宽厚比按图上的肋校核）。
+    """
+    if stability is not None:
+        top_ribs, bot_ribs = stability.top_ribs, stability.bot_ribs
+    # 只对未给出结论的行初选；beyond_catalog / infeasible 等行保持未定截面，不再按无目录规则法重算
+    need = [i for i, r in enumerate(rows) if str(r.get("status") or "") in OK_STATUS
+            and any(r.get(k) in (None, "") for k in ("t_top", "t_bot", "t_web", "Nc"))]
+    if need:
+        rows = list(rows)
+        sized = size_chunk([{"B_deck": rows[i].get("B_box"), **rows[i]} for i in need])
+        for i, s in zip(need, sized):
+            rows[i] = {**rows[i], **s}
+    B = _col(rows, "B_box", np.nan) * 1000
+    H = _col(rows, "H", np.nan) * 1000
+    tt, tb, tw, nc = (_col(rows, k, np.nan) for k in ("t_top", "t_bot", "t_web", "Nc"))
+    fy, g0 = _col(rows, "fy", DEFAULTS["fy"]), _col(rows, "gamma0", DEFAULTS["gamma0"])
+    Mp, Mn, V = (_col(rows, k, 0.0) for k in ("M_pos", "M_neg", "V"))
+    if np.isnan(B).any() or np.isnan(H).any():
+        raise ValueError("输入缺少 B_box 或 H 列")
+    status = [str(r.get("status") or "") for r in rows]
+    bad = (np.isnan(tt) | np.isnan(tb) | np.isnan(tw) | np.isnan(nc) | (B <= 0) | (H <= 0)
+           | np.array([st not in OK_STATUS for st in status]))
+    nc_in, nc = nc, np.where(bad, 1.0, nc)   # 未定截面只占位计算，结果下面整体置 NaN
+    res = batch_check(B, H, tt, tb, tw, nc, fy, g0, Mp, Mn, V)
+    extra = {k: _col(rows, k, v) for k, v in GEOM_DEFAULTS.items()}
+    if stability is not None:
+        stability.fuse(res, B, H, tt, tb, tw, nc, fy, Mp, Mn, V)
+    res = {k: np.where(bad, np.nan, v) for k, v in res.items()}
+    nc = nc_in
+    B_deck = _col(rows, "B_deck", np.nan)
+    B_deck = np.where(np.isnan(B_deck), B / 1000, B_deck)
+
+    pages = []
+    for i, r in enumerate(rows):
+        name = r.get("name") or r.get("id") or f"Section {first_page + i}"
+        pages.append({
+            "page": first_page + i,
+            "name": str(name),
+            "status": status[i],
+            "geom": None if bad[i] else dict(B_deck=float(B_deck[i]), B_box_mm=float(B[i]), H_mm=float(H[i]),
+                         t_top=float(tt[i]), t_bot=float(tb[i]), t_web=float(tw[i]), Nc=int(nc[i]),
+                         out_top=float(extra["out_top"][i]), out_bot=float(extra["out_bot"][i]),
+                         e_web=float(extra["e_web"][i]), top_ribs=top_ribs, bot_ribs=bot_ribs),
+            "table": (B[i], H[i], nc[i], tt[i], tb[i], tw[i], fy[i], g0[i], Mp[i], Mn[i], V[i],
+                      res["Area"][i] / 100, res["y_c"][i], res["Ixx"][i] * 1e-12,
+                      res["W_top"][i] * 1e-9, res["W_bot"][i] * 1e-9, fy[i] / g0[i]),
+            **{k: float(np.broadcast_to(res[k], B.shape)[i]) for k in res if k.startswith("ur_")},
+        })
+    return pages
+
+
+# =============== 4. 生成计算书 ===============
+def build_report(rows, out, title="Steel box girder calculation book", dpi=110, workers=None, chunk=8,
+                 stability=None, progress=None, top_ribs=None, bot_ribs=None):
+    """
+    rows（dict 可迭代对象，流式消费）-> PDF 写入 out（路径或二进制流）。
+    top_ribs / bot_ribs 为图上画的 U 肋（给出 stability 时以其肋为准，图与校核一致）。
+    workers=1 时在本进程内顺序绘制；chunk 为每次分发给工作进程的页数。
+    progress(done, None) 为可选回调，每写完一块调用一次（总页数事先未知）。
+    返回 dict：n_pages, unsized（未定截面页的页码与名称列表）, elapsed, pages_per_sec, bytes, n_workers
+    """
+    ur_keys = UR_KEYS
+    if stability is not None:
+        from stability import STAB_KEYS
+        ur_keys += STAB_KEYS
+    n_workers = workers or os.cpu_count() or 1
+    rows = iter(rows)
+    unsized = []
+    t0 = time.perf_counter()
+
+    def blocks():
+        page = 1
+        while True:
+            block = list(islice(rows, chunk))
+            if not block:
+                return
+            pages = page_data(block, page, stability, top_ribs, bot_ribs)
+            unsized.extend((p["page"], p["name"]) for p in pages if p["geom"] is None)
+            yield pages
+            page += len(block)
+
+    f = open(out, "wb") if isinstance(out, (str, os.PathLike)) else out
+    try:
+        with PdfWriter(f, title) as pdf:
+            def write(rendered):
+                for w, h, data in rendered:
+                    pdf.add_image_page(w, h, data)
+                if progress is not None:
+                    progress(len(pdf), None)
+
+            if n_workers == 1:
+                for pages in blocks():
+                    write(_render_chunk(pages, dpi, ur_keys, title))
+            else:
+                with ProcessPoolExecutor(max_workers=n_workers) as pool:
+                    pending = deque()
+                    for pages in blocks():
+                        pending.append(pool.submit(_render_chunk, pages, dpi, ur_keys, title))
+                        if len(pending) >= 2 * n_workers:
+                            write(pending.popleft().result())
+                    while pending:
+                        write(pending.popleft().result())
+            n_pages = len(pdf)
+        size = pdf.bytes_written
+    finally:
+        if f is not out:
+            f.close()
+
+    elapsed = time.perf_counter() - t0
+    return {"n_pages": n_pages, "unsized": unsized, "elapsed": elapsed,
+            "pages_per_sec": n_pages / elapsed if elapsed > 0 else float("inf"),
+            "bytes": size, "n_workers": n_workers}
+
+
+# =============== 5. 命令行 ===============
+def main(argv=None):
+    p = argparse.ArgumentParser(description="钢箱梁截面计算书（多页 PDF，多进程绘制）")
+    p.add_argument("input", help="截面文件 (.csv / .json / .jsonl，通常为 batch_cli 的输出)，'-' 表示标准输入 CSV")
+    p.add_argument("-o", "--output", default="calc_book.pdf", help="输出 PDF")
+    p.add_argument("--title", default="Steel box girder calculation book", help="页眉标题")
+    p.add_argument("--dpi", type=int, default=110, help="页面栅格分辨率")
+    p.add_argument("--workers", type=int, default=None, help="绘制进程数（缺省为 CPU 数）")
+    p.add_argument("--chunk", type=int, default=8, help="每次分发的页数")
+    p.add_argument("--stability", action="store_true", help="计入局部稳定（宽厚比 / 腹板剪切屈曲）")
+    p.add_argument("--rib-top", type=float, default=U_RIB_DECK[0], help="顶板 U 肋间距 (mm，0 不设)")
+    p.add_argument("--rib-bot", type=float, default=U_RIB_BOTTOM[0], help="底板 U 肋间距 (mm，0 不设)")
+    args = p.parse_args(argv)
+
+    # 图上画的肋与局部稳定校核用的肋为同一组
+    top_ribs = (args.rib_top,) + U_RIB_DECK[1:] if args.rib_top > 0 else None
+    bot_ribs = (args.rib_bot,) + U_RIB_BOTTOM[1:] if args.rib_bot > 0 else None
+    stability = None
+    if args.stability:
+        from stability import StabilityRules
+        stability = StabilityRules(e_web=GEOM_DEFAULTS["e_web"], top_ribs=top_ribs, bot_ribs=bot_ribs)
+    res = build_report(iter_rows(args.input), args.output, args.title, args.dpi, args.workers, args.chunk,
+                       stability, top_ribs=top_ribs, bot_ribs=bot_ribs)
+    print(f"已生成 {args.output}：{res['n_pages']} 页，{res['bytes'] / 1e6:.1f} MB，"
+          f"{res['n_workers']} 进程，耗时 {res['elapsed']:.1f} s（{res['pages_per_sec']:.1f} 页/秒）",
+          file=sys.stderr)
+    if res["unsized"]:
+        names = "、".join(name for _, name in res["unsized"][:10])
+        print(f"警告：{len(res['unsized'])} 个截面未定（厚度缺失 / 超出目录 / 不可行），仅输出说明页：{names}"
+              + (" …" if len(res["unsized"]) > 10 else ""), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
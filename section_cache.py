@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+"""
+截面计算结果缓存（进程级，所有会话共享）
+
+键为“量化后的输入元组”：数值按有效数字取整，消除 m→mm 换算、滑块等带来的浮点噪声，
+近似相同的请求直接命中；计算也使用量化后的输入，保证结果只由键决定。
+容量有界，按 LRU 淘汰；线程安全（Streamlit 各会话运行在不同线程中）。
+可挂接 project_store.ProjectStore 作为第二级持久缓存（跨会话、跨重启），内存未命中时先查库再计算。
+"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from box_section import SectionRecord, size_by_rules
+from catalog import PlateCatalog
+from project_store import STORE
+
+
+# =============== 1. LRU 缓存 ===============
+def quantize(x, digits=9):
+    """数值按 digits 位有效数字取整；其它类型原样返回（元组/列表逐项处理）"""
+    if isinstance(x, (bool, str)) or x is None:
+        return x
+    if isinstance(x, (int, float, np.number)):
+        return float(f"{float(x):.{digits}g}")
+    if isinstance(x, (tuple, list)):
+        return tuple(quantize(v, digits) for v in x)
+    return x
+
+
+class SectionCache:
+    """线程安全的有界 LRU 缓存，带命中/未命中计数；store 为可选的持久化第二级（ProjectStore）"""
+
+    def __init__(self, maxsize=4096, digits=9, store=None):
+        self.maxsize = maxsize
+        self.digits = digits
+        self.store = store
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def key(self, name, *args):
+        return (name,) + tuple(quantize(a, self.digits) for a in args)
+
+    def get(self, key):
+        """查缓存（内存 -> 持久库，库命中时回填内存），未命中返回 None；供批量接口先分出未命中项"""
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+        value = None if self.store is None else self.store.get(key)
+        if value is not None:
+            self._insert(key, value)
+        return value
+
+    def put(self, key, value):
+        """写入（内存与持久库）；供批量计算后逐条回填"""
+        if self.store is not None:
+            self.store.put(key, value)
+        self._insert(key, value)
+
+    def _insert(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(self, key, compute):
+        """命中则返回缓存值，否则（持久库未命中时）调用 compute() 并写入（查库与计算在锁外进行）"""
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+        value = None if self.store is None else self.store.get(key)
+        if value is None:
+            value = compute()
+            if self.store is not None:
+                self.store.put(key, value)
+        self._insert(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            out = {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
+        if self.store is not None:
+            out["store"] = self.store.stats()
+        return out
+
+
+# 全局共享实例（持久库见 project_store.STORE）
+SECTION_CACHE = SectionCache(store=STORE)
+
+
+# =============== 2. 带缓存的计算入口 ===============
+def check_section(B_box_mm, H_mm, t_top, t_bot, t_web, Nc, fy, gamma0, M_pos, M_neg, V,
+                  cache=SECTION_CACHE):
+    """
+    截面属性 + 强度校核（SectionRecord.check_capacity，与 BoxGirderSection 结果一致）。
+    返回 dict：ur_top, ur_bot, ur_shear, ur_max, Area, y_c, Ixx, W_top, W_bot, fd
+    """
+    key = cache.key("check", B_box_mm, H_mm, t_top, t_bot, t_web, Nc, fy, gamma0, M_pos, M_neg, V)
+
+    def compute():
+        B, Hm, tt, tb, tw, n, f, g, Mp, Mn, Vk = key[1:]
+        s = SectionRecord(B, Hm, tt, tb, tw, int(n), f, g)
+        res = s.check_capacity(Mp, Mn, Vk)
+        res.update(Area=s.Area, y_c=s.y_c, Ixx=s.Ixx, W_top=s.W_top, W_bot=s.W_bot, fd=s.fd)
+        return res
+
+    return dict(cache.get_or_compute(key, compute))
+
+
+def rules_thickness(M_pos, M_neg, V, B_box, H, fy, gamma0, eta_beff, Nc,
+                    t_corr, t_top_min, t_bot_min, t_web_min, round_step, grade=None, cache=SECTION_CACHE):
+    """规则法初选（box_section.size_by_rules），结果转为 Python 标量；grade 给出时厚度取该钢种目录档位"""
+    key = cache.key("rules", M_pos, M_neg, V, B_box, H, fy, gamma0, eta_beff, Nc,
+                    t_corr, t_top_min, t_bot_min, t_web_min, round_step, grade)
+
+    def compute():
+        args = list(key[1:-1])
+        args[8] = int(args[8])
+        catalog = None if grade is None else PlateCatalog.from_grade(grade)
+        return {k: np.asarray(v).item() for k, v in size_by_rules(*args, catalog=catalog).items()}
+
+    return dict(cache.get_or_compute(key, compute))
@@ -0,0 +1,281 @@
+# -*- coding: utf-8 -*-
+"""
+截面公式的解析灵敏度（前向自动微分）与梯度引导的连续优化
+
+1. 灵敏度：截面属性与利用率的公式均为闭式，这里用前向模式自动微分（对偶数，值与 5 个方向导数同步传播）
+   求 Area / W_top / W_bot / ur_* 对 B、H、t_top、t_bot、t_web 的偏导（每 mm），标量或数组均可。
+   取值部分与 batch_properties / batch_ur 运算顺序相同。
+2. gradient_optimize：先在连续厚度上求最小面积截面——腹板厚由剪切闭式求出，顶/底板对起作用的
+   弯曲约束（ur_top、ur_bot = 1）做牛顿迭代（对 1/ur 线性化，抗弯模量近似随板厚线性变化，通常 2~4 步收敛），
+   再取整：连续解附近的少量格点（或钢板目录档位）一次向量化校核取最优，逐板补足不满足的约束，
+   最后做逐板降档 / 板间换档的局部改进。平均约 15 次截面校核（格点全搜索为上万次），
+   随机工况下约 99% 与 grid_optimize 的离散最优相同，其余面积略大（腹板远厚于剪切所需的离散解）；
+   grid_optimize 仍是精确全局解，两者可互相校验。
+"""
+import numpy as np
+
+from box_section import _plate_ur
+from optrace import CONVERGED, INFEASIBLE, NEWTON, POLISH, ROUND
+
+# 求导方向（偏导数组第 0 维的顺序）
+SENS_VARS = ("B", "H", "t_top", "t_bot", "t_web")
+SENS_KEYS = ("Area", "y_c", "Ixx", "W_top", "W_bot", "ur_top", "ur_bot", "ur_shear", "ur_max")
+
+
+# =============== 1. 前向自动微分 ===============
+class _Dual:
+    """对偶数：v 为值，d 为偏导（第 0 维对应 SENS_VARS）"""
+    __slots__ = ("v", "d")
+    __array_ufunc__ = None   # 与 ndarray 运算时由 numpy 交还给本类的反射运算
+
+    def __init__(self, v, d):
+        self.v, self.d = v, d
+
+    def __add__(self, o):
+        if isinstance(o, _Dual):
+            return _Dual(self.v + o.v, self.d + o.d)
+        return _Dual(self.v + o, self.d)
+
+    __radd__ = __add__
+
+    def __sub__(self, o):
+        if isinstance(o, _Dual):
+            return _Dual(self.v - o.v, self.d - o.d)
+        return _Dual(self.v - o, self.d)
+
+    def __rsub__(self, o):
+        return _Dual(o - self.v, -self.d)
+
+    def __mul__(self, o):
+        if isinstance(o, _Dual):
+            return _Dual(self.v * o.v, self.d * o.v + self.v * o.d)
+        return _Dual(self.v * o, self.d * o)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, o):
+        if isinstance(o, _Dual):
+            return _Dual(self.v / o.v, (self.d * o.v - self.v * o.d) / (o.v * o.v))
+        return _Dual(self.v / o, self.d / o)
+
+    def __rtruediv__(self, o):
+        return _Dual(o / self.v, -o * self.d / (self.v * self.v))
+
+
+def _where(cond, a, b):
+    """逐元素选择（a、b 为对偶数或常数）；导数随所选分支"""
+    av, ad = (a.v, a.d) if isinstance(a, _Dual) else (a, 0.0)
+    bv, bd = (b.v, b.d) if isinstance(b, _Dual) else (b, 0.0)
+    return _Dual(np.where(cond, av, bv), np.where(cond, ad, bd))
+
+
+def _maximum(a, b):
+    return _where(a.v >= b.v, a, b)
+
+
+def _seed(B, H, t_top, t_bot, t_web):
+    """五个自变量各自的单位方向导数"""
+    vals = np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (B, H, t_top, t_bot, t_web)))
+    eye = np.eye(len(SENS_VARS)).reshape((len(SENS_VARS), len(SENS_VARS)) + (1,) * vals[0].ndim)
+    return [_Dual(v, eye[i] * np.ones_like(v)) for i, v in enumerate(vals)]
+
+
+def section_sensitivity(B, H, t_top, t_bot, t_web, Nc, fy, gamma0, M_pos_kN, M_neg_kN, V_kN):
+    """
+    截面属性与利用率及其对 SENS_VARS 的偏导。
+    返回 dict：键同 SENS_KEYS 为值；"d_<键>" 为偏导数组（第 0 维按 SENS_VARS，其余维同输入广播形状）。
+    ur_max 的偏导取控制项（ur_top / ur_bot / ur_shear 中最大者）的偏导；剪切 h_w、分段（净高为 0、
+    面积为 0、W 取 1e9）处与 batch_properties 取相同分支。
+    """
+    B, H, t_top, t_bot, t_web = _seed(B, H, t_top, t_bot, t_web)
+    n_webs = np.asarray(Nc, dtype=float) + 1
+
+    A_top = B * t_top
+    y_top = H - t_top / 2
+    A_bot = B * t_bot
+    y_bot = t_bot / 2
+    h = H - t_top - t_bot
+    h_web_net = _where(h.v > 0, h, 0.0)
+    A_webs = n_webs * t_web * h_web_net
+    y_webs = t_bot + h_web_net / 2
+
+    Area = A_top + A_bot + A_webs
+    Area = _where(Area.v <= 0, 1.0, Area)
+    y_c = (A_top * y_top + A_bot * y_bot + A_webs * y_webs) / Area
+
+    d_top = y_top - y_c
+    d_bot = y_bot - y_c
+    d_webs = y_webs - y_c
+    I_top = (B * (t_top * t_top * t_top)) / 12 + A_top * (d_top * d_top)
+    I_bot = (B * (t_bot * t_bot * t_bot)) / 12 + A_bot * (d_bot * d_bot)
+    I_webs = n_webs * ((t_web * (h_web_net * h_web_net * h_web_net)) / 12 + (t_web * h_web_net) * (d_webs * d_webs))
+    Ixx = I_top + I_bot + I_webs
+
+    c_top = H - y_c
+    with np.errstate(divide="ignore", invalid="ignore"):
+        W_top = _where(c_top.v > 0, Ixx / c_top, 1e9)
+        W_bot = _where(y_c.v > 0, Ixx / y_c, 1e9)
+
+        fd = fy / gamma0
+        tau_allow = 0.58 * fy
+        sig_top = _maximum((M_pos_kN * 1e6) / W_top, (M_neg_kN * 1e6) / W_top)
+        sig_bot = _maximum((M_pos_kN * 1e6) / W_bot, (M_neg_kN * 1e6) / W_bot)
+        tau = (V_kN * 1e3) / ((n_webs * t_web) * (0.9 * H))
+    ur_top = sig_top / fd
+    ur_bot = sig_bot / fd
+    ur_shear = tau / tau_allow
+    ur_max = _maximum(_maximum(ur_top, ur_bot), ur_shear)
+
+    out = {}
+    for k, x in zip(SENS_KEYS, (Area, y_c, Ixx, W_top, W_bot, ur_top, ur_bot, ur_shear, ur_max)):
+        out[k] = x.v
+        out["d_" + k] = x.d
+    return out
+
+
+def sensitivity_table(res, keys=("Area", "ur_top", "ur_bot", "ur_shear", "ur_max")):
+    """标量结果的灵敏度表：{键: {变量: 每 mm 偏导}}（界面显示用）"""
+    return {k: {v: float(res["d_" + k][i]) for i, v in enumerate(SENS_VARS)} for k in keys}
+
+
+# =============== 2. 梯度引导的连续优化 + 取整 ===============
+def _newton_flanges(ev, tt, tb, tt_min, tb_min, max_iter, tol):
+    """
+    连续最小面积顶/底板厚：活动约束（ur_top / ur_bot ≥ 1）的牛顿迭代，对 g = 1/ur - 1 线性化。
+    约束只会在被违反时加入活动集；某板被压回下限时移出其约束。返回 (tt, tb, 结果, 迭代校核次数)
+    """
+    res = ev(tt, tb)
+    n = 1
+    active = [k for k in ("ur_top", "ur_bot") if res[k] > 1.0]
+    for _ in range(max_iter):
+        if not active:
+            break
+        names = {"ur_top": 2, "ur_bot": 3}   # 各约束对应的自变量（t_top / t_bot）在 SENS_VARS 中的下标
+        idx = [names[k] for k in active]
+        g = np.array([1.0 / res[k] - 1.0 for k in active])
+        if np.all(np.abs(g) < tol):
+            break
+        J = np.array([[-res["d_" + k][j] / (res[k] * res[k]) for j in idx] for k in active])
+        try:
+            delta = np.linalg.solve(J, -g)
+        except np.linalg.LinAlgError:
+            break
+        t = {2: tt, 3: tb}
+        for j, dx in zip(idx, delta):
+            t[j] += dx
+        tt, tb = max(t[2], tt_min), max(t[3], tb_min)
+        res = ev(tt, tb)
+        n += 1
+        # 被压回下限的板：其约束不再起作用；新出现的违反约束加入
+        active = [k for k in active if not (k == "ur_top" and tt == tt_min and t[2] < tt_min)
+                  and not (k == "ur_bot" and tb == tb_min and t[3] < tb_min)]
+        active += [k for k in ("ur_top", "ur_bot") if k not in active and res[k] > 1.0 + tol]
+    return tt, tb, res, n
+
+
+def gradient_optimize(B_box_mm, H_mm, M_pos, M_neg, V, fy, gamma0, Nc,
+                      t_top_min=16, t_bot_min=14, t_web_min=12, t_max=80, step=2, catalog=None,
+                      max_iter=20, tol=1e-9, stability=None, trace=None):
+    """
+    梯度引导的最小面积截面（Nc 固定）。离散厚度取 [t_min, t_max] 内按 step 的格点（同 grid_optimize），
+    catalog（catalog.PlateCatalog）给出时取目录档位。stability（stability.StabilityRules）给出时
+    离散阶段的校核并入局部稳定项；连续解先按其近似比例（宽厚比 ∝ 1/t，弹性剪切屈曲 ∝ 1/t²）放大一次。
+    trace（optrace.OptimizerTrace）给出时逐次记录牛顿迭代（newton，连续厚度）、取整补足（round）
+    与局部改进中被接受的步（polish），以 converged / infeasible 结束；iter 为截至该步的校核次数。
+    返回 dict：success, t_top, t_bot, t_web, Nc, Area, ur_*, t_continuous (三板连续解),
+              n_evaluated（截面校核次数）, n_newton（其中连续阶段次数）
+    """
+    if catalog is None:
+        axes = [np.arange(t_min, t_max + step / 2, step, dtype=float) for t_min in (t_top_min, t_bot_min, t_web_min)]
+    else:
+        axes = [catalog.values(t_min, t_max) for t_min in (t_top_min, t_bot_min, t_web_min)]
+    n_eval = 0
+
+    def ev(tt, tb, tw):
+        nonlocal n_eval
+        n_eval += 1
+        res = section_sensitivity(B_box_mm, H_mm, tt, tb, tw, Nc, fy, gamma0, M_pos, M_neg, V)
+        if stability is not None:
+            stability.fuse(res, B_box_mm, H_mm, tt, tb, tw, Nc, fy, M_pos, M_neg, V)
+        return res
+
+    if trace is not None:
+        run, t0 = trace.begin()
+
+    def note(move, r, tt, tb, tw):
+        if trace is not None:
+            trace.record(run, t0, n_eval, tt, tb, tw, *(float(r[k]) if r is not None else np.nan
+                                                       for k in ("ur_top", "ur_bot", "ur_shear", "ur_max")),
+                         move, int(Nc))
+
+    def newton_ev(a, b):
+        r = ev(a, b, tw)
+        note(NEWTON, r, a, b, tw)
+        return r
+
+    # 1. 连续解：腹板由剪切闭式求出，顶/底板牛顿迭代
+    tw = max(float(t_web_min), (V * 1e3) / ((Nc + 1) * (0.9 * H_mm)) / (0.58 * fy))
+    tt, tb, _, _ = _newton_flanges(newton_ev, float(t_top_min), float(t_bot_min),
+                                   float(t_top_min), float(t_bot_min), max_iter, tol)
+    n_newton = n_eval
+    if stability is not None:
+        r = ev(tt, tb, tw)
+        tt *= max(1.0, float(r["ur_bt_top"]))
+        tb *= max(1.0, float(r["ur_bt_bot"]))
+        tw *= max(1.0, float(np.sqrt(r["ur_buckle"])))
+
+    # 2. 取整到离散档位（向上），再逐板补足
+    idx = [int(np.searchsorted(ax, t - 1e-9 * max(1.0, t))) for ax, t in zip(axes, (tt, tb, tw))]
+    if any(i >= ax.size for i, ax in zip(idx, axes)):
+        note(INFEASIBLE, None, tt, tb, tw)
+        return {"success": False, "t_continuous": (tt, tb, tw), "n_evaluated": n_eval, "n_newton": n_newton}
+
+    def at(i):
+        return ev(*(float(ax[k]) for ax, k in zip(axes, i)))
+
+    # 连续解附近的格点一次向量化校核：顶/底板取上下取整及再降一档，腹板取剪切下限起 4 档
+    # （腹板也参与抗弯，翼缘降档可由腹板升档弥补）；取其中可行且面积最小者
+    box = [np.arange(max(idx[0] - 2, 0), idx[0] + 1), np.arange(max(idx[1] - 2, 0), idx[1] + 1),
+           np.arange(idx[2], min(idx[2] + 4, axes[2].size))]
+    I = [g.ravel() for g in np.meshgrid(*box, indexing="ij")]
+    cand = ev(*(ax[i] for ax, i in zip(axes, I)))
+    n_eval += I[0].size - 1
+    ok = np.nonzero(cand["ur_max"] <= 1.0)[0]
+    if ok.size:
+        k = ok[np.argmin(cand["Area"][ok])]
+        idx = [int(i[k]) for i in I]
+    res = at(idx)
+    note(ROUND, res, *(ax[k] for ax, k in zip(axes, idx)))
+    while res["ur_max"] > 1.0:
+        bump = [_plate_ur(res, p) > 1.0 for p in ("top", "bot", "web")]
+        idx = [k + b for k, b in zip(idx, bump)]
+        if any(i >= ax.size for i, ax in zip(idx, axes)):
+            note(INFEASIBLE, None, tt, tb, tw)
+            return {"success": False, "t_continuous": (tt, tb, tw), "n_evaluated": n_eval, "n_newton": n_newton}
+        res = at(idx)
+        note(ROUND, res, *(ax[k] for ax, k in zip(axes, idx)))
+
+    # 3. 局部改进：逐板降一档，或一板降一档、另一板升一档（顶/底板互相影响中和轴），仍满足且面积更小则接受
+    moves = [(p, None) for p in range(3)] + [(p, q) for p in range(3) for q in range(3) if p != q]
+    improved = True
+    while improved:
+        improved = False
+        for p, q in moves:
+            trial = list(idx)
+            trial[p] -= 1
+            if q is not None:
+                trial[q] += 1
+            if trial[p] < 0 or (q is not None and trial[q] >= axes[q].size):
+                continue
+            r = at(trial)
+            if r["ur_max"] <= 1.0 and r["Area"] < res["Area"]:
+                idx, res, improved = trial, r, True
+                note(POLISH, res, *(ax[k] for ax, k in zip(axes, idx)))
+                break
+
+    out = {"success": True, "Nc": int(Nc), "t_continuous": (tt, tb, tw),
+           "n_evaluated": n_eval, "n_newton": n_newton}
+    out.update({k: float(ax[i]) for k, ax, i in zip(("t_top", "t_bot", "t_web"), axes, idx)})
+    out.update({k: float(res[k]) for k in ("Area", "ur_top", "ur_bot", "ur_shear", "ur_max")})
+    note(CONVERGED, res, out["t_top"], out["t_bot"], out["t_web"])
+    return out
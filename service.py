@@ -0,0 +1,446 @@
+# -*- coding: utf-8 -*-
+"""
+本地 HTTP 批量计算服务（仅标准库 http.server + JSON）
+
+其它工具可直接以 HTTP 调用截面校核、优化与出图，不必经过 Streamlit 页面。每个请求可含多个截面：
+
+    POST /check     {"sections": [{B_box_mm, H_mm, t_top, t_bot, t_web, Nc, fy?, gamma0?,
+                                   M_pos?, M_neg?, V?}, ...],
+                     "M_pos", "M_neg", "V"（各截面缺省荷载）, "stability"?: {e_web, ...} | true}
+    POST /optimize  {"sections": [{B_box_mm, H_mm, M_pos, M_neg, V, fy?, gamma0?, Nc?（缺省 1~4 全搜）,
+                                   t_top_min?, t_bot_min?, t_web_min?, t_max?, step?, grade?,
+                                   method?: "grid" | "gradient"}, ...], "stability"?: ...}
+    POST /render    {"view": "cad" | "3d", "fmt": "png" | "svg" | "dxf", "dpi"?（50~600）,
+                     "sections": [render_section 的几何参数, ...]}   -> PNG 为 base64
+    GET  /health, GET /metrics
+
+返回 {"results": [...], "elapsed_ms": ...}；单个截面出错时该项为 {"error": ...}，不影响其余各项。
+
+- 校核：逐项校验并转换输入（缺键 / 非数值的项单独返回 error），再查服务自有缓存（与 app01 的 check_section 同键；
+  BOXGIRDER_STORE 启用时共用持久库），未命中的一次向量化 batch_check 后回填；
+- 优化 / 出图：逐项提交到有界线程池（NumPy / Agg 出图大部分时间释放 GIL），大批量按 max_pending 窗口推进，
+  只有服务确已饱和（其它请求占满排队名额）才返回 503；
+  结果同样按输入键缓存，服务运行期间（启用持久库时重启后亦然）保持热缓存；
+- /metrics：各端点请求数、截面数、错误数、最近 N 次耗时的 p50 / p95 / p99 与缓存统计。
+
+运行（只监听本机）：
+    python service.py --port 8765 --workers 4
+压测见 benchmarks/bench_service.py。
+"""
+import argparse
+import base64
+import json
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from box_section import batch_check, grid_optimize
+from project_store import STORE
+from section_cache import SECTION_CACHE, SectionCache
+
+MAX_BODY = 8 << 20          # 请求体上限（字节）
+DPI_RANGE = (50, 600)       # /render 允许的 dpi 范围（闭区间）
+CHECK_KEYS = ("ur_top", "ur_bot", "ur_shear", "ur_max", "Area", "y_c", "Ixx", "W_top", "W_bot")
+SECTION_KEYS = ("B_box_mm", "H_mm", "t_top", "t_bot", "t_web", "Nc")
+
+
+class BadRequest(ValueError):
+    """请求格式错误（400）"""
+
+
+class Overloaded(RuntimeError):
+    """线程池排队已满（503）"""
+
+
+# =============== 1. 有界线程池与延迟统计 ===============
+class BoundedPool:
+    """线程池 + 排队上限：未完成任务数达到 max_pending 时 submit 抛出 Overloaded，而不是无限排队"""
+
+    def __init__(self, max_workers=4, max_pending=256):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="svc")
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self.rejected = 0
+
+    def map(self, fn, items):
+        """
+        对 items 并行调用 fn，按顺序返回结果（单项异常以 {"error": ...} 返回）。
+        逐项占用排队名额：名额用尽时先等本请求最早提交的一项完成再继续（大批量按窗口推进）；
+        只有本请求一项也提交不了（服务确已饱和）时才抛出 Overloaded。
+        """
+        results = [None] * len(items)
+        pending = deque()
+        try:
+            for i, item in enumerate(items):
+                while not self._slots.acquire(blocking=False):
+                    if not pending:
+                        self.rejected += 1
+                        raise Overloaded(f"服务繁忙：排队任务已达上限 {self.max_pending}")
+                    j, f = pending.popleft()
+                    try:
+                        results[j] = f.result()
+                    finally:
+                        self._slots.release()
+                pending.append((i, self._pool.submit(_guarded, fn, item)))
+            while pending:
+                j, f = pending.popleft()
+                try:
+                    results[j] = f.result()
+                finally:
+                    self._slots.release()
+            return results
+        finally:
+            for _, f in pending:      # 出错提前返回：取消未开始的项，已在运行的项完成后再归还名额
+                f.cancel()
+                f.add_done_callback(lambda _f: self._slots.release())
+
+    def submit_one(self, fn, *args):
+        """单个任务（如整批向量化校核）在池中执行并等待结果"""
+        if not self._slots.acquire(blocking=False):
+            self.rejected += 1
+            raise Overloaded(f"服务繁忙：排队任务已达上限 {self.max_pending}")
+        try:
+            return self._pool.submit(fn, *args).result()
+        finally:
+            self._slots.release()
+
+    def shutdown(self):
+        self._pool.shutdown(wait=True)
+
+
+def _guarded(fn, item):
+    """单项计算：任何异常都转为该项的 {"error": ...}，不影响同批其余各项"""
+    try:
+        return fn(item)
+    except Exception as e:
+        return {"error": f"{type(e).__name__}: {e}"}
+
+
+class LatencyMetrics:
+    """各端点的请求数 / 截面数 / 错误数与最近 window 次耗时（线程安全）"""
+
+    def __init__(self, window=2048):
+        self.window = window
+        self._lock = threading.Lock()
+        self._ep = {}
+        self.started = time.time()
+
+    def record(self, endpoint, seconds, n_items=0, error=False):
+        with self._lock:
+            ep = self._ep.get(endpoint)
+            if ep is None:
+                ep = self._ep[endpoint] = {"requests": 0, "items": 0, "errors": 0,
+                                           "lat": deque(maxlen=self.window)}
+            ep["requests"] += 1
+            ep["items"] += n_items
+            ep["errors"] += bool(error)
+            ep["lat"].append(seconds)
+
+    def snapshot(self):
+        with self._lock:
+            eps = {k: (v["requests"], v["items"], v["errors"], np.array(v["lat"])) for k, v in self._ep.items()}
+        out = {"uptime_s": time.time() - self.started, "endpoints": {}}
+        for k, (n, items, errors, lat) in eps.items():
+            p50, p95, p99 = np.percentile(lat, (50, 95, 99)) * 1e3 if lat.size else (0.0, 0.0, 0.0)
+            out["endpoints"][k] = {"requests": n, "items": items, "errors": errors,
+                                   "p50_ms": float(p50), "p95_ms": float(p95), "p99_ms": float(p99),
+                                   "mean_ms": float(lat.mean() * 1e3) if lat.size else 0.0}
+        return out
+
+
+# =============== 2. 计算（与界面共用缓存） ===============
+def _stability(spec):
+    """请求中的 stability：None / false 不计入，true 为缺省参数，dict 为 StabilityRules 关键字参数"""
+    if not spec:
+        return None
+    from stability import StabilityRules
+    if spec is True:
+        return StabilityRules()
+    kw = dict(spec)
+    for k in ("top_ribs", "bot_ribs"):
+        if kw.get(k) is not None:
+            kw[k] = tuple(float(v) for v in kw[k])
+    return StabilityRules(**kw)
+
+
+def _number(name, v, low=0.0, strict=True, integer=False):
+    """单个数值字段 -> float：须为非布尔的有限数，且 > low（strict=False 时 >= low；low=None 不设下界）"""
+    if isinstance(v, bool) or not isinstance(v, (int, float)) or not np.isfinite(v):
+        raise ValueError(f"{name} 须为有限数值，收到 {v!r}")
+    v = float(v)
+    if low is not None and (v <= low if strict else v < low):
+        raise ValueError(f"{name} 须{'大于' if strict else '不小于'} {low:g}，收到 {v:g}")
+    if integer and v != int(v):
+        raise ValueError(f"{name} 须为整数，收到 {v:g}")
+    return v
+
+
+def _check_args(s, M_pos, M_neg, V):
+    """单个 /check 截面 -> 数值参数元组（同 check_section 顺序）；缺键、非数值或越界抛 ValueError"""
+    if not isinstance(s, dict):
+        raise ValueError("截面须为 JSON 对象")
+    missing = [k for k in SECTION_KEYS if k not in s]
+    if missing:
+        raise ValueError(f"缺少字段 {', '.join(missing)}")
+    args = []
+    for name, v in zip(SECTION_KEYS + ("fy", "gamma0", "M_pos", "M_neg", "V"),
+                       [s[k] for k in SECTION_KEYS] + [s.get("fy", 345.0), s.get("gamma0", 1.1),
+                                                       s.get("M_pos", M_pos), s.get("M_neg", M_neg),
+                                                       s.get("V", V)]):
+        args.append(_number(name, v, low=None))
+    if min(args[:5]) <= 0 or args[6] <= 0 or args[5] != int(args[5]) or args[5] < 1:
+        raise ValueError("尺寸、厚度与 gamma0 须为正，Nc 须为正整数")
+    return args
+
+
+def check_batch(sections, M_pos=0.0, M_neg=0.0, V=0.0, stability=None, cache=SECTION_CACHE):
+    """
+    批量校核：返回与 check_section 相同键的 dict 列表（另含 fd；给出 stability 时含局部稳定各项）。
+    输入逐项校验，出错的项为 {"error": ...}，不影响其余各项；
+    缓存命中的直接取用，其余一次 batch_check 后逐条回填缓存。
+    """
+    keys, results = [], []
+    for s in sections:
+        try:
+            keys.append(cache.key("check", *_check_args(s, M_pos, M_neg, V)))
+            results.append(None)
+        except (TypeError, ValueError) as e:
+            keys.append(None)
+            results.append({"error": f"ValueError: {e}"})
+    ok = [i for i, k in enumerate(keys) if k is not None]
+    for i in ok:
+        results[i] = cache.get(keys[i])
+    miss = [i for i in ok if results[i] is None]
+    if miss:
+        cols = np.array([keys[i][1:] for i in miss], dtype=float).T
+        B, H, tt, tb, tw, nc, fy, g0, Mp, Mn, Vk = cols
+        res = batch_check(B, H, tt, tb, tw, nc, fy, g0, Mp, Mn, Vk)
+        for j, i in enumerate(miss):
+            value = {k: float(res[k][j]) for k in CHECK_KEYS}
+            value["fd"] = float(fy[j] / g0[j])
+            cache.put(keys[i], value)
+            results[i] = value
+    results = [dict(r) for r in results]
+    if stability is not None and ok:
+        cols = np.array([keys[i][1:] for i in ok], dtype=float).T
+        B, H, tt, tb, tw, nc, fy, _, Mp, Mn, Vk = cols
+        stab = stability.check(B, H, tt, tb, tw, nc, fy, Mp, Mn, Vk)
+        for j, i in enumerate(ok):
+            r = results[i]
+            r.update({k: float(np.broadcast_to(v, B.shape)[j]) for k, v in stab.items()})
+            r["ur_max"] = max(r["ur_max"], *(r[k] for k in stab))
+    return results
+
+
+# /optimize 单项的数值字段：(名称, 缺省值(None 为必填), 下界(None 为不设))
+_OPTIMIZE_FIELDS = (("B_box_mm", None, 0.0), ("H_mm", None, 0.0),
+                    ("M_pos", None, None), ("M_neg", None, None), ("V", None, None),
+                    ("fy", 345.0, 0.0), ("gamma0", 1.1, 0.0),
+                    ("t_top_min", 16, 0.0), ("t_bot_min", 14, 0.0), ("t_web_min", 12, 0.0),
+                    ("t_max", 80, 0.0), ("step", 2, 0.0))
+
+# /render 单项几何字段的下界：(下界, 是否严格)；Nc 另按正整数校验
+_RENDER_BOUNDS = {"B_deck": (0.0, True), "B_box_mm": (0.0, True), "H_mm": (0.0, True),
+                  "t_top": (0.0, True), "t_bot": (0.0, True), "t_web": (0.0, True),
+                  "L_seg_mm": (0.0, True), "dim_gap": (0.0, False),
+                  "out_top": (0.0, False), "out_bot": (0.0, False), "e_web": (0.0, False)}
+
+
+def optimize_one(item, stability=None, cache=SECTION_CACHE):
+    """单个截面的最小面积优化（grid_optimize / gradient_optimize），结果按输入缓存"""
+    method = item.get("method", "grid")
+    if method not in ("grid", "gradient"):
+        raise ValueError(f"未知优化方法 {method!r}")
+    Nc = item.get("Nc")
+    if Nc is not None:
+        Nc = int(_number("Nc", Nc, low=1, strict=False, integer=True))
+    grade = item.get("grade")
+    args = tuple(_number(name, item[name] if default is None else item.get(name, default), low)
+                 for name, default, low in _OPTIMIZE_FIELDS)
+    key = cache.key("optimize", method, Nc, grade, *args, None if stability is None else stability.key())
+
+    def compute():
+        from catalog import PlateCatalog
+        B, H, Mp, Mn, Vk, fy, g0, tt_min, tb_min, tw_min, t_max, step = key[4:16]
+        catalog = None if grade is None else PlateCatalog.from_grade(grade)
+        if method == "gradient":
+            from sensitivity import gradient_optimize
+            if Nc is None:
+                raise ValueError("梯度引导优化需给定 Nc")
+            res = gradient_optimize(B, H, Mp, Mn, Vk, fy, g0, int(Nc), tt_min, tb_min, tw_min, t_max, step,
+                                    catalog=catalog, stability=stability)
+            res.pop("t_continuous", None)
+        elif catalog is not None:
+            from catalog import catalog_optimize
+            res = catalog_optimize(catalog, B, H, Mp, Mn, Vk, fy, g0, tt_min, tb_min, tw_min, t_max=t_max,
+                                   Nc_values=(1, 2, 3, 4) if Nc is None else (int(Nc),), stability=stability)
+        else:
+            res = grid_optimize(B, H, Mp, Mn, Vk, fy, g0, tt_min, tb_min, tw_min, t_max=t_max, step=step,
+                                Nc_values=(1, 2, 3, 4) if Nc is None else (int(Nc),), stability=stability)
+        return {k: (v.item() if isinstance(v, np.generic) else v) for k, v in res.items()}
+
+    return dict(cache.get_or_compute(key, compute))
+
+
+def render_one(item, view="cad", fmt="png", dpi=200):
+    """单个截面出图：PNG 为 base64，SVG / DXF 为文本（二维 SVG / DXF 由 cad_export 直接写出）"""
+    geom = {k: tuple(v) if isinstance(v, list) else v for k, v in item.items()}
+    for k, (low, strict) in _RENDER_BOUNDS.items():
+        if k in geom:
+            _number(k, geom[k], low, strict)
+    geom["Nc"] = int(_number("Nc", geom.get("Nc"), low=1, strict=False, integer=True))
+    if fmt == "dxf" or (fmt == "svg" and view == "cad"):
+        from cad_export import export_section
+        if view != "cad":
+            raise ValueError("DXF 只支持二维工程图 (view=cad)")
+        geom.pop("L_seg_mm", None)
+        return {"fmt": fmt, "data": export_section(fmt, **geom)}
+    if fmt not in ("png", "svg"):
+        raise ValueError(f"未知格式 {fmt!r}")
+    from drawing import render_section
+    data = render_section(view, fmt, dpi=dpi, **geom)
+    if fmt == "png":
+        return {"fmt": "png", "encoding": "base64", "data": base64.b64encode(data).decode("ascii")}
+    return {"fmt": "svg", "data": data.decode("utf-8")}
+
+
+# =============== 3. HTTP 服务 ===============
+class SizingService:
+    """
+    端点分发 + 线程池 + 统计；handle(method, path, body) 返回 (状态码, JSON 对象)。
+    cache 为服务自有的结果缓存（缺省新建，与界面的全局 SECTION_CACHE 互不影响容量）。
+    """
+
+    def __init__(self, workers=4, max_pending=256, max_sections=10_000, cache=None):
+        self.cache = SectionCache(store=STORE) if cache is None else cache
+        self.pool = BoundedPool(workers, max_pending)
+        self.metrics = LatencyMetrics()
+        self.max_sections = max_sections
+
+    def handle(self, method, path, body):
+        t0 = time.perf_counter()
+        n_items, status = 0, 200
+        try:
+            if method == "GET" and path == "/health":
+                out = {"status": "ok"}
+            elif method == "GET" and path == "/metrics":
+                out = self.metrics.snapshot()
+                out.update(pool={"workers": self.pool.max_workers, "max_pending": self.pool.max_pending,
+                                 "rejected": self.pool.rejected},
+                           cache=self.cache.stats())
+            elif method == "POST" and path in ("/check", "/optimize", "/render"):
+                req = self._parse(body)
+                sections = req["sections"]
+                n_items = len(sections)
+                out = {"results": self._dispatch(path, req, sections)}
+            else:
+                status, out = 404, {"error": f"未知端点 {method} {path}"}
+        except BadRequest as e:
+            status, out = 400, {"error": str(e)}
+        except (KeyError, ValueError, TypeError) as e:
+            status, out = 400, {"error": f"{type(e).__name__}: {e}"}
+        except Overloaded as e:
+            status, out = 503, {"error": str(e)}
+        except Exception as e:
+            status, out = 500, {"error": f"{type(e).__name__}: {e}"}
+        elapsed = time.perf_counter() - t0
+        if path != "/metrics":
+            self.metrics.record(path, elapsed, n_items, error=status >= 400)
+        if status == 200 and "results" in out:
+            out["elapsed_ms"] = elapsed * 1e3
+        return status, out
+
+    def _parse(self, body):
+        try:
+            req = json.loads(body or b"{}")
+        except ValueError as e:
+            raise BadRequest(f"JSON 解析失败：{e}")
+        if not isinstance(req, dict) or not isinstance(req.get("sections"), list):
+            raise BadRequest('请求体须为 {"sections": [...], ...}')
+        if len(req["sections"]) > self.max_sections:
+            raise BadRequest(f"单次最多 {self.max_sections} 个截面")
+        return req
+
+    def _dispatch(self, path, req, sections):
+        if path == "/check":
+            return self.pool.submit_one(check_batch, sections, req.get("M_pos", 0.0), req.get("M_neg", 0.0),
+                                        req.get("V", 0.0), _stability(req.get("stability")), self.cache)
+        if path == "/optimize":
+            stability = _stability(req.get("stability"))
+            return self.pool.map(lambda item: optimize_one(item, stability, self.cache), sections)
+        view, fmt, dpi = req.get("view", "cad"), req.get("fmt", "png"), req.get("dpi", 200)
+        if view not in ("cad", "3d"):
+            raise BadRequest(f"未知视图 {view!r}")
+        if isinstance(dpi, bool) or not isinstance(dpi, int) or not DPI_RANGE[0] <= dpi <= DPI_RANGE[1]:
+            raise BadRequest(f"dpi 须为 {DPI_RANGE[0]}–{DPI_RANGE[1]} 的整数，收到 {dpi!r}")
+        return self.pool.map(lambda item: render_one(item, view, fmt, dpi), sections)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "BoxGirderService/1.0"
+    protocol_version = "HTTP/1.1"      # keep-alive：批量客户端复用连接
+
+    def _reply(self, status, obj):
+        data = json.dumps(obj, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        self._reply(*self.server.service.handle("GET", self.path, None))
+
+    def do_POST(self):
+        n = int(self.headers.get("Content-Length") or 0)
+        if n > MAX_BODY:
+            self.close_connection = True
+            self._reply(413, {"error": f"请求体超过 {MAX_BODY} 字节"})
+            return
+        self._reply(*self.server.service.handle("POST", self.path, self.rfile.read(n)))
+
+    def log_message(self, fmt, *args):  # 访问日志由 /metrics 统计代替
+        pass
+
+
+def make_server(host="127.0.0.1", port=8765, workers=4, max_pending=256, cache_size=None):
+    """
+    创建（未启动的）服务；port=0 时由系统分配空闲端口（server.server_address[1]）。
+    cache_size 为服务自有结果缓存的容量（批量校核的工作集常大于界面用的缺省容量）；
+    不改动进程内全局 SECTION_CACHE。
+    """
+    cache = SectionCache(store=STORE) if cache_size is None else SectionCache(maxsize=cache_size, store=STORE)
+    server = ThreadingHTTPServer((host, port), _Handler)
+    server.daemon_threads = True
+    server.service = SizingService(workers, max_pending, cache=cache)
+    return server
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="钢箱梁截面批量计算 HTTP 服务（JSON）")
+    p.add_argument("--host", default="127.0.0.1", help="监听地址（缺省只监听本机）")
+    p.add_argument("--port", type=int, default=8765)
+    p.add_argument("--workers", type=int, default=4, help="计算线程数")
+    p.add_argument("--max-pending", type=int, default=256, help="排队任务上限，超出返回 503")
+    p.add_argument("--cache-size", type=int, default=65536, help="结果缓存条数（LRU）")
+    args = p.parse_args(argv)
+
+    server = make_server(args.host, args.port, args.workers, args.max_pending, args.cache_size)
+    host, port = server.server_address[:2]
+    print(f"服务已启动：http://{host}:{port}  （/check /optimize /render /metrics，Ctrl+C 退出）")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.service.pool.shutdown()
+
+
+if __name__ == "__main__":
+    main()
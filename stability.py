@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""
+局部稳定校核（向量化）：受压翼缘宽厚比与腹板剪切屈曲
+
+check_capacity / batch_check 只校核应力比，优化器可能给出宽厚比或剪切屈曲不满足的薄板。
+这里的核函数与 batch_ur 同样按数组运算，可并入优化器的可行性判断（grid_optimize 等的 stability 参数）：
+
+1. 翼缘宽厚比 ur_bt_top / ur_bt_bot = (b / t) / (bt_limit · ε)，ε = sqrt(235 / fy)；
+   受压时才校核（正弯矩压顶板、负弯矩压底板）。板格宽 b：箱室净宽 (B - 2·e_web) / Nc - t_web，
+   设 U 肋时取肋内口宽 a 与肋间净距 (间距 - a) 中的较大者（不超过箱室净宽）。
+2. 腹板剪切屈曲 ur_buckle = τ / (χ_w · 0.58 fy)：h_w = H - t_top - t_bot，
+   λ_w = h_w / (37.4 · t_web · ε · sqrt(k_τ))，χ_w = min(1, 0.83 / λ_w)（非刚性端柱）；
+   k_τ 按横向加劲间距 a_stiff 取值（None 为无中间横向加劲，5.34）。τ 的算法同 ur_shear。
+
+各项只随“本板”加厚单调减小（宽厚比：t_top / t_bot，另随 t_web 加厚略减；剪切屈曲：t_web，另随翼缘加厚
+h_w 变小而减小），因此与强度项取大后，grid_optimize 的单调界剪枝仍然成立（剪切下限取最厚翼缘处校核）。
+限值系数为常用取值（宽厚比 42ε 对应受压内伸板件），使用前请按所用规范核对修改。
+"""
+import numpy as np
+
+from section_geometry import U_RIB_BOTTOM, U_RIB_DECK
+
+STAB_KEYS = ("ur_bt_top", "ur_bt_bot", "ur_buckle")
+
+
+# =============== 1. 核函数 ===============
+def panel_width(cell_clear, ribs):
+    """翼缘板格宽：无肋为箱室净宽；U 肋 (间距, a, ...) 取 max(a, 间距 - a)，不超过箱室净宽"""
+    if ribs is None:
+        return cell_clear
+    spacing, a = ribs[0], ribs[1]
+    return np.minimum(cell_clear, max(a, spacing - a))
+
+
+def shear_buckling_k(h_w, a_stiff=None):
+    """剪切屈曲系数 k_τ（四边简支板格；a_stiff 为横向加劲间距，None 为无中间加劲）"""
+    if a_stiff is None:
+        return 5.34
+    r = h_w / a_stiff
+    return np.where(r <= 1.0, 5.34 + 4.0 * (r * r), 4.0 + 5.34 * (r * r))
+
+
+def batch_stability(B, H, t_top, t_bot, t_web, Nc, fy, M_pos_kN, M_neg_kN, V_kN,
+                    e_web=0.0, top_ribs=U_RIB_DECK, bot_ribs=U_RIB_BOTTOM, a_stiff=None, bt_limit=42.0):
+    """
+    局部稳定利用率（参数可为标量或数组，按 numpy 规则广播）。
+    返回 dict：ur_bt_top, ur_bt_bot, ur_buckle
+    """
+    eps = np.sqrt(235.0 / fy)
+    n_webs = Nc + 1
+
+    # 1. 翼缘宽厚比（受压翼缘）
+    cell = (B - 2 * e_web) / Nc - t_web
+    lim = bt_limit * eps
+    ur_bt_top = np.where(M_pos_kN > 0, panel_width(cell, top_ribs) / t_top / lim, 0.0)
+    ur_bt_bot = np.where(M_neg_kN > 0, panel_width(cell, bot_ribs) / t_bot / lim, 0.0)
+
+    # 2. 腹板剪切屈曲
+    h_w = np.maximum(H - t_top - t_bot, 0.0)
+    lam = h_w / (37.4 * t_web * eps * np.sqrt(shear_buckling_k(h_w, a_stiff)))
+    with np.errstate(divide="ignore"):
+        chi = np.minimum(1.0, 0.83 / lam)
+    tau = (V_kN * 1e3) / (n_webs * t_web * (0.9 * H))
+    ur_buckle = tau / (chi * (0.58 * fy))
+    return {"ur_bt_top": ur_bt_top, "ur_bt_bot": ur_bt_bot, "ur_buckle": ur_buckle}
+
+
+# =============== 2. 校核规则（传给优化器） ===============
+class StabilityRules:
+    """
+    局部稳定校核参数：e_web（外侧腹板内收, mm）、top_ribs / bot_ribs（U 肋，None 为不设）、
+    a_stiff（腹板横向加劲间距, mm）、bt_limit（宽厚比限值系数）。
+    fuse 把各项并入校核结果（与 batch_check 同形状的 dict），grid_optimize 等以 stability=rules 调用。
+    """
+
+    def __init__(self, e_web=0.0, top_ribs=U_RIB_DECK, bot_ribs=U_RIB_BOTTOM, a_stiff=None, bt_limit=42.0):
+        self.e_web = e_web
+        self.top_ribs = top_ribs
+        self.bot_ribs = bot_ribs
+        self.a_stiff = a_stiff
+        self.bt_limit = bt_limit
+
+    def __repr__(self):
+        return (f"StabilityRules(e_web={self.e_web}, top_ribs={self.top_ribs}, bot_ribs={self.bot_ribs}, "
+                f"a_stiff={self.a_stiff}, bt_limit={self.bt_limit})")
+
+    def key(self):
+        """缓存键用的参数元组"""
+        return (self.e_web, self.top_ribs, self.bot_ribs, self.a_stiff, self.bt_limit)
+
+    def check(self, B, H, t_top, t_bot, t_web, Nc, fy, M_pos_kN, M_neg_kN, V_kN):
+        return batch_stability(B, H, t_top, t_bot, t_web, Nc, fy, M_pos_kN, M_neg_kN, V_kN,
+                               self.e_web, self.top_ribs, self.bot_ribs, self.a_stiff, self.bt_limit)
+
+    def fuse(self, res, B, H, t_top, t_bot, t_web, Nc, fy, M_pos_kN, M_neg_kN, V_kN):
+        """就地加入 STAB_KEYS 各项，ur_max 取含局部稳定的最大值；返回 res"""
+        stab = self.check(B, H, t_top, t_bot, t_web, Nc, fy, M_pos_kN, M_neg_kN, V_kN)
+        res.update(stab)
+        res["ur_max"] = np.maximum(np.maximum(res["ur_max"], stab["ur_buckle"]),
+                                   np.maximum(stab["ur_bt_top"], stab["ur_bt_bot"]))
+        return res
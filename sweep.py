@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+"""
+多进程设计空间扫描（无界面）
+
+把 (B, H, Nc, t_top, t_bot, t_web) 全组合按扁平下标切块，分发到 ProcessPoolExecutor；
+各进程只接收 6 个轴向量与下标区间 [start, stop)，在本地展开为 NumPy 参数块后批量校核，
+返回本块最小面积可行解与 Pareto 前沿，主进程逐块合并。
+
+命令行示例（区间写法 起:止:步长，含端点）：
+    python sweep.py --B 7000:12000:500 --H 1200:3000:100 --Nc 1,2,3,4 \\
+        --t-top 16:60:2 --t-bot 14:60:2 --t-web 12:40:2 --M-pos 60000 --M-neg 90000 --V 15000
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from pareto import FRONT_KEYS, OBJECTIVES, empty_front, feasible_block, merge_front
+
+# 面积相同时依次比较的字段（越小越优）：结果与分块方式、进程完成顺序无关
+TIE_KEYS = ("H", "Nc", "B", "t_top", "t_bot", "t_web")
+
+
+# =============== 1. 进程内计算单元 ===============
+def _sweep_chunk(axes, start, stop, loads, objectives):
+    """校核一块格点，返回 (本块最优解 dict 或 None, 本块前沿, 本块截面数)"""
+    cand = feasible_block(axes, start, stop, *loads)
+    best = None
+    if cand["Area"].size:
+        k = int(np.lexsort([cand[key] for key in TIE_KEYS[::-1]] + [cand["Area"]])[0])
+        best = {key: float(val[k]) for key, val in cand.items()}
+    return best, merge_front(empty_front(), cand, objectives), stop - start
+
+
+def _rank(best):
+    return (best["Area"],) + tuple(best[k] for k in TIE_KEYS)
+
+
+def _better(a, b):
+    """面积更小者为优，同面积按 TIE_KEYS 依次比较（None 视为不可行）"""
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return b if _rank(b) < _rank(a) else a
+
+
+# =============== 2. 扫描调度 ===============
+def run_sweep(B_values, H_values, Nc_values, t_top_values, t_bot_values, t_web_values,
+              M_pos, M_neg, V, fy=345.0, gamma0=1.1,
+              objectives=OBJECTIVES, chunk=262144, max_workers=None, progress=None):
+    """
+    多进程扫描全组合，返回 dict：
+        best        全局最小面积可行解（同面积按 TIE_KEYS 取；无可行解为 None）
+        front       Pareto 前沿（字段见 pareto.FRONT_KEYS，目标缺省为 pareto.OBJECTIVES；按 FRONT_KEYS 字典序排列）
+        n_sections  校核截面总数
+        elapsed     墙钟时间 (s)
+        throughput  截面/秒
+        n_workers, n_chunks
+    max_workers=1 时在本进程内顺序执行（便于调试与小规模任务）。
+    progress(done, total) 为可选回调，每完成一块调用一次。
+    """
+    axes = tuple(np.asarray(a, dtype=float) for a in
+                 (B_values, H_values, Nc_values, t_top_values, t_bot_values, t_web_values))
+    loads = (M_pos, M_neg, V, fy, gamma0)
+    total = int(np.prod([a.size for a in axes]))
+    ranges = [(s, min(s + chunk, total)) for s in range(0, total, chunk)]
+    n_workers = max_workers or os.cpu_count() or 1
+
+    best, front, done = None, empty_front(), 0
+    t0 = time.perf_counter()
+
+    def collect(result):
+        nonlocal best, front, done
+        b, f, n = result
+        best = _better(best, b)
+        front = merge_front(front, f, objectives)
+        done += n
+        if progress is not None:
+            progress(done, total)
+
+    if n_workers == 1:
+        for s, e in ranges:
+            collect(_sweep_chunk(axes, s, e, loads, objectives))
+    else:
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            futures = [pool.submit(_sweep_chunk, axes, s, e, loads, objectives) for s, e in ranges]
+            for fut in as_completed(futures):
+                collect(fut.result())
+
+    # 各块完成顺序不定：前沿排成固定顺序，重复扫描结果逐位相同
+    order = np.lexsort([front[k] for k in FRONT_KEYS[::-1]])
+    front = {k: v[order] for k, v in front.items()}
+    elapsed = time.perf_counter() - t0
+    return {
+        "best": best,
+        "front": front,
+        "n_sections": total,
+        "elapsed": elapsed,
+        "throughput": total / elapsed if elapsed > 0 else float("inf"),
+        "n_workers": n_workers,
+        "n_chunks": len(ranges),
+    }
+
+
+# =============== 3. 命令行 ===============
+def _parse_axis(text):
+    """'a:b:step' -> 含端点的等差数列；'a,b,c' -> 列表"""
+    if ":" in text:
+        a, b, step = (float(x) for x in text.split(":"))
+        return np.arange(a, b + step / 2, step)
+    return np.array([float(x) for x in text.split(",")])
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="钢箱梁截面设计空间多进程扫描")
+    p.add_argument("--B", default="7000:12000:500", help="箱宽 B_box (mm)")
+    p.add_argument("--H", default="1200:3000:100", help="梁高 H (mm)")
+    p.add_argument("--Nc", default="1,2,3,4", help="箱室数")
+    p.add_argument("--t-top", default="16:60:2", help="顶板厚 (mm)")
+    p.add_argument("--t-bot", default="14:60:2", help="底板厚 (mm)")
+    p.add_argument("--t-web", default="12:40:2", help="腹板厚 (mm)")
+    p.add_argument("--M-pos", type=float, default=15400.0, help="M+ (kN·m)")
+    p.add_argument("--M-neg", type=float, default=32200.0, help="M- (kN·m)")
+    p.add_argument("--V", type=float, default=5360.0, help="V (kN)")
+    p.add_argument("--fy", type=float, default=345.0)
+    p.add_argument("--gamma0", type=float, default=1.1)
+    p.add_argument("--chunk", type=int, default=262144)
+    p.add_argument("--workers", type=int, default=None)
+    p.add_argument("--objectives", default=",".join(OBJECTIVES),
+                   help=f"Pareto 目标（逗号分隔，取自 {', '.join(FRONT_KEYS)}，均越小越好）")
+    args = p.parse_args(argv)
+    objectives = tuple(k.strip() for k in args.objectives.split(","))
+    if not set(objectives) <= set(FRONT_KEYS):
+        p.error(f"未知目标：{', '.join(sorted(set(objectives) - set(FRONT_KEYS)))}")
+
+    res = run_sweep(_parse_axis(args.B), _parse_axis(args.H), _parse_axis(args.Nc),
+                    _parse_axis(args.t_top), _parse_axis(args.t_bot), _parse_axis(args.t_web),
+                    args.M_pos, args.M_neg, args.V, args.fy, args.gamma0,
+                    objectives=objectives, chunk=args.chunk, max_workers=args.workers)
+
+    print(f"截面数 {res['n_sections']:,}  分块 {res['n_chunks']}  进程 {res['n_workers']}  "
+          f"耗时 {res['elapsed']:.2f} s  吞吐 {res['throughput']:,.0f} 截面/秒")
+    if res["best"] is None:
+        print("无可行截面 (UR_max ≤ 1)")
+    else:
+        b = res["best"]
+        print(f"最小面积: B={b['B']:g} H={b['H']:g} Nc={b['Nc']:g} "
+              f"t=({b['t_top']:g}, {b['t_bot']:g}, {b['t_web']:g})  "
+              f"A={b['Area'] / 100:.1f} cm²  UR_max={b['ur_max']:.3f}")
+    f = res["front"]
+    print(f"Pareto 前沿 {f['Area'].size} 点（目标 {' / '.join(objectives)}；列 {' / '.join(FRONT_KEYS)}）:")
+    for row in np.column_stack([f[k] for k in FRONT_KEYS])[np.argsort(f["H"])]:
+        print("  " + "  ".join(f"{v:g}" for v in row))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+# -*- coding: utf-8 -*-
+"""pytest 公共设置：仓库根目录加入 sys.path（各模块为顶层平铺）；测试期间不写持久库"""
+import os
+import sys
+
+os.environ["BOXGIRDER_STORE"] = ""
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
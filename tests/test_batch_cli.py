@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""batch_cli：规则法 / 优化、流式读写、坏行与未定行的状态与空值"""
+import csv
+import json
+
+import numpy as np
+import pytest
+
+from batch_cli import iter_rows, main, run, size_chunk
+from catalog import PlateCatalog
+
+GOOD = dict(M_pos=15400, M_neg=32200, V=5360, B_deck=13.5, H=2.0)
+
+
+def _write_jsonl(path, rows):
+    path.write_text("".join(json.dumps(r, ensure_ascii=False) + "\n" for r in rows), encoding="utf-8")
+
+
+def test_jsonl_streams_in_chunks_and_matches_single_chunk(tmp_path):
+    rows = [dict(GOOD, id=i, M_pos=5000 + 1000 * i, H=1.6 + 0.1 * (i % 5)) for i in range(23)]
+    src = tmp_path / "cases.jsonl"
+    _write_jsonl(src, rows)
+    outs = []
+    for chunk in (4, 4096):
+        dst = tmp_path / f"out{chunk}.jsonl"
+        assert run(str(src), str(dst), chunk=chunk) == 23
+        outs.append([json.loads(line) for line in dst.read_text(encoding="utf-8").splitlines()])
+    assert outs[0] == outs[1]
+    assert [r["id"] for r in outs[0]] == list(range(23))
+    assert all(r["status"] == "rules" and r["ur_max"] <= 1.0 for r in outs[0])
+
+
+def test_json_array_and_jsonl_read_the_same_rows(tmp_path):
+    rows = [dict(GOOD, id=i) for i in range(5)]
+    (tmp_path / "a.json").write_text(json.dumps(rows, indent=1), encoding="utf-8")
+    _write_jsonl(tmp_path / "a.jsonl", rows)
+    assert list(iter_rows(str(tmp_path / "a.json"))) == list(iter_rows(str(tmp_path / "a.jsonl"))) == rows
+
+
+def test_bad_rows_are_reported_and_do_not_abort_the_chunk():
+    rows = [GOOD, dict(GOOD, M_pos="abc"), {k: v for k, v in GOOD.items() if k != "V"},
+            dict(GOOD, Nc="2.5"), dict(GOOD, H=0), dict(GOOD, H="nan"), GOOD]
+    out = size_chunk(rows)
+    assert [r["status"] for r in out] == ["rules"] + ["invalid"] * 5 + ["rules"]
+    assert out[0] == out[-1] and out[0]["error"] == ""
+    assert "M_pos" in out[1]["error"] and "V" in out[2]["error"] and "Nc" in out[3]["error"]
+    assert "H" in out[4]["error"] and "H" in out[5]["error"]
+    for r in out[1:-1]:
+        assert all(np.isnan(r[k]) for k in ("t_top", "Area", "ur_max"))
+
+
+@pytest.mark.parametrize("catalog", [None, "Q345qD"])
+def test_zero_box_width_is_reported_first(catalog):
+    cat = None if catalog is None else PlateCatalog.from_grade(catalog)
+    for method in ("rules", "optimize"):
+        out = size_chunk([dict(GOOD, B_box=0), dict(GOOD, B_box=-1)], method, cat)
+        assert [r["status"] for r in out] == ["B_box<=0", "B_box<=0"]
+
+
+def test_csv_header_covers_first_chunk_and_warns_on_late_columns(tmp_path, capsys):
+    rows = [dict(GOOD, id=0), dict(GOOD, id=1, note="a"), dict(GOOD, id=2, late="b")]
+    src, dst = tmp_path / "cases.jsonl", tmp_path / "out.csv"
+    _write_jsonl(src, rows)
+    main([str(src), "-o", str(dst), "--chunk", "2"])
+    with open(dst, encoding="utf-8", newline="") as f:
+        out = list(csv.DictReader(f))
+    assert [r["note"] for r in out] == ["", "a", ""]
+    assert "late" not in out[0]
+    assert "late" in capsys.readouterr().err
+
+
+def test_batch_cli_unsized_rows_have_no_utilisation():
+    rows = [dict(M_pos="15400", M_neg="32200", V="5360", B_deck="13.5", H="2.0"),
+            dict(M_pos="900000", M_neg="900000", V="200000", B_deck="10", H="1.2"),
+            dict(M_pos="100", M_neg="100", V="100", B_deck="0.5", H="2.0")]
+    out = size_chunk(rows, catalog=PlateCatalog.from_grade("Q345qD"))
+    assert [r["status"] for r in out] == ["rules", "beyond_catalog", "B_box<=0"]
+    assert np.isfinite(out[0]["ur_max"])
+    for r in out[1:]:
+        assert all(np.isnan(r[k]) for k in ("t_top", "Area", "ur_top", "ur_bot", "ur_shear", "ur_max"))
+
+
+def test_catalog_optimize_rows_use_catalog_levels():
+    cat = PlateCatalog.from_grade("Q345qD")
+    out = size_chunk([dict(GOOD, M_pos=60000, M_neg=90000, V=15000)] * 2, "optimize", cat)
+    assert out[0] == out[1] and out[0]["status"] == "optimized"
+    assert {out[0][k] for k in ("t_top", "t_bot", "t_web")} <= set(cat.thicknesses.tolist())
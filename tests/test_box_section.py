@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""box_section：批量 / 标量逐位一致；截面记录与列式容器"""
+import pickle
+
+import numpy as np
+import pytest
+
+from box_section import BoxGirderSection, SectionArray, SectionRecord, batch_check
+
+KEYS = ("ur_top", "ur_bot", "ur_shear", "ur_max")
+
+
+def _random_sections(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return (rng.uniform(4000, 12000, n), rng.uniform(1200, 3000, n), rng.integers(8, 30, n) * 2.0,
+            rng.integers(7, 30, n) * 2.0, rng.integers(6, 20, n) * 2.0, rng.integers(1, 5, n))
+
+
+# =============== 1. 批量与标量 ===============
+def test_batch_check_bit_identical_to_scalar():
+    B, H, tt, tb, tw, nc = _random_sections(500)
+    rng = np.random.default_rng(1)
+    Mp, Mn, V = rng.uniform(1e3, 8e4, 500), rng.uniform(1e3, 1.2e5, 500), rng.uniform(5e2, 2e4, 500)
+    res = batch_check(B, H, tt, tb, tw, nc, 345.0, 1.1, Mp, Mn, V)
+    for i in range(B.size):
+        sec = BoxGirderSection(B[i], H[i], tt[i], tb[i], tw[i], int(nc[i]), 345.0, 1.1)
+        ur = sec.check_capacity(Mp[i], Mn[i], V[i])
+        assert (sec.Area, sec.y_c, sec.Ixx, sec.W_top, sec.W_bot) == tuple(
+            res[k][i] for k in ("Area", "y_c", "Ixx", "W_top", "W_bot"))
+        assert all(ur[k] == res[k][i] for k in KEYS)
+
+
+# =============== 2. 截面记录 ===============
+def test_scalar_section_is_backed_by_record():
+    sec = BoxGirderSection(9500.0, 2000.0, 18.0, 16.0, 14.0, 3, 345.0, 1.1)
+    assert isinstance(sec.record, SectionRecord) and sec.Area == sec.record.Area
+    sec.t_top = 30.0                     # 就地修改厚度后校核须反映新厚度
+    ur = sec.check_capacity(15400.0, 32200.0, 5360.0)
+    rec = sec.to_record()
+    assert rec.t_top == 30.0 and rec.check_capacity(15400.0, 32200.0, 5360.0) == ur
+
+
+def test_record_is_immutable_hashable_and_picklable():
+    rec = SectionRecord(9500.0, 2000.0, 18.0, 16.0, 14.0, 3, 345.0, 1.1)
+    with pytest.raises(AttributeError):
+        rec.t_top = 20.0
+    assert not hasattr(rec, "__dict__")
+    thicker = rec.replace(t_top=20.0)
+    assert thicker.t_top == 20.0 and thicker.Area > rec.Area and rec.t_top == 18.0
+    assert pickle.loads(pickle.dumps(rec)) == rec and len({rec, rec.replace()}) == 1
+    with pytest.raises(TypeError):
+        rec.replace(Area=1.0)
+
+
+def test_section_array_matches_batch_check():
+    B, H, tt, tb, tw, nc = _random_sections(300, seed=2)
+    sa = SectionArray.from_inputs(B, H, tt, tb, tw, nc, 345.0, 1.1)
+    res = batch_check(B, H, tt, tb, tw, nc, 345.0, 1.1, 15400.0, 32200.0, 5360.0)
+    chk = sa.check(15400.0, 32200.0, 5360.0)
+    assert set(chk) == set(res) and all(np.array_equal(chk[k], res[k]) for k in res)
+    assert sa[7] == SectionRecord(B[7], H[7], tt[7], tb[7], tw[7], int(nc[7]), 345.0, 1.1)
+    assert len(sa[sa["Nc"] == 2]) == int((nc == 2).sum())
+    assert list(SectionArray.from_records(list(sa)).data) == list(sa.data)
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""cad_export：DXF (R12) 组码结构与头段、SVG 为合法 XML、图元取自被校核的构件几何"""
+import io
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from cad_export import cad_geometry, export_section, write_dxf, write_svg
+
+GEOM = dict(B_deck=13.5, B_box_mm=9500.0, H_mm=2000.0, t_top=18.0, t_bot=16.0, t_web=14.0, Nc=3,
+            out_top=145.0, out_bot=60.0, e_web=60.0)
+
+
+def _dxf_pairs(text):
+    lines = text.split("\n")
+    assert lines[-1] == ""
+    lines = lines[:-1]
+    assert len(lines) % 2 == 0
+    return [(int(lines[i]), lines[i + 1]) for i in range(0, len(lines), 2)]
+
+
+def test_dxf_r12_structure():
+    pairs = _dxf_pairs(export_section("dxf", **GEOM))
+    assert pairs[:4] == [(0, "SECTION"), (2, "HEADER"), (9, "$ACADVER"), (1, "AC1009")]
+    assert pairs[-1] == (0, "EOF")
+    header = pairs[:pairs.index((0, "ENDSEC"))]
+    assert [v for c, v in header if c == 9] == ["$ACADVER"]          # R12 不定义 $INSUNITS
+    entities = [v for c, v in pairs if c == 0]
+    assert set(entities) == {"SECTION", "ENDSEC", "LINE", "TEXT", "EOF"}
+    layers = {v for c, v in pairs if c == 8}
+    assert {"OUTLINE", "PLATE", "WEB", "DIM", "TEXT"} <= layers
+    assert all(ord(ch) < 128 for _, v in pairs for ch in v)
+
+
+def test_webs_match_section_geometry():
+    g = cad_geometry(**GEOM)
+    webs = [seg for seg, layer in zip(g.segments, g.layers) if layer == "WEB"]
+    assert len(webs) == GEOM["Nc"] + 1
+    assert all(y0 == GEOM["t_bot"] and y1 == GEOM["H_mm"] - GEOM["t_top"] for (_, y0), (_, y1) in webs)
+    xs = sorted(x0 for (x0, _), _ in webs)
+    assert xs[0] == GEOM["e_web"] and xs[-1] == GEOM["B_box_mm"] - GEOM["e_web"]
+
+
+@pytest.mark.parametrize("ribs", [None, (600.0, 300.0, 170.0, 280.0, 8.0)])
+def test_svg_is_well_formed(ribs):
+    svg = export_section("svg", **GEOM, top_ribs=ribs, bot_ribs=ribs)
+    root = ET.fromstring(svg.encode("utf-8"))
+    assert root.tag.endswith("svg") and root.get("viewBox").startswith("0 0 ")
+    texts = [el.text for el in root.iter() if el.tag.endswith("text")]
+    assert "t_web=14 mm  (×4 webs)" in texts
+
+
+def test_export_to_stream_matches_string():
+    g = cad_geometry(**GEOM)
+    for fmt, writer in (("svg", write_svg), ("dxf", write_dxf)):
+        f = io.StringIO()
+        writer(g, f)
+        assert export_section(fmt, **GEOM) == f.getvalue()
+        buf = io.StringIO()
+        assert export_section(fmt, buf, **GEOM) is None and buf.getvalue() == f.getvalue()
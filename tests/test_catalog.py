@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""catalog：目录取档、预计算构件表与 batch_properties / grid_optimize 逐位一致"""
+import numpy as np
+import pytest
+
+from box_section import BoxGirderSection, batch_check, grid_optimize
+from catalog import CatalogTables, PlateCatalog, catalog_optimize
+from stability import StabilityRules
+
+CAT = PlateCatalog.from_grade("Q345qD")
+
+
+def test_snap_up_and_values():
+    assert CAT.snap_up(24.5) == 25.0 and CAT.snap_up(16.0) == 16.0
+    assert np.isnan(CAT.snap_up(81.0))
+    np.testing.assert_array_equal(CAT.snap_up([7.0, 26.0, 57.0]), [8.0, 28.0, 60.0])
+    assert CAT.values(20, 30).tolist() == [20.0, 22.0, 24.0, 25.0, 28.0, 30.0]
+    assert PlateCatalog([12, 10, 12]).thicknesses.tolist() == [10.0, 12.0]
+    with pytest.raises(ValueError):
+        PlateCatalog.from_grade("Q235")
+
+
+def test_tables_match_batch_check_on_grid():
+    B, H = np.array([6000.0, 9500.0]), np.array([1400.0, 2000.0, 2600.0])
+    tables = CatalogTables(CAT, B, H)
+    rng = np.random.default_rng(0)
+    iB, iH = rng.integers(0, 2, 200), rng.integers(0, 3, 200)
+    it, ib, iw = (rng.integers(0, len(CAT), 200) for _ in range(3))
+    nc = rng.integers(1, 5, 200).astype(float)
+    T = CAT.thicknesses
+    got = tables.check(iB, iH, it, ib, iw, nc, 345.0, 1.1, 15400.0, 32200.0, 5360.0)
+    ref = batch_check(B[iB], H[iH], T[it], T[ib], T[iw], nc, 345.0, 1.1, 15400.0, 32200.0, 5360.0)
+    assert all(np.array_equal(got[k], ref[k]) for k in ref)
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_catalog_optimize_matches_grid_optimize(seed):
+    rng = np.random.default_rng(seed)
+    B, H = rng.uniform(5000, 12000), rng.uniform(1200, 3000)
+    loads = rng.uniform(5e3, 1.5e5), rng.uniform(5e3, 1.5e5), rng.uniform(1e3, 3e4)
+    nc = (1, 2, 3, 4) if seed % 2 else (int(rng.integers(1, 5)),)
+    stab = StabilityRules() if seed % 3 == 0 else None
+    axes = {f"t_{p}_values": CAT.values(t, 80) for p, t in (("top", 16), ("bot", 14), ("web", 12))}
+    ref = grid_optimize(B, H, *loads, 345.0, 1.1, Nc_values=nc, stability=stab, **axes)
+    got = catalog_optimize(CAT, B, H, *loads, 345.0, 1.1, Nc_values=nc, stability=stab)
+    counters = ("n_evaluated", "n_pruned")
+    assert {k: v for k, v in got.items() if k not in counters} == {
+        k: v for k, v in ref.items() if k not in counters}
+
+
+def test_section_optimize_uses_catalog_levels():
+    sec = BoxGirderSection(9500.0, 2000.0, 16, 14, 12, 3, 345.0, 1.1)
+    calls = []
+    ok, _ = sec.optimize(60000.0, 90000.0, 15000.0, catalog=CAT, progress=lambda d, t: calls.append((d, t)))
+    assert ok and {sec.t_top, sec.t_bot, sec.t_web} <= set(CAT.thicknesses.tolist())
+    assert calls[-1] == (1, 1)
+    assert sec.check_capacity(60000.0, 90000.0, 15000.0)["ur_max"] <= 1.0
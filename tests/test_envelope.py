@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+"""box_section：荷载组合包络与逐组合全表一致"""
+import numpy as np
+import pytest
+
+from box_section import batch_check, envelope_check, load_envelope
+
+KEYS = ("ur_top", "ur_bot", "ur_shear", "ur_max")
+
+
+def _random_sections(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return (rng.uniform(4000, 12000, n), rng.uniform(1200, 3000, n), rng.integers(8, 30, n) * 2.0,
+            rng.integers(7, 30, n) * 2.0, rng.integers(6, 20, n) * 2.0, rng.integers(1, 5, n))
+
+
+def test_envelope_check_matches_full_table():
+    rng = np.random.default_rng(3)
+    B, H, tt, tb, tw, nc = _random_sections(400, seed=3)
+    loads = rng.uniform((1e3, 1e3, 5e2), (8e4, 1.2e5, 2e4), (200, 3))
+    loads[57] = loads[12]                              # 并列组合取较小序号
+    env = envelope_check(B, H, tt, tb, tw, nc, 345.0, 1.1, loads)
+    full = {k: np.stack([batch_check(B, H, tt, tb, tw, nc, 345.0, 1.1, *row)[k] for row in loads])
+            for k in KEYS}
+    for k in KEYS:
+        np.testing.assert_array_equal(env[k], full[k].max(axis=0))
+    np.testing.assert_array_equal(env["case"], full["ur_max"].argmax(axis=0))
+    np.testing.assert_array_equal(env["case_shear"], full["ur_shear"].argmax(axis=0))
+
+
+def test_load_envelope_ties_and_validation():
+    env = load_envelope([(10.0, 30.0, 5.0), (30.0, 10.0, 5.0)])
+    assert (env["M"], env["case_M"], env["case_V"]) == (30.0, 0, 0)
+    assert (env["case_M_pos"], env["case_M_neg"]) == (1, 0)
+    with pytest.raises(ValueError):
+        load_envelope(np.zeros((0, 3)))
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""girder：分段动态规划与穷举最优一致；不可行 / 单截面输入报错"""
+import itertools
+
+import numpy as np
+import pytest
+
+from girder import segment_plate, size_girder, station_bounds
+
+
+def _brute_force(req, levels, bounds, weights, L_min, dt_max):
+    """穷举全部分段方式与段厚，返回最小体积（不可行为 inf）"""
+    N = req.size
+    L_min = min(L_min, bounds[-1] - bounds[0])
+    tol = 1e-9 * max(L_min, 1.0)
+    best = np.inf
+    for cuts in itertools.product((False, True), repeat=N - 1):
+        edges = [0] + [i + 1 for i, c in enumerate(cuts) if c] + [N]
+        segs = list(zip(edges[:-1], edges[1:]))
+        if any(bounds[b] - bounds[a] < L_min - tol for a, b in segs):
+            continue
+        for ts in itertools.product(levels, repeat=len(segs)):
+            if any(t < req[a:b].max() for (a, b), t in zip(segs, ts)):
+                continue
+            if any(abs(s - t) > dt_max + 1e-9 for s, t in zip(ts, ts[1:])):
+                continue
+            best = min(best, sum(t * weights[a:b].sum() for (a, b), t in zip(segs, ts)))
+    return best
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_segment_plate_matches_brute_force(seed):
+    rng = np.random.default_rng(seed)
+    N = int(rng.integers(2, 8))
+    levels = np.arange(16, 16 + 2 * int(rng.integers(2, 5)), 2.0)
+    req = rng.choice(levels, N)
+    x = np.cumsum(rng.uniform(1.0, 4.0, N))
+    bounds = station_bounds(x)
+    weights = np.diff(bounds) * rng.uniform(0.5, 2.0, N)
+    L_min, dt_max = float(rng.uniform(0.5, 8.0)), float(rng.choice([2.0, 4.0, 8.0]))
+
+    t, segs = segment_plate(req, levels, bounds, weights, L_min, dt_max)
+    assert np.all(t >= req)
+    assert float((t * weights).sum()) == pytest.approx(_brute_force(req, levels, bounds, weights, L_min, dt_max))
+    assert segs[0][0] == 0 and segs[-1][1] == N
+    assert all(a[1] == b[0] and abs(a[2] - b[2]) <= dt_max for a, b in zip(segs, segs[1:]))
+
+
+def test_segment_plate_rejects_infeasible():
+    with pytest.raises(ValueError):
+        segment_plate(np.array([20.0, 20.0]), np.array([16.0, 18.0]), np.array([0.0, 5.0, 10.0]),
+                      np.ones(2), 6.0, 8.0)
+
+
+def test_size_girder_rejects_single_station():
+    with pytest.raises(ValueError):
+        size_girder([5.0], [1e4], [1e4], [1e3], 9500.0, 2000.0, 3)
+
+
+def test_size_girder_all_stations_pass():
+    x = np.linspace(0.0, 40.0, 81)
+    M = 60000.0 * np.sin(np.pi * x / 40.0) + 1000.0
+    V = np.abs(np.cos(np.pi * x / 40.0)) * 8000.0 + 100.0
+    res = size_girder(x, M, 0.3 * M, V, 9500.0, 2000.0, 3, L_min=6.0, dt_max=8.0)
+    assert res["ur_max"].max() <= 1.0
+    for p in ("t_top", "t_bot", "t_web"):
+        segs = res["segments"][p]
+        assert segs[0][0] == 0.0 and segs[-1][1] == 40.0
+        assert all(b - a >= 6.0 - 1e-9 for a, b, _ in segs)
+
+
+def test_size_girder_stops_when_plate_is_capped(monkeypatch):
+    import girder
+    real = girder.batch_check
+
+    def top_always_fails(*args):
+        out = dict(real(*args))
+        out["ur_top"] = np.full_like(out["ur_top"], 1.5)
+        return out
+    monkeypatch.setattr(girder, "batch_check", top_always_fails)
+    x = np.linspace(0.0, 20.0, 11)
+    with pytest.raises(ValueError, match="顶板"):
+        size_girder(x, np.full(11, 1e4), np.full(11, 1e4), np.full(11, 1e3), 9500.0, 2000.0, 3,
+                    t_max=24, max_rounds=100)
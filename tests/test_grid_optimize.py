@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+"""box_section.grid_optimize：剪枝后的网格搜索与穷举一致"""
+import numpy as np
+import pytest
+
+from box_section import batch_check, grid_optimize
+
+
+@pytest.mark.parametrize("loads", [(15400.0, 32200.0, 5360.0), (120000.0, 160000.0, 22000.0),
+                                   (60000.0, 20000.0, 40000.0), (900000.0, 900000.0, 200000.0)])
+def test_grid_optimize_matches_exhaustive_search(loads):
+    M_pos, M_neg, V = loads
+    B, H = 9500.0, 2200.0
+    tt, tb, tw = np.arange(16, 61, 2.0), np.arange(14, 61, 2.0), np.arange(12, 41, 2.0)
+    nc = np.array([1, 2, 3, 4])
+    g = [a.ravel() for a in np.meshgrid(tt, tb, tw, nc, indexing="ij")]
+    full = batch_check(B, H, *g, 345.0, 1.1, M_pos, M_neg, V)
+    ok = full["ur_max"] <= 1.0
+
+    res = grid_optimize(B, H, M_pos, M_neg, V, 345.0, 1.1, t_max=60, Nc_values=(1, 2, 3, 4),
+                        t_web_values=tw, chunk=512)
+    assert res["success"] == bool(ok.any())
+    if ok.any():
+        assert res["Area"] == full["Area"][ok].min()
+        assert res["ur_max"] <= 1.0
+    assert res["n_pruned"] <= res["n_total"] == g[0].size
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""jobs：作业状态流转、取消、owner 限额与作业版优化 / 前沿扫描"""
+import threading
+
+import numpy as np
+import pytest
+
+from box_section import BoxGirderSection
+from jobs import CANCELLED, DONE, FAILED, JobManager, optimize_job, pareto_job
+from pareto import FRONT_KEYS, pareto_front
+
+
+@pytest.fixture
+def manager():
+    m = JobManager(max_workers=2, max_per_owner=1, keep=2)
+    yield m
+    m.shutdown()
+
+
+def _wait(job, timeout=10.0):
+    job._future.result(timeout=timeout)
+    return job.snapshot()
+
+
+def test_job_reports_progress_and_result(manager):
+    def work(job, n):
+        for i in range(n):
+            job.report(i + 1, n, best=i)
+        return n * 2
+    snap = _wait(manager.submit(work, 5, name="w"))
+    assert snap["state"] == DONE and snap["result"] == 10
+    assert (snap["done"], snap["total"], snap["fraction"], snap["best"]) == (5, 5, 1.0, 4)
+
+
+def test_failure_is_recorded_on_the_job(manager):
+    def boom(job):
+        raise ValueError("bad input")
+    snap = _wait(manager.submit(boom))
+    assert snap["state"] == FAILED and snap["error"] == "ValueError: bad input"
+
+
+def test_cancel_running_job_stops_at_next_report(manager):
+    started, release = threading.Event(), threading.Event()
+
+    def work(job):
+        started.set()
+        release.wait(5)
+        job.report(1, 2)
+        return "not reached"
+    job = manager.submit(work)
+    assert started.wait(5)
+    manager.cancel(job.id)
+    release.set()
+    snap = _wait(job)
+    assert snap["state"] == CANCELLED and snap["result"] is None and snap["cancel_requested"]
+
+
+def test_owner_limit_and_pruning(manager):
+    release = threading.Event()
+    job = manager.submit(lambda j: release.wait(5), owner="s1")
+    with pytest.raises(RuntimeError):
+        manager.submit(lambda j: None, owner="s1")
+    other = manager.submit(lambda j: None, owner="s2")
+    release.set()
+    _wait(job), _wait(other)
+    for _ in range(3):
+        _wait(manager.submit(lambda j: None))
+    # keep=2：最旧的已结束作业被淘汰
+    assert manager.get(job.id) is None and len(manager.jobs()) <= 3
+    assert manager.stats()["max_workers"] == 2
+
+
+def test_optimize_job_matches_direct_optimize(manager):
+    args = (60000.0, 90000.0, 15000.0)
+    ref = BoxGirderSection(9500.0, 2000.0, 16, 14, 12, 3, 345.0, 1.1)
+    ok, _ = ref.optimize(*args)
+    sec = BoxGirderSection(9500.0, 2000.0, 16, 14, 12, 3, 345.0, 1.1)
+    snap = _wait(manager.submit(optimize_job, sec, *args))
+    res = snap["result"]
+    assert snap["state"] == DONE and res["success"] == ok
+    assert (res["t_top"], res["t_bot"], res["t_web"]) == (ref.t_top, ref.t_bot, ref.t_web)
+    assert 0 < snap["done"] <= snap["total"]
+
+
+def test_pareto_job_returns_final_front(manager):
+    args = ([8000.0, 9500.0], [1800.0, 2200.0], [2, 3], 60000.0, 90000.0, 15000.0, 345.0, 1.1,
+            np.arange(16.0, 28.0, 2.0), np.arange(14.0, 26.0, 2.0), np.arange(12.0, 20.0, 2.0))
+    snap = _wait(manager.submit(pareto_job, *args, chunk=100))
+    ref = pareto_front(*args)
+    assert snap["state"] == DONE and snap["best"] is snap["result"]
+    assert all(np.array_equal(snap["result"][k], ref[k]) for k in FRONT_KEYS)
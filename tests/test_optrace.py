@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+"""optrace：各优化器的追踪事件"""
+from box_section import grid_optimize
+from optrace import CANDIDATE, CONVERGED, MOVES, NEWTON, PRUNE, OptimizerTrace
+from sensitivity import gradient_optimize
+
+
+def test_grid_and_gradient_optimizers_emit_trace_events():
+    trace = OptimizerTrace()
+    g = grid_optimize(9500.0, 2000.0, 120000.0, 160000.0, 22000.0, 345.0, 1.1, trace=trace)
+    assert g == grid_optimize(9500.0, 2000.0, 120000.0, 160000.0, 22000.0, 345.0, 1.1)
+    gradient_optimize(9500.0, 2000.0, 120000.0, 160000.0, 22000.0, 345.0, 1.1, 3, trace=trace)
+    ev = trace.events()
+    moves = [MOVES[m] for m in ev["move"]]
+    assert moves.count("prune") == 4 and ev["Nc"][ev["move"] == PRUNE].tolist() == [1, 2, 3, 4]
+    assert (ev["move"] == CANDIDATE).any() and (ev["move"] == NEWTON).any()
+    assert trace.n_runs == 2 and trace.runs()["converged"].all()
+    last = ev[(ev["run"] == 0) & (ev["move"] == CONVERGED)][0]
+    assert (last["t_top"], last["Nc"]) == (g["t_top"], g["Nc"])
+
+
+def test_json_export_is_strict_json():
+    import json
+
+    import numpy as np
+    trace = OptimizerTrace()
+    grid_optimize(9500.0, 2000.0, 120000.0, 160000.0, 22000.0, 345.0, 1.1, trace=trace)
+    assert np.isnan(trace.events()["ur_max"]).any()
+
+    def reject(const):
+        raise ValueError(f"非法 JSON 常量 {const}")
+    doc = json.loads(trace.to_json(), parse_constant=reject)
+    assert len(doc["events"]) == trace.events().size
+    assert any(e["ur_max"] is None for e in doc["events"])
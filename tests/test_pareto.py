@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""pareto：非支配排序与暴力比较一致，分块流式前沿与一次性计算一致"""
+import numpy as np
+
+from box_section import batch_check
+from pareto import FRONT_KEYS, feasible_block, grid_block, iter_pareto_front, pareto_mask
+
+AXES = [np.array([8000.0, 9500.0]), np.array([1800.0, 2200.0]), np.array([2.0, 3.0]),
+        np.arange(16.0, 30.0, 2.0), np.arange(14.0, 28.0, 2.0), np.arange(12.0, 22.0, 2.0)]
+LOADS = (60000.0, 90000.0, 15000.0, 345.0, 1.1)
+
+
+def _brute_mask(objs):
+    le = (objs[None, :, :] <= objs[:, None, :]).all(axis=2)
+    lt = (objs[None, :, :] < objs[:, None, :]).any(axis=2)
+    return ~(le & lt).any(axis=1)
+
+
+def test_pareto_mask_matches_brute_force():
+    rng = np.random.default_rng(7)
+    for k in (2, 3, 4):
+        # 取整制造大量并列与完全重复的点
+        objs = rng.integers(0, 12, size=(600, k)).astype(float)
+        assert np.array_equal(pareto_mask(objs, block=37), _brute_mask(objs))
+
+
+def test_pareto_mask_keeps_duplicates_and_handles_empty():
+    objs = np.array([[1.0, 2.0, 3.0], [1.0, 2.0, 3.0], [2.0, 2.0, 3.0]])
+    assert pareto_mask(objs).tolist() == [True, True, False]
+    assert pareto_mask(np.empty((0, 3))).size == 0
+
+
+def test_feasible_block_matches_batch_check():
+    total = int(np.prod([a.size for a in AXES]))
+    B, H, Nc, t_top, t_bot, t_web = grid_block(AXES, 0, total)
+    ref = batch_check(B, H, t_top, t_bot, t_web, Nc, LOADS[3], LOADS[4], *LOADS[:3])
+    ok = ref["ur_max"] <= 1.0
+    got = feasible_block(AXES, 0, total, *LOADS)
+    assert ok.any() and got["Area"].size == ok.sum()
+    assert np.allclose(got["Area"], ref["Area"][ok]) and np.allclose(got["ur_max"], ref["ur_max"][ok])
+
+
+def test_chunked_front_matches_single_chunk():
+    def run(chunk):
+        steps = list(iter_pareto_front(*AXES[:3], *LOADS, *AXES[3:], chunk=chunk))
+        assert steps[-1]["done"] == steps[-1]["total"]
+        f = steps[-1]["front"]
+        return sorted(zip(*(f[k].tolist() for k in FRONT_KEYS)))
+    assert run(10**9) == run(53)
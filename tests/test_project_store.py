@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""project_store：结果缓存往返、方案保存、环境变量开关与界面缺省库"""
+import math
+
+import pytest
+
+import project_store
+from project_store import DEFAULT_PATH, ProjectStore, app_store
+from section_cache import SectionCache
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = ProjectStore(str(tmp_path / "sub" / "projects.sqlite3"))
+    yield s
+    s.close()
+
+
+def test_results_round_trip(store):
+    store.put(("figure", 1.0), b"\x89PNG")
+    store.put(("check", 2.0, None), {"ur_max": 0.5, "y_c": math.nan})
+    assert store.get(("figure", 1.0)) == b"\x89PNG"
+    got = store.get(("check", 2.0, None))
+    assert got["ur_max"] == 0.5 and math.isnan(got["y_c"])
+    assert store.get(("check", 3.0, None)) is None
+    store.clear("figure")
+    assert store.get(("figure", 1.0)) is None and store.get(("check", 2.0, None)) is not None
+    assert store.stats()["rows"] == {"check": 1}
+
+
+def test_prune_keeps_newest(store):
+    for i in range(10):
+        store.put(("check", float(i)), {"i": i})
+    assert store.prune(max_rows=3) == 7
+    assert store.stats()["rows"] == {"check": 3} and store.get(("check", 9.0)) == {"i": 9}
+
+
+def test_projects(store):
+    store.save_project("A", {"in_H": 2.0}, app="app01")
+    store.save_project("B", {"in_H": 2.5}, app="other")
+    store.save_project("A", {"in_H": 2.2}, app="app01")
+    assert store.load_project("A") == {"in_H": 2.2} and store.load_project("C") is None
+    assert [n for n, _ in store.list_projects(app="app01")] == ["A"]
+    store.delete_project("A")
+    assert store.list_projects(app="app01") == []
+
+
+def test_section_cache_second_level_survives_new_process_cache(store):
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return {"ur_max": 0.8}
+    key = SectionCache().key("check", 9500.0, 2000.0)
+    assert SectionCache(store=store).get_or_compute(key, compute) == {"ur_max": 0.8}
+    assert SectionCache(store=store).get_or_compute(key, compute) == {"ur_max": 0.8}
+    assert len(calls) == 1
+
+
+@pytest.mark.parametrize("value, expected", [(None, "default"), ("", None), ("0", None), ("off", None),
+                                             ("1", DEFAULT_PATH), ("x.sqlite3", "x.sqlite3")])
+def test_from_env(monkeypatch, value, expected):
+    if value is None:
+        monkeypatch.delenv("BOXGIRDER_STORE", raising=False)
+    else:
+        monkeypatch.setenv("BOXGIRDER_STORE", value)
+    if value is None:
+        assert ProjectStore.from_env() is None      # 脚本 / 服务：未设置时不启用
+    got = ProjectStore.from_env(default="default")
+    assert (None if got is None else got.path) == expected
+
+
+def test_service_module_is_versioned():
+    assert "service.py" in project_store._VERSIONED_SOURCES
+
+
+def test_app_store_is_on_by_default_and_attached(monkeypatch, tmp_path):
+    import drawing
+    import section_cache
+    monkeypatch.delenv("BOXGIRDER_STORE", raising=False)
+    monkeypatch.setattr(project_store, "DEFAULT_PATH", str(tmp_path / "default.sqlite3"))
+    monkeypatch.setattr(project_store, "STORE", None)
+    monkeypatch.setattr(project_store, "_APP_STORE", [])
+    monkeypatch.setattr(section_cache.SECTION_CACHE, "store", None)
+    monkeypatch.setattr(drawing.FIGURE_CACHE, "store", None)
+    s = app_store()
+    assert s is not None and s.path == str(tmp_path / "default.sqlite3")
+    assert app_store() is s
+    assert section_cache.SECTION_CACHE.store is s and drawing.FIGURE_CACHE.store is s
+
+
+def test_app_store_opt_out(monkeypatch):
+    monkeypatch.setenv("BOXGIRDER_STORE", "0")
+    monkeypatch.setattr(project_store, "STORE", None)
+    monkeypatch.setattr(project_store, "_APP_STORE", [])
+    assert app_store() is None
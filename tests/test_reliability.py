@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""reliability：分块蒙特卡罗的计数与统计"""
+import math
+
+import numpy as np
+import pytest
+
+from box_section import batch_check
+from reliability import (Fixed, Gumbel, Lognormal, Normal, RunningStats, Uniform, default_variables,
+                         pf_estimate, run_reliability, sample_chunk)
+
+SECTION = (9500.0, 2000.0, 24.0, 20.0, 14.0, 3)
+LOADS = (40000.0, 60000.0, 9000.0)
+
+
+def test_reliability_all_fixed_counts_every_sample():
+    variables = {k: Fixed(345.0 if k == "fy" else 1.0 if k == "load" else 0.0) for k in default_variables()}
+    res = run_reliability(*SECTION, *LOADS, variables=variables, n_samples=3000, chunk=1000)
+    assert res["n"] == 3000
+    assert res["ur_min"] == res["ur_max"]
+
+
+def test_running_stats_chunks_match_numpy():
+    x = np.random.default_rng(3).gamma(4.0, 0.2, 10007)
+    st = RunningStats(hist_max=3.0, n_bins=3000)
+    for s in range(0, x.size, 999):
+        st.update(x[s:s + 999])
+    st.update(x[:0])
+    assert st.n == x.size and st.n_fail == np.count_nonzero(x > 1.0)
+    assert st.mean == pytest.approx(x.mean()) and st.std == pytest.approx(x.std(ddof=1))
+    assert (st.min, st.max) == (x.min(), x.max())
+    for q in (0.05, 0.5, 0.95):
+        assert st.quantile(q) == pytest.approx(np.quantile(x, q), abs=2e-3)
+
+
+def test_pf_estimate():
+    assert pf_estimate(0, 0) == (0.0, 0.0, math.inf, math.inf)
+    assert pf_estimate(0, 1000)[2] == math.inf
+    pf, se, cov, beta = pf_estimate(50, 1000)
+    assert pf == 0.05 and se == pytest.approx(math.sqrt(0.05 * 0.95 / 1000))
+    assert cov == pytest.approx(se / pf) and beta == pytest.approx(1.645, abs=1e-3)
+
+
+@pytest.mark.parametrize("dist", [Normal(10.0, cov=0.1), Lognormal(400.0, 0.07), Gumbel(1.0, 0.15),
+                                  Uniform(-1.0, 3.0), Fixed(2.5)])
+def test_distribution_moments(dist):
+    x = dist.sample(np.random.default_rng(0), 200_000)
+    assert x.mean() == pytest.approx(dist.mean, abs=0.01 * max(1.0, abs(dist.mean)))
+    assert x.std() == pytest.approx(dist.std, rel=0.02, abs=1e-12)
+
+
+def test_default_fy_is_five_percent_characteristic():
+    x = default_variables(fy=345.0)["fy"].sample(np.random.default_rng(1), 400_000)
+    assert np.quantile(x, 0.05) == pytest.approx(345.0, rel=0.01)
+    assert isinstance(default_variables(t_corr=2.0)["t_corr"], Lognormal)
+
+
+def test_single_chunk_matches_direct_sampling():
+    variables = default_variables(t_corr=2.0)
+    res = run_reliability(*SECTION, *LOADS, variables=variables, n_samples=20000, chunk=20000, seed=5)
+    fy, load, tt, tb, tw = sample_chunk(np.random.default_rng(5), 20000, *SECTION[2:5], variables)
+    ur = batch_check(*SECTION[:2], tt, tb, tw, SECTION[5], fy, 1.0,
+                     LOADS[0] * load, LOADS[1] * load, LOADS[2] * load)["ur_max"]
+    assert res["n_fail"] == np.count_nonzero(ur > 1.0) > 0
+    assert res["ur_mean"] == pytest.approx(ur.mean()) and res["ur_max"] == ur.max()
+    assert sum(res["governing"].values()) == pytest.approx(1.0)
+
+
+def test_seed_reproducible_and_early_stop():
+    kw = dict(variables=default_variables(t_corr=2.0), n_samples=400_000, chunk=10_000, seed=11)
+    a = run_reliability(*SECTION, *LOADS, **kw)
+    b = run_reliability(*SECTION, *LOADS, **kw)
+    assert (a["n_fail"], a["ur_mean"], a["history"]) == (b["n_fail"], b["ur_mean"], b["history"])
+    seen = []
+    c = run_reliability(*SECTION, *LOADS, target_cov=0.2, min_samples=20_000,
+                        progress=lambda done, total: seen.append(done), **kw)
+    assert c["converged"] and 20_000 <= c["n"] < 400_000 and c["cov"] <= 0.2
+    assert seen == [h[0] for h in c["history"]] and seen[-1] == c["n"]
+    # 提前停止前的历程与完整运行逐块一致
+    assert c["history"] == a["history"][:len(c["history"])]
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""report：PDF 结构与图像编码、页面数据与批量校核一致、未定截面只出说明页"""
+import io
+import re
+import zlib
+
+import numpy as np
+import pytest
+
+from box_section import batch_check
+from report import PdfWriter, build_report, encode_rgb, page_data
+
+ROWS = [
+    {"name": "S1", "B_box": "9.5", "H": "2.0", "M_pos": "60000", "M_neg": "90000", "V": "15000",
+     "t_top": "18", "t_bot": "16", "t_web": "14", "Nc": "3", "status": "optimized"},
+    {"name": "S2", "B_box": "8.0", "H": "1.8", "M_pos": "40000", "M_neg": "60000", "V": "9000"},
+    {"name": "S3", "B_box": "9.5", "H": "2.0", "M_pos": "1e9", "M_neg": "1e9", "V": "1e7",
+     "t_top": "", "t_bot": "", "t_web": "", "Nc": "", "status": "beyond_catalog"},
+]
+
+
+def test_encode_rgb_round_trip():
+    rgb = np.random.default_rng(1).integers(0, 256, size=(7, 5, 3), dtype=np.uint8)
+    raw = np.frombuffer(zlib.decompress(encode_rgb(rgb)), dtype=np.uint8).reshape(7, 5 * 3 + 1)
+    assert (raw[:, 0] == 2).all()
+    # 撤销 PNG Up 过滤：逐行累加（按 256 取模）
+    back = np.cumsum(raw[:, 1:].astype(np.int64), axis=0) % 256
+    assert np.array_equal(back.reshape(rgb.shape), rgb)
+
+
+def test_pdf_writer_xref_points_at_objects():
+    buf = io.BytesIO()
+    with PdfWriter(buf, title="计算书") as pdf:
+        for _ in range(2):
+            pdf.add_image_page(2, 2, encode_rgb(np.zeros((2, 2, 3), dtype=np.uint8)))
+    data = buf.getvalue()
+    assert data.startswith(b"%PDF-1.4") and data.rstrip().endswith(b"%%EOF")
+    assert b"/Count 2" in data and pdf.bytes_written == len(data)
+    xref = int(re.search(rb"startxref\n(\d+)", data).group(1))
+    n = int(re.search(rb"xref\n0 (\d+)", data[xref:]).group(1))
+    offsets = re.findall(rb"(\d{10}) 00000 n ", data[xref:])
+    assert len(offsets) == n - 1
+    for num, off in enumerate(map(int, offsets), start=1):
+        assert data[off:].startswith(b"%d 0 obj" % num)
+
+
+def test_page_data_matches_batch_check_and_flags_unsized():
+    pages = page_data(ROWS, first_page=5)
+    assert [p["page"] for p in pages] == [5, 6, 7] and [p["name"] for p in pages] == ["S1", "S2", "S3"]
+    ref = batch_check(9500.0, 2000.0, 18.0, 16.0, 14.0, 3.0, 345.0, 1.1, 60000.0, 90000.0, 15000.0)
+    for k in ("ur_top", "ur_bot", "ur_shear"):
+        assert pages[0][k] == pytest.approx(float(ref[k]))
+    # 厚度缺失的行按规则法初选后出图
+    assert pages[1]["geom"] is not None and pages[1]["geom"]["t_top"] > 0
+    # 超出目录的行为未定截面：不画图、利用率为 NaN
+    assert pages[2]["geom"] is None and np.isnan(pages[2]["ur_top"])
+
+
+def test_page_data_requires_geometry():
+    with pytest.raises(ValueError):
+        page_data([{"H": "2.0", "M_pos": "1", "M_neg": "1", "V": "1"}])
+
+
+def test_build_report_writes_one_page_per_row(tmp_path):
+    out = tmp_path / "book.pdf"
+    seen = []
+    res = build_report(iter(ROWS), str(out), dpi=30, workers=1, chunk=2,
+                       progress=lambda done, total: seen.append(done))
+    data = out.read_bytes()
+    assert res["n_pages"] == 3 and b"/Count 3" in data and res["bytes"] == len(data)
+    assert res["unsized"] == [(3, "S3")] and seen == [2, 3]
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""section_cache：量化键、LRU 淘汰与计数、持久库回填，带缓存结果与直接计算一致"""
+import numpy as np
+import pytest
+
+from box_section import BoxGirderSection, size_by_rules
+from project_store import ProjectStore
+from section_cache import SectionCache, check_section, quantize, rules_thickness
+
+ARGS = (9500.0, 2000.0, 18.0, 16.0, 14.0, 3, 345.0, 1.1, 60000.0, 90000.0, 15000.0)
+
+
+def test_quantize_removes_float_noise():
+    assert quantize(0.1 + 0.2) == 0.3
+    assert quantize((9.5 * 1000, [2, "x", None], True)) == (9500.0, (2.0, "x", None), True)
+    c = SectionCache()
+    assert c.key("check", 9500.000000001, 3) == c.key("check", np.float32(9500.0), 3.0)
+
+
+def test_lru_eviction_and_stats():
+    c = SectionCache(maxsize=2)
+    calls = []
+    for k in ("a", "b", "a", "c", "b"):
+        c.get_or_compute(c.key(k), lambda k=k: calls.append(k) or k.upper())
+    # "a" 被最近访问，插入 "c" 时淘汰 "b"，之后 "b" 重新计算
+    assert calls == ["a", "b", "c", "b"]
+    st = c.stats()
+    assert (st["size"], st["hits"], st["misses"], st["evictions"]) == (2, 1, 4, 2)
+    assert st["hit_rate"] == pytest.approx(0.2)
+    c.clear()
+    assert c.stats()["size"] == 0 and c.get(c.key("a")) is None
+
+
+def test_store_is_second_level(tmp_path):
+    store = ProjectStore(str(tmp_path / "s.sqlite"))
+    first = SectionCache(store=store)
+    assert first.get_or_compute(first.key("x", 1.0), lambda: {"v": 1}) == {"v": 1}
+    # 新进程（空内存缓存）从持久库命中，不再计算
+    second = SectionCache(store=store)
+    assert second.get(second.key("x", 1.0)) == {"v": 1}
+    assert second.get_or_compute(second.key("x", 1.0), lambda: pytest.fail("recomputed")) == {"v": 1}
+    assert second.stats()["store"]
+    store.close()
+
+
+def test_check_section_matches_box_girder_section():
+    c = SectionCache()
+    res = check_section(*ARGS, cache=c)
+    sec = BoxGirderSection(*ARGS[:8])
+    ref = sec.check_capacity(*ARGS[8:])
+    for k in ("ur_top", "ur_bot", "ur_shear", "ur_max"):
+        assert res[k] == pytest.approx(ref[k], rel=1e-12)
+    assert res["Area"] == pytest.approx(sec.Area) and res["Ixx"] == pytest.approx(sec.Ixx)
+    # 返回副本：调用方修改不污染缓存
+    res["ur_max"] = -1
+    assert check_section(*ARGS, cache=c)["ur_max"] == pytest.approx(ref["ur_max"])
+    assert c.stats()["hits"] == 1
+
+
+def test_rules_thickness_matches_size_by_rules():
+    args = (60000.0, 90000.0, 15000.0, 9500.0, 2000.0, 345.0, 1.1, 0.8, 3, 2.0, 14.0, 14.0, 12.0, 2.0)
+    res = rules_thickness(*args, cache=SectionCache())
+    ref = size_by_rules(*args)
+    assert res.keys() == ref.keys()
+    assert all(isinstance(v, (int, float, bool)) and v == np.asarray(ref[k]).item() for k, v in res.items())
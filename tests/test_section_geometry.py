@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+"""section_geometry：无外伸 / 内收 / U 肋时，构件多边形结果与三矩形简化模型一致"""
+import numpy as np
+import pytest
+
+from box_section import batch_check
+from section_geometry import U_RIB_BOTTOM, U_RIB_DECK, box_geometry, composite_properties, rect
+
+
+@pytest.mark.parametrize("B, H, tt, tb, tw, Nc", [(9500.0, 2000.0, 18.0, 16.0, 14.0, 3),
+                                                   (4000.0, 1500.0, 40.0, 30.0, 20.0, 1),
+                                                   (12000.0, 3000.0, 16.0, 14.0, 12.0, 4)])
+def test_polygon_matches_rectangle_model(B, H, tt, tb, tw, Nc):
+    geo = box_geometry(B, H, tt, tb, tw, Nc)
+    res = geo.check(345.0, 1.1, 30000.0, 45000.0, 6000.0)
+    ref = batch_check(B, H, tt, tb, tw, Nc, 345.0, 1.1, 30000.0, 45000.0, 6000.0)
+    for k in ("Area", "y_c", "Ixx", "W_top", "W_bot", "ur_top", "ur_bot", "ur_shear", "ur_max"):
+        assert res[k] == pytest.approx(float(ref[k]), rel=1e-12)
+
+
+def test_polygon_moments_of_rectangle():
+    p = composite_properties(rect(0.0, 0.0, 300.0, 20.0), 20.0, 0.0)
+    assert p["Area"] == pytest.approx(6000.0)
+    assert p["y_c"] == pytest.approx(10.0)
+    assert p["Ixx"] == pytest.approx(300.0 * 20.0 ** 3 / 12)
+
+
+def test_ribs_and_outstands_add_area_and_stiffness():
+    bare = box_geometry(9500.0, 2000.0, 18.0, 16.0, 14.0, 3).properties()
+    full = box_geometry(9500.0, 2000.0, 18.0, 16.0, 14.0, 3, out_top=145.0, out_bot=60.0, e_web=60.0,
+                        top_ribs=U_RIB_DECK, bot_ribs=U_RIB_BOTTOM)
+    areas = full.component_areas()
+    assert areas["rib_top"] > 0 and areas["rib_bot"] > 0
+    assert full.properties()["Area"] == pytest.approx(sum(areas.values()))
+    assert full.properties()["Ixx"] > bare["Ixx"]
+    assert np.isfinite(list(full.properties().values())).all()
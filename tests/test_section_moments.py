@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""box_section.SectionMoments：增量属性与 batch_properties 逐位一致"""
+import numpy as np
+
+from box_section import BoxGirderSection, SectionMoments, SectionRecord, batch_properties
+
+
+def _random_sections(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return (rng.uniform(4000, 12000, n), rng.uniform(1200, 3000, n), rng.integers(8, 30, n) * 2.0,
+            rng.integers(7, 30, n) * 2.0, rng.integers(6, 20, n) * 2.0, rng.integers(1, 5, n))
+
+
+def test_section_moments_bit_identical_to_batch_properties():
+    B, H, tt, tb, tw, nc = _random_sections(300, seed=2)
+    m = SectionMoments(B, H, tt, tb, tw, nc)
+    for k, v in batch_properties(B, H, tt, tb, tw, nc).items():
+        np.testing.assert_array_equal(m.properties()[k], v)
+    probe = m.probe(t_top=tt + 2, t_web=tw + 4)
+    for k, v in batch_properties(B, H, tt + 2, tb, tw + 4, nc).items():
+        np.testing.assert_array_equal(probe[k], v)
+
+
+def test_scalar_moments_match_section_record():
+    m = SectionMoments(9500.0, 2000.0, 16, 14, 12, 3)
+    assert isinstance(m.B, float)
+    for change in ({"t_top": 18.0}, {"t_web": 20.0}, {"t_bot": 30.0}, {"t_top": 16.0}, {"Nc": 2}):
+        m.set(**change)
+        rec = SectionRecord(9500.0, 2000.0, m.t_top, m.t_bot, m.t_web, int(m.Nc), 345.0, 1.1)
+        assert tuple(m.properties()[k] for k in ("Area", "y_c", "Ixx", "W_top", "W_bot")) == (
+            rec.Area, rec.y_c, rec.Ixx, rec.W_top, rec.W_bot)
+        assert m.check_capacity(345.0, 1.1, 15400.0, 32200.0, 5360.0) == rec.check_capacity(15400.0, 32200.0, 5360.0)
+
+
+def test_neighbours_scalar_and_array_agree():
+    B, H, tt, tb, tw, nc = _random_sections(50, seed=3)
+    arr = SectionMoments(B, H, tt, tb, tw, nc).neighbours(345.0, 1.1, 15400.0, 32200.0, 5360.0)
+    for i in (0, 17, 49):
+        one = SectionMoments(B[i], H[i], tt[i], tb[i], tw[i], int(nc[i])).neighbours(345.0, 1.1, 15400.0,
+                                                                                     32200.0, 5360.0)
+        assert set(one) == set(arr) == {(p, d) for p in ("t_top", "t_bot", "t_web") for d in (2.0, -2.0)}
+        for key, ur in one.items():
+            assert all(ur[k] == arr[key][k][i] for k in ("ur_top", "ur_bot", "ur_shear", "ur_max"))
+
+
+def test_stepwise_final_state_is_consistent():
+    sec = BoxGirderSection(9500.0, 2000.0, 16, 14, 12, 3, 345.0, 1.1)
+    ok, log = sec.optimize_stepwise(120000.0, 160000.0, 22000.0, max_iter=60)
+    assert ok and len(log.events) > 5
+    last = log.events[-1]
+    assert (last[1], last[2], last[3]) == (sec.t_top, sec.t_bot, sec.t_web)
+    assert sec.record == SectionRecord(9500.0, 2000.0, sec.t_top, sec.t_bot, sec.t_web, 3, 345.0, 1.1)
+    ur = sec.check_capacity(120000.0, 160000.0, 22000.0)
+    assert (last[4], last[5], last[6], last[7]) == (ur["ur_top"], ur["ur_bot"], ur["ur_shear"], ur["ur_max"])
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+"""sensitivity：值与 batch_check 逐位一致、偏导与中心差分一致、梯度优化与网格优化对照"""
+import numpy as np
+import pytest
+
+from box_section import batch_check, grid_optimize
+from sensitivity import SENS_VARS, gradient_optimize, section_sensitivity
+
+ARGS = (9500.0, 2000.0, 24.0, 20.0, 14.0, 3)
+LOADS = (345.0, 1.1, 40000.0, 60000.0, 9000.0)
+
+
+def test_values_bit_identical_to_batch_check():
+    rng = np.random.default_rng(0)
+    n = 300
+    B, H = rng.uniform(4000, 12000, n), rng.uniform(1200, 3000, n)
+    tt, tb, tw = rng.integers(8, 30, n) * 2.0, rng.integers(7, 30, n) * 2.0, rng.integers(6, 20, n) * 2.0
+    nc = rng.integers(1, 5, n)
+    res = section_sensitivity(B, H, tt, tb, tw, nc, *LOADS)
+    ref = batch_check(B, H, tt, tb, tw, nc, *LOADS)
+    for k in ("Area", "y_c", "Ixx", "W_top", "W_bot", "ur_top", "ur_bot", "ur_shear", "ur_max"):
+        np.testing.assert_array_equal(res[k], ref[k])
+
+
+@pytest.mark.parametrize("key", ["Area", "Ixx", "W_top", "W_bot", "ur_top", "ur_bot", "ur_shear"])
+def test_derivatives_match_central_differences(key):
+    res = section_sensitivity(*ARGS, *LOADS)
+    for j, var in enumerate(SENS_VARS):
+        h = 1e-3
+        up, dn = list(ARGS), list(ARGS)
+        up[j] += h
+        dn[j] -= h
+        fd = (batch_check(*up, *LOADS)[key] - batch_check(*dn, *LOADS)[key]) / (2 * h)
+        assert float(res["d_" + key][j]) == pytest.approx(float(fd), rel=1e-5, abs=1e-12), var
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_gradient_optimize_feasible_and_close_to_grid(seed):
+    rng = np.random.default_rng(seed)
+    M_pos, M_neg, V = rng.uniform((1e4, 2e4, 2e3), (1.5e5, 2e5, 3e4))
+    g = grid_optimize(9500.0, 2200.0, M_pos, M_neg, V, 345.0, 1.1, Nc_values=(3,))
+    r = gradient_optimize(9500.0, 2200.0, M_pos, M_neg, V, 345.0, 1.1, 3)
+    assert r["success"] == g["success"]
+    if g["success"]:
+        assert r["ur_max"] <= 1.0
+        assert g["Area"] <= r["Area"] <= 1.03 * g["Area"]
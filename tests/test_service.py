@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""service：批量校核与 check_section 逐位一致，单项出错不影响其余各项，服务自有缓存"""
+import json
+
+import pytest
+
+from section_cache import SECTION_CACHE, SectionCache, check_section
+from service import SizingService, check_batch, make_server
+
+SECTION = dict(B_box_mm=9500.0, H_mm=2000.0, t_top=18.0, t_bot=16.0, t_web=14.0, Nc=3)
+LOADS = dict(M_pos=15400.0, M_neg=32200.0, V=5360.0)
+
+
+@pytest.fixture
+def service():
+    svc = SizingService(workers=1, max_pending=8, cache=SectionCache())
+    yield svc
+    svc.pool.shutdown()
+
+
+def test_check_batch_matches_check_section():
+    sections = [dict(SECTION, t_top=t, Nc=nc) for t in (16.0, 24.0, 40.0) for nc in (1, 2, 3, 4)]
+    res = check_batch(sections, cache=SectionCache(), **LOADS)
+    for s, r in zip(sections, res):
+        ref = check_section(s["B_box_mm"], s["H_mm"], s["t_top"], s["t_bot"], s["t_web"], s["Nc"], 345.0, 1.1,
+                            LOADS["M_pos"], LOADS["M_neg"], LOADS["V"])
+        assert r == ref
+
+
+def test_bad_items_do_not_fail_the_batch(service):
+    body = {"sections": [SECTION, {"B_box_mm": 3000}, dict(SECTION, t_top="x"), dict(SECTION, Nc=0), "oops"],
+            **LOADS}
+    status, out = service.handle("POST", "/check", json.dumps(body).encode())
+    assert status == 200
+    ok, *bad = out["results"]
+    assert "ur_max" in ok and "error" not in ok
+    assert all(set(r) == {"error"} for r in bad)
+    assert "H_mm" in bad[0]["error"]
+
+
+def test_bad_items_with_stability(service):
+    body = {"sections": [{"H_mm": 2000.0}, SECTION], "stability": True, **LOADS}
+    status, out = service.handle("POST", "/check", json.dumps(body).encode())
+    assert status == 200
+    assert "error" in out["results"][0] and "ur_bt_top" in out["results"][1]
+
+
+def test_make_server_does_not_resize_global_cache():
+    before = SECTION_CACHE.maxsize
+    server = make_server("127.0.0.1", 0, workers=1, max_pending=4, cache_size=123)
+    try:
+        assert server.service.cache.maxsize == 123
+        assert server.service.cache is not SECTION_CACHE
+        assert SECTION_CACHE.maxsize == before
+    finally:
+        server.server_close()
+        server.service.pool.shutdown()
+
+
+def test_large_batch_is_windowed_not_rejected(service):
+    items = [dict(B_box_mm=9500.0, H_mm=2000.0, Nc=3, t_max=24, step=4, **LOADS) for _ in range(9)]
+    status, out = service.handle("POST", "/optimize", json.dumps({"sections": items}).encode())
+    assert status == 200 and len(out["results"]) == 9
+    assert all("error" not in r for r in out["results"])
+    assert service.pool.rejected == 0
+
+
+def test_optimize_rejects_non_positive_dimensions(service):
+    items = [dict(B_box_mm=-5.0, H_mm=2000.0, Nc=3, **LOADS), dict(B_box_mm=9500.0, H_mm=2000.0, Nc=0, **LOADS)]
+    status, out = service.handle("POST", "/optimize", json.dumps({"sections": items}).encode())
+    assert status == 200
+    assert "B_box_mm" in out["results"][0]["error"] and "Nc" in out["results"][1]["error"]
+
+
+def test_render_bad_geometry_is_an_item_error(service):
+    geom = dict(B_deck=12.0, B_box_mm=9500.0, H_mm=2000.0, t_top=18.0, t_bot=16.0, t_web=14.0, Nc=3,
+                out_top=500.0, out_bot=0.0, e_web=0.0)
+    body = {"view": "cad", "fmt": "svg", "sections": [geom, dict(geom, Nc=0), dict(geom, t_web=-1.0)]}
+    status, out = service.handle("POST", "/render", json.dumps(body).encode())
+    assert status == 200
+    good, *bad = out["results"]
+    assert good["data"].lstrip().startswith("<")
+    assert all(set(r) == {"error"} for r in bad)
+
+
+@pytest.mark.parametrize("dpi", [10, 5000, "300"])
+def test_render_dpi_out_of_range(service, dpi):
+    body = {"view": "cad", "fmt": "png", "dpi": dpi, "sections": []}
+    status, out = service.handle("POST", "/render", json.dumps(body).encode())
+    assert status == 400 and "dpi" in out["error"]
+
+
+def test_unexpected_error_is_a_json_500(service, monkeypatch):
+    def boom(*args):
+        raise RuntimeError("boom")
+    monkeypatch.setattr(service.pool, "submit_one", boom)
+    status, out = service.handle("POST", "/check", json.dumps({"sections": [SECTION], **LOADS}).encode())
+    assert status == 500 and "boom" in out["error"]
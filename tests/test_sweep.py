@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""sweep：分块 / 多进程扫描与单次全量计算一致，同面积并列时结果确定"""
+import itertools
+
+import numpy as np
+
+import sweep
+from box_section import batch_check
+from pareto import FRONT_KEYS, pareto_front
+from sweep import _better, _sweep_chunk, run_sweep
+
+AXES = (np.array([8000.0, 9500.0]), np.array([1800.0, 2200.0]), np.array([2.0, 3.0]),
+        np.arange(16.0, 32.0, 2.0), np.arange(14.0, 30.0, 2.0), np.arange(12.0, 24.0, 2.0))
+LOADS = (60000.0, 90000.0, 15000.0)
+
+
+def _brute_best():
+    grid = [a.ravel() for a in np.meshgrid(*AXES, indexing="ij")]
+    res = batch_check(grid[0], grid[1], grid[3], grid[4], grid[5], grid[2], 345.0, 1.1, *LOADS)
+    ok = res["ur_max"] <= 1.0
+    return res["Area"][ok].min()
+
+
+def test_chunked_sweep_matches_single_pass():
+    whole = run_sweep(*AXES, *LOADS, chunk=10**9, max_workers=1)
+    parts = run_sweep(*AXES, *LOADS, chunk=97, max_workers=1)
+    assert whole["best"] == parts["best"] and whole["best"]["Area"] == _brute_best()
+    assert all(np.array_equal(whole["front"][k], parts["front"][k]) for k in FRONT_KEYS)
+    ref = pareto_front(*AXES[:3], *LOADS, 345.0, 1.1, *AXES[3:])
+    rows = lambda f: [tuple(r) for r in np.column_stack([f[k] for k in FRONT_KEYS]).tolist()]
+    assert sorted(rows(ref)) == rows(whole["front"])
+
+
+def test_process_pool_matches_serial():
+    serial = run_sweep(*AXES, *LOADS, chunk=500, max_workers=1)
+    pooled = run_sweep(*AXES, *LOADS, chunk=500, max_workers=2)
+    assert serial["best"] == pooled["best"]
+    assert all(np.array_equal(serial["front"][k], pooled["front"][k]) for k in FRONT_KEYS)
+
+
+def test_ties_do_not_depend_on_arrival_order():
+    # 两个箱宽面积相同（对称布置）时按 TIE_KEYS 取固定一方
+    total = int(np.prod([a.size for a in AXES]))
+    results = [_sweep_chunk(AXES, s, min(s + 64, total), (*LOADS, 345.0, 1.1), ("Area", "H"))[0]
+               for s in range(0, total, 64)]
+    tie = dict(results[-1] or results[0], Area=0.0)
+    winners = set()
+    for perm in itertools.permutations([dict(tie, B=9500.0), dict(tie, B=8000.0), None, dict(tie, Nc=3.0)]):
+        best = None
+        for b in perm:
+            best = _better(best, b)
+        winners.add(tuple(best[k] for k in ("Area",) + sweep.TIE_KEYS))
+    assert len(winners) == 1 and dict(zip(("Area",) + sweep.TIE_KEYS, winners.pop()))["B"] == 8000.0